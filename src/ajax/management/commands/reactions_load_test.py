@@ -0,0 +1,447 @@
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.http import HttpRequest
+from django.middleware.csrf import get_token
+from django.test import Client
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.module_loading import import_string
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+from shared.models import ConfirmStatusChoices
+from learning.models import Tutorial
+
+PATHS = [
+    "/ajax/tutorial/like",
+    "/ajax/tutorial/upvote",
+    "/ajax/tutorial/downvote",
+]
+
+
+@dataclass
+class LoadRequest:
+    path: str
+    body: bytes
+    cookie: str
+    csrf_token: str
+
+
+class Command(BaseCommand):
+    help = (
+        "Load tests ajax reaction endpoints (tutorial like, up-vote and "
+        "down-vote) in process (no network) on a temporary test database "
+        "and reports their throughput and latency. Without --server, "
+        "compares WSGI with sync views, ASGI with sync views and ASGI "
+        "with async views (ASYNC_AJAX_VIEWS) in separate processes. "
+        "Database latency of a remote database can be simulated by "
+        "--db-latency-ms (SQLite serializes writes anyway, so use "
+        "PostgreSQL for meaningful results)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--server",
+            choices=["wsgi", "asgi"],
+            help="Only load test given server (by current settings).",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=1000,
+            help="Count of requests.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=32,
+            help="Count of concurrent requests (WSGI threads).",
+        )
+        parser.add_argument(
+            "--users", type=int, default=20, help="Count of users."
+        )
+        parser.add_argument(
+            "--tutorials", type=int, default=20, help="Count of tutorials."
+        )
+        parser.add_argument(
+            "--db-latency-ms",
+            type=float,
+            default=0,
+            help="Latency added to every database query.",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Print results as JSON.",
+        )
+
+    def handle(self, *args, **options):
+        if options["server"]:
+            results = [self.load_test(options)]
+        else:
+            results = [
+                self.run_process(server, async_views, options)
+                for server, async_views in [
+                    ("wsgi", False),
+                    ("asgi", False),
+                    ("asgi", True),
+                ]
+            ]
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results))
+            return
+
+        for result in results:
+            self.stdout.write(
+                f"{result['name']}: {result['rps']:,.0f} requests/s, "
+                f"p50={result['p50_ms']:.1f}ms p95={result['p95_ms']:.1f}ms "
+                f"max={result['max_ms']:.1f}ms "
+                f"({result['errors']} errors)"
+            )
+            for middleware in result["sync_only_middleware"]:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"  {middleware} is sync only (serializes requests "
+                        "under ASGI)."
+                    )
+                )
+            for middleware in result["thread_sensitive_middleware"]:
+                self.stdout.write(
+                    self.style.NOTICE(
+                        f"  {middleware} runs its hooks in the single "
+                        "thread-sensitive thread under ASGI."
+                    )
+                )
+
+    @staticmethod
+    def run_process(server: str, async_views: bool, options: dict) -> dict:
+        """Runs load test of server in a new process (urls depend on
+        ASYNC_AJAX_VIEWS setting).
+        """
+        output = subprocess.run(
+            [
+                sys.executable,
+                str(Path(settings.BASE_DIR) / "manage.py"),
+                "reactions_load_test",
+                "--json",
+                f"--server={server}",
+                *[
+                    f"--{name.replace('_', '-')}={options[name]}"
+                    for name in [
+                        "requests",
+                        "concurrency",
+                        "users",
+                        "tutorials",
+                        "db_latency_ms",
+                    ]
+                ],
+            ],
+            env={**os.environ, "ASYNC_AJAX_VIEWS": str(async_views)},
+            check=True,
+            stdout=subprocess.PIPE,
+        ).stdout
+
+        return json.loads(output.splitlines()[-1])[0]
+
+    def load_test(self, options: dict) -> dict:
+        test_directory = tempfile.TemporaryDirectory()
+        if connection.vendor == "sqlite":
+            # In-memory database can't be shared by threads
+            connection.settings_dict["TEST"]["NAME"] = str(
+                Path(test_directory.name) / "db.sqlite3"
+            )
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+
+        try:
+            requests = self.prepare_requests(options)
+
+            if options["db_latency_ms"]:
+                connection_created.connect(
+                    self.get_latency_installer(options["db_latency_ms"]),
+                    weak=False,
+                )
+
+            run = {"wsgi": self.run_wsgi, "asgi": self.run_asgi}[
+                options["server"]
+            ]
+            start = time.perf_counter()
+            responses = run(requests, options["concurrency"])
+            elapsed = time.perf_counter() - start
+
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+            test_directory.cleanup()
+
+        latencies = sorted(latency for _, latency in responses)
+        views = "async" if settings.ASYNC_AJAX_VIEWS else "sync"
+
+        return {
+            "name": f"{options['server'].upper()} ({views} views)",
+            "requests": len(responses),
+            "errors": sum(not success for success, _ in responses),
+            "rps": len(responses) / elapsed,
+            "p50_ms": self.percentile(latencies, 50),
+            "p95_ms": self.percentile(latencies, 95),
+            "max_ms": latencies[-1],
+            "sync_only_middleware": (
+                self.get_sync_only_middleware()
+                if options["server"] == "asgi"
+                else []
+            ),
+            "thread_sensitive_middleware": (
+                self.get_thread_sensitive_middleware()
+                if options["server"] == "asgi"
+                else []
+            ),
+        }
+
+    @staticmethod
+    def prepare_requests(options: dict) -> list[LoadRequest]:
+        """Creates users (and their sessions) and tutorials and returns
+        requests of random users to random reaction endpoints of random
+        tutorials.
+        """
+        rand = random.Random(0)
+        user_model = get_user_model()
+
+        users = [
+            user_model.objects.create_user(
+                username=f"load_test_user_{number}",
+                email=f"load_test_user_{number}@example.com",
+                password=None,
+            )
+            for number in range(options["users"])
+        ]
+        tutorials = [
+            Tutorial.objects.create(
+                title=f"Load test {number}",
+                slug=f"load-test-{number}",
+                short_description="Load test",
+                body="Load test",
+                author=rand.choice(users),
+                confirm_status=ConfirmStatusChoices.CONFIRMED,
+            )
+            for number in range(options["tutorials"])
+        ]
+
+        cookies = []
+        for user in users:
+            client = Client()
+            client.force_login(user)
+
+            request = HttpRequest()
+            csrf_token = get_token(request)
+            cookies.append(
+                (
+                    f"{settings.SESSION_COOKIE_NAME}="
+                    f"{client.cookies[settings.SESSION_COOKIE_NAME].value}; "
+                    f"{settings.CSRF_COOKIE_NAME}="
+                    f"{request.META['CSRF_COOKIE']}",
+                    csrf_token,
+                )
+            )
+
+        return [
+            LoadRequest(
+                rand.choice(PATHS),
+                json.dumps({"tutorial_id": rand.choice(tutorials).pk})
+                .encode(),
+                *rand.choice(cookies),
+            )
+            for _ in range(options["requests"])
+        ]
+
+    @staticmethod
+    def get_latency_installer(latency_ms: float):
+        def latency_wrapper(execute, sql, params, many, context):
+            time.sleep(latency_ms / 1000)
+            return execute(sql, params, many, context)
+
+        def install_latency_wrapper(sender, connection, **kwargs):
+            connection.execute_wrappers.insert(0, latency_wrapper)
+
+        return install_latency_wrapper
+
+    @staticmethod
+    def is_successful(status_code: int, content: bytes) -> bool:
+        # Ajax views return database errors by status 0
+        return status_code == 200 and json.loads(content)["status"] != 0
+
+    def run_wsgi(
+        self, requests: list[LoadRequest], concurrency: int
+    ) -> list[tuple[bool, float]]:
+        handler = WSGIHandler()
+
+        def send(request: LoadRequest) -> tuple[bool, float]:
+            environ = {
+                "REQUEST_METHOD": "POST",
+                "SCRIPT_NAME": "",
+                "PATH_INFO": request.path,
+                "QUERY_STRING": "",
+                "SERVER_NAME": "testserver",
+                "SERVER_PORT": "80",
+                "SERVER_PROTOCOL": "HTTP/1.1",
+                "REMOTE_ADDR": "127.0.0.1",
+                "CONTENT_TYPE": "application/json",
+                "CONTENT_LENGTH": str(len(request.body)),
+                "HTTP_X_REQUESTED_WITH": "XMLHttpRequest",
+                "HTTP_X_CSRFTOKEN": request.csrf_token,
+                "HTTP_COOKIE": request.cookie,
+                "wsgi.version": (1, 0),
+                "wsgi.url_scheme": "http",
+                "wsgi.input": BytesIO(request.body),
+                "wsgi.errors": sys.stderr,
+                "wsgi.multithread": True,
+                "wsgi.multiprocess": False,
+                "wsgi.run_once": False,
+            }
+            statuses = []
+
+            start = time.perf_counter()
+            response = handler(
+                environ, lambda status, headers: statuses.append(status)
+            )
+            content = b"".join(response)
+            response.close()
+            latency = (time.perf_counter() - start) * 1000
+
+            status_code = int(statuses[0].split()[0])
+            return self.is_successful(status_code, content), latency
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(send, requests))
+
+    def run_asgi(
+        self, requests: list[LoadRequest], concurrency: int
+    ) -> list[tuple[bool, float]]:
+        handler = ASGIHandler()
+
+        async def send(
+            request: LoadRequest, semaphore: asyncio.Semaphore
+        ) -> tuple[bool, float]:
+            scope = {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": "POST",
+                "scheme": "http",
+                "path": request.path,
+                "raw_path": request.path.encode(),
+                "query_string": b"",
+                "root_path": "",
+                "headers": [
+                    (b"host", b"testserver"),
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(request.body)).encode()),
+                    (b"x-requested-with", b"XMLHttpRequest"),
+                    (b"x-csrftoken", request.csrf_token.encode()),
+                    (b"cookie", request.cookie.encode()),
+                ],
+                "client": ("127.0.0.1", 0),
+                "server": ("testserver", 80),
+            }
+            messages = [
+                {"type": "http.request", "body": request.body},
+                {"type": "http.disconnect"},
+            ]
+            response = {"status": 0, "body": b""}
+
+            async def receive():
+                return messages.pop(0) if len(messages) > 1 else messages[0]
+
+            async def send_message(message):
+                if message["type"] == "http.response.start":
+                    response["status"] = message["status"]
+                elif message["type"] == "http.response.body":
+                    response["body"] += message.get("body", b"")
+
+            async with semaphore:
+                start = time.perf_counter()
+                await handler(scope, receive, send_message)
+                latency = (time.perf_counter() - start) * 1000
+
+            return (
+                self.is_successful(response["status"], response["body"]),
+                latency,
+            )
+
+        async def main():
+            # Threads of async views' database operations
+            asyncio.get_running_loop().set_default_executor(
+                ThreadPoolExecutor(max_workers=concurrency)
+            )
+            semaphore = asyncio.Semaphore(concurrency)
+
+            return await asyncio.gather(
+                *[send(request, semaphore) for request in requests]
+            )
+
+        return asyncio.run(main())
+
+    @staticmethod
+    def get_sync_only_middleware() -> list[str]:
+        """Returns used settings.MIDDLEWARE which aren't async capable
+        (Django adapts them by a single thread under ASGI).
+        """
+        sync_only_middleware = []
+        for path in settings.MIDDLEWARE:
+            middleware = import_string(path)
+            if getattr(middleware, "async_capable", False):
+                continue
+
+            try:
+                middleware(lambda request: None)
+            except MiddlewareNotUsed:
+                continue
+
+            sync_only_middleware.append(path)
+
+        return sync_only_middleware
+
+    @staticmethod
+    def get_thread_sensitive_middleware() -> list[str]:
+        """Returns used settings.MIDDLEWARE based on MiddlewareMixin.
+        They are async capable, but under ASGI their process_request and
+        process_response run by sync_to_async(thread_sensitive=True), i.e.
+        in a single thread shared by all requests.
+        """
+        thread_sensitive_middleware = []
+        for path in settings.MIDDLEWARE:
+            middleware = import_string(path)
+            if isinstance(middleware, type) and issubclass(
+                middleware, MiddlewareMixin
+            ):
+                thread_sensitive_middleware.append(path)
+
+        return thread_sensitive_middleware
+
+    @staticmethod
+    def percentile(values: list[float], percent: float) -> float:
+        """Returns nearest-rank percentile of sorted values."""
+        rank = max(math.ceil(percent / 100 * len(values)), 1)
+        return values[rank - 1]
@@ -0,0 +1,256 @@
+import json
+from http import HTTPStatus
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from model_bakery import baker
+from learning.models import (
+    Tutorial,
+    TutorialComment,
+    TutorialLike,
+    TutorialUpVote,
+    TutorialCommentUpVote,
+    TutorialDailyStatistics,
+    TutorialStatisticsRelationChoices,
+)
+from ajax.views import reaction_views
+from ajax.views.shared import InsertOrDeleteStatus
+from .utils import ajax_request
+
+User = get_user_model()
+
+
+class ReactionsBatchViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = baker.make(User)
+        cls.author = baker.make(User)
+        cls.tutorials: list[Tutorial] = baker.make_recipe(
+            "learning.confirmed_tutorial",
+            author=cls.author,
+            is_active=True,
+            _quantity=5,
+        )
+        cls.comment: TutorialComment = baker.make_recipe(
+            "learning.confirmed_tutorial_comment",
+            user=cls.author,
+            is_active=True,
+        )
+
+    def setUp(self):
+        self.view = reaction_views.ReactionsBatchView.as_view()
+
+    def send(self, *operations) -> HttpResponse:
+        response = self.view(
+            ajax_request({"operations": list(operations)}, self.user)
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+        return response
+
+    def get_statuses(self, *operations) -> list[int]:
+        return json.loads(self.send(*operations).content)["statuses"]
+
+    @staticmethod
+    def operation(target: str, reaction: str, object_id: int) -> dict:
+        return {"target": target, "type": reaction, "id": object_id}
+
+    def test_insert_reactions(self):
+        """Should insert reactions and update their counters."""
+        tutorial = self.tutorials[0]
+        statuses = self.get_statuses(
+            self.operation("tutorial", "like", tutorial.pk),
+            self.operation("tutorial", "upvote", tutorial.pk),
+            self.operation("tutorial_comment", "upvote", self.comment.pk),
+        )
+
+        self.assertEqual(statuses, [InsertOrDeleteStatus.INSERTED] * 3)
+
+        like = TutorialLike.objects.get(user=self.user, tutorial=tutorial)
+        up_vote = TutorialUpVote.objects.get(user=self.user, tutorial=tutorial)
+        comment_up_vote = TutorialCommentUpVote.objects.get(
+            user=self.user, comment=self.comment
+        )
+
+        tutorial.refresh_from_db()
+        self.comment.refresh_from_db()
+        self.author.refresh_from_db()
+
+        self.assertEqual(tutorial.likes_count, 1)
+        self.assertEqual(tutorial.up_votes_count, 1)
+        self.assertEqual(self.comment.up_votes_count, 1)
+        self.assertEqual(
+            self.author.scores,
+            like.score + up_vote.score + comment_up_vote.score,
+        )
+        self.assertEqual(
+            TutorialDailyStatistics.objects.get(
+                tutorial=tutorial,
+                relation=TutorialStatisticsRelationChoices.LIKE,
+            ).count,
+            1,
+        )
+
+    def test_delete_reactions(self):
+        """Should delete existing reactions and update their counters."""
+        tutorial = self.tutorials[0]
+        TutorialLike.objects.create(user=self.user, tutorial=tutorial)
+
+        statuses = self.get_statuses(
+            self.operation("tutorial", "like", tutorial.pk)
+        )
+
+        self.assertEqual(statuses, [InsertOrDeleteStatus.DELETED])
+        self.assertFalse(TutorialLike.objects.exists())
+
+        tutorial.refresh_from_db()
+        self.author.refresh_from_db()
+
+        self.assertEqual(tutorial.likes_count, 0)
+        self.assertEqual(self.author.scores, 0)
+        self.assertEqual(
+            TutorialDailyStatistics.objects.get(
+                tutorial=tutorial,
+                relation=TutorialStatisticsRelationChoices.LIKE,
+            ).count,
+            0,
+        )
+
+    def test_toggle_in_order(self):
+        """Operations on same reaction should toggle it in order and
+        only net changes should be saved.
+        """
+        tutorial = self.tutorials[0]
+        statuses = self.get_statuses(
+            *[self.operation("tutorial", "like", tutorial.pk)] * 3
+        )
+
+        self.assertEqual(
+            statuses,
+            [
+                InsertOrDeleteStatus.INSERTED,
+                InsertOrDeleteStatus.DELETED,
+                InsertOrDeleteStatus.INSERTED,
+            ],
+        )
+
+        tutorial.refresh_from_db()
+        self.assertEqual(TutorialLike.objects.count(), 1)
+        self.assertEqual(tutorial.likes_count, 1)
+
+    def test_invalid_operations_error_status(self):
+        """Invalid operations (and ones with missing targets) should
+        have ERROR status without affecting other operations.
+        """
+        inactive_tutorial = baker.make_recipe(
+            "learning.confirmed_tutorial", is_active=False
+        )
+        statuses = self.get_statuses(
+            self.operation("tutorial", "unknown", self.tutorials[0].pk),
+            self.operation("unknown", "like", self.tutorials[0].pk),
+            self.operation("tutorial", "like", "1a"),
+            self.operation("tutorial", "like", inactive_tutorial.pk),
+            "operation",
+            self.operation("tutorial", "like", self.tutorials[0].pk),
+        )
+
+        self.assertEqual(
+            statuses,
+            [InsertOrDeleteStatus.ERROR] * 5
+            + [InsertOrDeleteStatus.INSERTED],
+        )
+        self.assertEqual(TutorialLike.objects.count(), 1)
+
+    def test_bad_request(self):
+        """Should return BAD_REQUEST for missing or too many operations."""
+        operations = [
+            self.operation("tutorial", "like", self.tutorials[0].pk)
+        ] * (reaction_views.ReactionsBatchView.max_operations + 1)
+
+        for data in [{}, {"operations": []}, {"operations": operations}]:
+            with self.subTest(data=data):
+                response = self.view(ajax_request(data, self.user))
+                self.assertEqual(
+                    response.status_code, HTTPStatus.BAD_REQUEST
+                )
+
+    def test_constant_query_count(self):
+        """Query count shouldn't depend on operations count."""
+        query_counts = []
+        for tutorials in [self.tutorials[:1], self.tutorials[1:]]:
+            with CaptureQueriesContext(connection) as captured:
+                self.send(
+                    *[
+                        self.operation("tutorial", "like", tutorial.pk)
+                        for tutorial in tutorials
+                    ]
+                )
+
+            query_counts.append(len(captured))
+
+        self.assertEqual(query_counts[0], query_counts[1])
+
+
+class ReactionStatesViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = baker.make(User)
+        cls.tutorials: list[Tutorial] = baker.make_recipe(
+            "learning.confirmed_tutorial", _quantity=2
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.view = reaction_views.ReactionStatesView.as_view()
+
+    def test_states(self):
+        """Should return user's reaction states of given objects."""
+        liked, not_liked = self.tutorials
+        TutorialLike.objects.create(user=self.user, tutorial=liked)
+
+        response = self.view(
+            ajax_request(
+                {"target": "tutorial", "ids": [liked.pk, not_liked.pk]},
+                self.user,
+            )
+        )
+
+        self.assertJSONEqual(
+            response.content,
+            {
+                "states": {
+                    str(liked.pk): {
+                        "like": True,
+                        "upvote": False,
+                        "downvote": False,
+                    },
+                    str(not_liked.pk): {
+                        "like": False,
+                        "upvote": False,
+                        "downvote": False,
+                    },
+                }
+            },
+        )
+
+    def test_bad_request(self):
+        """Should return BAD_REQUEST for invalid target or ids."""
+        too_many_ids = list(
+            range(reaction_views.ReactionStatesView.max_ids + 1)
+        )
+
+        for data in [
+            {"target": "unknown", "ids": [1]},
+            {"target": "tutorial"},
+            {"target": "tutorial", "ids": []},
+            {"target": "tutorial", "ids": ["1a"]},
+            {"target": "tutorial", "ids": too_many_ids},
+        ]:
+            with self.subTest(data=data):
+                response = self.view(ajax_request(data, self.user))
+                self.assertEqual(
+                    response.status_code, HTTPStatus.BAD_REQUEST
+                )
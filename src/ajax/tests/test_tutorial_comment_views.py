@@ -25,6 +25,12 @@ class TutorialCommentUserRelationCreateDeleteViewTest(ModelTestCase):
 
         class Meta:
             managed = False
+            constraints = [
+                models.UniqueConstraint(
+                    fields=["user", "comment"],
+                    name="unique_test_comment_user_score_coin",
+                )
+            ]
 
     model = TestTutorialCommentUserScoreCoinModel
 
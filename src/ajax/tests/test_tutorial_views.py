@@ -1,12 +1,20 @@
-from django.db import models
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from asgiref.sync import sync_to_async
+from django.db import models, connections, DatabaseError
+from django.test import Client, TransactionTestCase
+from django.http import HttpRequest
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
 from model_bakery import baker
 from shared.tests.utils import ModelTestCase
-from learning.models import Tutorial
+from learning.models import Tutorial, TutorialLike
 from learning.models.tutorial_user_relation_models import (
     AbstractTutorialScoreCoinModel,
 )
 from ajax.views import tutorial_views
+from ajax.views.shared import InsertOrDeleteStatus
 from .utils import ajax_request
 
 User = get_user_model()
@@ -19,6 +27,12 @@ class TutorialUserRelationCreateDeleteViewTest(ModelTestCase):
 
         class Meta:
             managed = False
+            constraints = [
+                models.UniqueConstraint(
+                    fields=["user", "tutorial"],
+                    name="unique_test_tutorial_user_score_coin",
+                )
+            ]
 
     model = TestTutorialUserScoreCoinModel
 
@@ -52,3 +66,121 @@ class TutorialUserRelationCreateDeleteViewTest(ModelTestCase):
         self.view(self.request)
 
         self.assertNotIn(model_obj, self.model.objects.all())
+
+
+class TutorialLikeConcurrencyTest(TransactionTestCase):
+    requests_count = 40
+
+    def setUp(self):
+        self.author = baker.make(User)
+        self.user = baker.make(User)
+        self.tutorial = baker.make_recipe(
+            "learning.confirmed_tutorial", author=self.author, is_active=True
+        )
+
+        # Login once, so requests only read the session
+        login_client = Client()
+        login_client.force_login(self.user)
+        self.cookies = login_client.cookies
+
+    def like(self, _) -> Optional[int]:
+        client = Client()
+        client.cookies = self.cookies
+
+        try:
+            response = client.post(
+                "/ajax/tutorial/like",
+                data={"tutorial_id": self.tutorial.pk},
+                content_type="application/json",
+                HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+            )
+            return response.json()["status"]
+        except DatabaseError:
+            # SQLite's shared cache locks tables instead of waiting for
+            # them, but failed requests shouldn't change counts either
+            return None
+        finally:
+            connections.close_all()
+
+    def test_concurrent_likes_keep_counts_exact(self):
+        """Concurrent like toggles should never duplicate likes and
+        tutorial's likes count and author's score/coin should match
+        existing likes.
+        """
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            statuses = list(
+                executor.map(self.like, range(self.requests_count))
+            )
+
+        likes = TutorialLike.objects.filter(
+            user=self.user, tutorial=self.tutorial
+        )
+        self.assertLessEqual(likes.count(), 1)
+        self.assertTrue(any(status is not None for status in statuses))
+
+        self.tutorial.refresh_from_db()
+        self.author.refresh_from_db()
+
+        self.assertEqual(self.tutorial.likes_count, likes.count())
+        self.assertEqual(
+            self.author.scores, sum(like.score for like in likes)
+        )
+        self.assertEqual(self.author.coins, sum(like.coin for like in likes))
+
+
+class AsyncTutorialLikeViewTest(TransactionTestCase):
+    """Async views run database operations in worker threads, so
+    TransactionTestCase is used.
+    """
+
+    def setUp(self):
+        self.user = baker.make(User)
+        self.tutorial = baker.make_recipe(
+            "learning.confirmed_tutorial", is_active=True
+        )
+        self.view = tutorial_views.async_like_view
+
+    def request(self, user=None) -> HttpRequest:
+        return ajax_request(
+            {"tutorial_id": self.tutorial.pk}, user or self.user
+        )
+
+    async def test_toggle_like(self):
+        """Async view should create like and delete it on next request."""
+        response = await self.view(self.request())
+        self.assertEqual(
+            json.loads(response.content)["status"],
+            InsertOrDeleteStatus.INSERTED,
+        )
+        self.assertEqual(await self.likes_count(), 1)
+
+        response = await self.view(self.request())
+        self.assertEqual(
+            json.loads(response.content)["status"],
+            InsertOrDeleteStatus.DELETED,
+        )
+        self.assertEqual(await self.likes_count(), 0)
+
+    async def test_redirect_anonymous_user(self):
+        response = await self.view(self.request(user=AnonymousUser()))
+        self.assertEqual(response.status_code, 302)
+
+    async def test_non_ajax_request(self):
+        request = self.request()
+        del request.META["HTTP_X_REQUESTED_WITH"]
+
+        response = await self.view(request)
+        self.assertEqual(response.status_code, 400)
+
+    async def test_method_not_allowed(self):
+        request = self.request()
+        request.method = "GET"
+
+        response = await self.view(request)
+        self.assertEqual(response.status_code, 405)
+
+    @sync_to_async
+    def likes_count(self) -> int:
+        return TutorialLike.objects.filter(
+            user=self.user, tutorial=self.tutorial
+        ).count()
@@ -1,21 +1,47 @@
 """ Ajax urls """
+from django.conf import settings
 from django.urls import path
 from .views import (
     tutorial_views,
     tutorial_comment_views,
+    reaction_views,
 )
 
 app_name = "ajax"
 
+
+def reaction_view(views, name: str):
+    """Returns async version of views' reaction view (e.g. async_like_view)
+    if settings.ASYNC_AJAX_VIEWS is True.
+    """
+    if getattr(settings, "ASYNC_AJAX_VIEWS", False):
+        name = "async_" + name
+
+    return getattr(views, name)
+
+
 urlpatterns = [
-    path("tutorial/like", tutorial_views.like_view),
-    path("tutorial/upvote", tutorial_views.upvote_view),
-    path("tutorial/downvote", tutorial_views.downvote_view),
-    path("tutorial_comment/like", tutorial_comment_views.like_view),
-    path("tutorial_comment/upvote", tutorial_comment_views.upvote_view),
-    path("tutorial_comment/downvote", tutorial_comment_views.downvote_view),
+    path("tutorial/like", reaction_view(tutorial_views, "like_view")),
+    path("tutorial/upvote", reaction_view(tutorial_views, "upvote_view")),
+    path(
+        "tutorial/downvote", reaction_view(tutorial_views, "downvote_view")
+    ),
+    path(
+        "tutorial_comment/like",
+        reaction_view(tutorial_comment_views, "like_view"),
+    ),
+    path(
+        "tutorial_comment/upvote",
+        reaction_view(tutorial_comment_views, "upvote_view"),
+    ),
+    path(
+        "tutorial_comment/downvote",
+        reaction_view(tutorial_comment_views, "downvote_view"),
+    ),
     path(
         "tutorial_comment/create",
         tutorial_comment_views.TutorialCommentCreateView.as_view(),
     ),
+    path("reactions/batch", reaction_views.ReactionsBatchView.as_view()),
+    path("reactions/states", reaction_views.ReactionStatesView.as_view()),
 ]
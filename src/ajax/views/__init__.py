@@ -1,7 +1,9 @@
 from . import tutorial as tutorial_views
 from . import tutorial_comment as tutorial_comment_views
+from . import reaction as reaction_views
 
 __all__ = [
     "tutorial_views",
     "tutorial_comment_views",
+    "reaction_views",
 ]
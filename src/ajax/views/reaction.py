@@ -0,0 +1,129 @@
+from typing import Optional
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import JsonResponse, HttpResponseBadRequest
+from learning.reactions import (
+    REACTION_MODELS,
+    ReactionOperation,
+    apply_reactions,
+    get_reaction_states,
+)
+from ajax.views.shared import AjaxView, InsertOrDeleteStatus
+
+__all__ = [
+    "ReactionsBatchView",
+    "ReactionStatesView",
+]
+
+
+def parse_id(value) -> Optional[int]:
+    """Returns id of request's value (numbers or numeric strings) or None
+    if it's invalid.
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        return None
+
+    return int(value) if str(value).isdigit() else None
+
+
+class ReactionsBatchView(LoginRequiredMixin, AjaxView):
+    """Toggles a batch of user's reactions in a single transaction.
+
+    Request:
+        {"operations": [{"target": "tutorial", "type": "like", "id": 1},
+                        {"target": "tutorial_comment", "type": "upvote",
+                         "id": 2}]}
+
+    Response:
+        {"statuses": [1, -1]} (InsertOrDeleteStatus of each operation)
+    """
+
+    max_operations = 100
+    result_statuses = {
+        True: InsertOrDeleteStatus.INSERTED,
+        False: InsertOrDeleteStatus.DELETED,
+        None: InsertOrDeleteStatus.ERROR,
+    }
+
+    def db_operation(self):
+        operations = (
+            self.data.get("operations")
+            if isinstance(self.data, dict)
+            else None
+        )
+        if (
+            not isinstance(operations, list)
+            or not 0 < len(operations) <= self.max_operations
+        ):
+            return HttpResponseBadRequest()
+
+        parsed_operations = [self.parse_operation(item) for item in operations]
+        results = iter(
+            apply_reactions(
+                self.request.user,
+                [item for item in parsed_operations if item],
+            )
+        )
+
+        statuses = [
+            self.result_statuses[next(results) if operation else None]
+            for operation in parsed_operations
+        ]
+
+        return JsonResponse({"statuses": statuses})
+
+    @staticmethod
+    def parse_operation(item) -> Optional[ReactionOperation]:
+        """Returns operation of request's item (None if it's invalid)."""
+        if not isinstance(item, dict):
+            return None
+
+        target = item.get("target")
+        reaction = item.get("type")
+        object_id = parse_id(item.get("id"))
+
+        if (
+            target not in REACTION_MODELS
+            or reaction not in REACTION_MODELS[target][1]
+            or object_id is None
+        ):
+            return None
+
+        return ReactionOperation(target, reaction, object_id)
+
+
+class ReactionStatesView(LoginRequiredMixin, AjaxView):
+    """Returns user's reaction states of given tutorials or comments.
+
+    Request:
+        {"target": "tutorial_comment", "ids": [1, 2]}
+
+    Response:
+        {"states": {"1": {"like": true, "upvote": false,
+                          "downvote": false}, "2": {...}}}
+    """
+
+    max_ids = 500
+
+    def db_operation(self):
+        data = self.data if isinstance(self.data, dict) else {}
+        target = data.get("target")
+        ids = data.get("ids")
+
+        if (
+            target not in REACTION_MODELS
+            or not isinstance(ids, list)
+            or not 0 < len(ids) <= self.max_ids
+        ):
+            return HttpResponseBadRequest()
+
+        ids = [parse_id(object_id) for object_id in ids]
+        if None in ids:
+            return HttpResponseBadRequest()
+
+        return JsonResponse(
+            {
+                "states": get_reaction_states(
+                    self.request.user, target, ids
+                )
+            }
+        )
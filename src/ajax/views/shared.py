@@ -4,9 +4,10 @@ from typing import Optional, Dict
 from django.views.generic import View
 from django.db.models import QuerySet
 from django.db import transaction, DatabaseError
-from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.mixins import AccessMixin, LoginRequiredMixin
 from django.core.exceptions import ImproperlyConfigured
 from django.http import HttpRequest, JsonResponse, HttpResponseBadRequest
+from shared.asynchronous import async_view, database_sync_to_async
 
 
 logger = logging.getLogger("database")
@@ -82,7 +83,45 @@ class AjaxView(View):
         self.data = self.get_request_data()
 
 
-class AjaxModelCreateDeleteView(LoginRequiredMixin, AjaxView):
+class AsyncAjaxView(AccessMixin, AjaxView):
+    """Async version of AjaxView for ASGI deployments.
+
+    Django's ORM is sync only, so view's database operations (including
+    loading request's user) run in a thread pool (see
+    shared.asynchronous) instead of the single thread which runs
+    thread-sensitive sync code of all requests. MiddlewareMixin based
+    middleware (session, CSRF, auth, messages) still run their hooks in
+    that thread, so only the view's part of requests runs concurrently.
+    """
+
+    login_required = False
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Django 3.2 doesn't detect async class-based views
+        return async_view(super().as_view(**initkwargs))
+
+    async def dispatch(self, request: HttpRequest, *args, **kwargs):
+        if request.method.lower() not in self.http_method_names:
+            return self.http_method_not_allowed(request, *args, **kwargs)
+
+        return await database_sync_to_async(self.handle)(
+            request, *args, **kwargs
+        )
+
+    def handle(self, request: HttpRequest, *args, **kwargs):
+        """Handles request in a worker thread (as a sync view does)."""
+        if self.login_required and not request.user.is_authenticated:
+            return self.handle_no_permission()
+
+        return self.post(request, *args, **kwargs)
+
+
+class ModelCreateDeleteMixin:
+    """Creates object (by create_object()) if it doesn't exist (checked
+    by get_objects()), otherwise deletes it.
+    """
+
     model = None
 
     def db_operation(self):
@@ -98,16 +137,26 @@ class AjaxModelCreateDeleteView(LoginRequiredMixin, AjaxView):
         raise ImproperlyConfigured("get_objects should be configured.")
 
     def create_delete_object(self):
+        if self.toggle_object():
+            return JsonResponse({"status": InsertOrDeleteStatus.INSERTED})
+
+        return JsonResponse({"status": InsertOrDeleteStatus.DELETED})
+
+    def toggle_object(self) -> bool:
+        """Deletes object if exists, otherwise creates it.
+
+        Returns:
+            bool: True if object is created and False if it's deleted.
+        """
         objs = self.get_objects()
-        # If tutorial upvote already exist delete it
+        # If object already exist delete it
         if objs.exists():
-            # delete object
             self.delete_object(objs)
-            return JsonResponse({"status": InsertOrDeleteStatus.DELETED})
-        # Else insert tutorial upvote
-        else:
-            self.create_object()
-            return JsonResponse({"status": InsertOrDeleteStatus.INSERTED})
+            return False
+
+        # Else insert object
+        self.create_object()
+        return True
 
     def delete_object(self, objs: QuerySet):
         obj = objs.first()
@@ -119,3 +168,13 @@ class AjaxModelCreateDeleteView(LoginRequiredMixin, AjaxView):
         raise ImproperlyConfigured(
             "You should configure create_object to use it."
         )
+
+
+class AjaxModelCreateDeleteView(
+    LoginRequiredMixin, ModelCreateDeleteMixin, AjaxView
+):
+    pass
+
+
+class AsyncAjaxModelCreateDeleteView(ModelCreateDeleteMixin, AsyncAjaxView):
+    login_required = True
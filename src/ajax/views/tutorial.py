@@ -5,17 +5,23 @@ from learning.models import (
     TutorialUpVote,
     TutorialDownVote,
 )
-from ajax.views.shared import AjaxModelCreateDeleteView
+from ajax.views.shared import (
+    AjaxModelCreateDeleteView,
+    AsyncAjaxModelCreateDeleteView,
+)
 
 
 __all__ = [
     "like_view",
     "upvote_view",
     "downvote_view",
+    "async_like_view",
+    "async_upvote_view",
+    "async_downvote_view",
 ]
 
 
-class TutorialUserRelationCreateDeleteView(AjaxModelCreateDeleteView):
+class TutorialUserRelationMixin:
     tutorial: Optional[Tutorial] = None
 
     def prepare_objects(self):
@@ -37,9 +43,33 @@ class TutorialUserRelationCreateDeleteView(AjaxModelCreateDeleteView):
             user=self.request.user, tutorial=self.tutorial
         )
 
+    def toggle_object(self) -> bool:
+        # Single-statement insert (or delete) which is safe against
+        # concurrent requests (e.g. double-clicks)
+        return self.model.toggle(
+            user=self.request.user, tutorial=self.tutorial
+        )
+
+
+class TutorialUserRelationCreateDeleteView(
+    TutorialUserRelationMixin, AjaxModelCreateDeleteView
+):
+    pass
+
+
+class AsyncTutorialUserRelationCreateDeleteView(
+    TutorialUserRelationMixin, AsyncAjaxModelCreateDeleteView
+):
+    pass
+
 
 BaseView = TutorialUserRelationCreateDeleteView
+AsyncBaseView = AsyncTutorialUserRelationCreateDeleteView
 
 like_view = BaseView.as_view(model=TutorialLike)
 upvote_view = BaseView.as_view(model=TutorialUpVote)
 downvote_view = BaseView.as_view(model=TutorialDownVote)
+
+async_like_view = AsyncBaseView.as_view(model=TutorialLike)
+async_upvote_view = AsyncBaseView.as_view(model=TutorialUpVote)
+async_downvote_view = AsyncBaseView.as_view(model=TutorialDownVote)
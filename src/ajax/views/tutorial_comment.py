@@ -12,17 +12,21 @@ from ajax.views.shared import (
     AjaxView,
     InsertOrDeleteStatus,
     AjaxModelCreateDeleteView,
+    AsyncAjaxModelCreateDeleteView,
 )
 
 __all__ = [
     "like_view",
     "upvote_view",
     "downvote_view",
+    "async_like_view",
+    "async_upvote_view",
+    "async_downvote_view",
     "TutorialCommentCreateView",
 ]
 
 
-class TutorialCommentUserRelationCreateDeleteView(AjaxModelCreateDeleteView):
+class TutorialCommentUserRelationMixin:
     tutorial_comment: Optional[TutorialComment] = None
 
     def prepare_objects(self):
@@ -44,6 +48,25 @@ class TutorialCommentUserRelationCreateDeleteView(AjaxModelCreateDeleteView):
             user=self.request.user, comment=self.tutorial_comment
         )
 
+    def toggle_object(self) -> bool:
+        # Single-statement insert (or delete) which is safe against
+        # concurrent requests (e.g. double-clicks)
+        return self.model.toggle(
+            user=self.request.user, comment=self.tutorial_comment
+        )
+
+
+class TutorialCommentUserRelationCreateDeleteView(
+    TutorialCommentUserRelationMixin, AjaxModelCreateDeleteView
+):
+    pass
+
+
+class AsyncTutorialCommentUserRelationCreateDeleteView(
+    TutorialCommentUserRelationMixin, AsyncAjaxModelCreateDeleteView
+):
+    pass
+
 
 class TutorialCommentCreateView(LoginRequiredMixin, AjaxView):
     def db_operation(self):
@@ -65,7 +88,12 @@ class TutorialCommentCreateView(LoginRequiredMixin, AjaxView):
 
 
 BaseView = TutorialCommentUserRelationCreateDeleteView
+AsyncBaseView = AsyncTutorialCommentUserRelationCreateDeleteView
 
 like_view = BaseView.as_view(model=TutorialCommentLike)
 upvote_view = BaseView.as_view(model=TutorialCommentUpVote)
 downvote_view = BaseView.as_view(model=TutorialCommentDownVote)
+
+async_like_view = AsyncBaseView.as_view(model=TutorialCommentLike)
+async_upvote_view = AsyncBaseView.as_view(model=TutorialCommentUpVote)
+async_downvote_view = AsyncBaseView.as_view(model=TutorialCommentDownVote)
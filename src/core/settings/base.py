@@ -70,6 +70,8 @@ MIDDLEWARE = [
     # in the list. However, it must come after any other middleware
     # that encodes the response’s content, such as GZipMiddleware.
     "debug_toolbar.middleware.DebugToolbarMiddleware",
+    # Profiles a sample of requests (see PROFILING_SAMPLE_RATE)
+    "shared.middleware.ProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -121,6 +123,76 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+# Note: Use django_redis.cache.RedisCache backend in production
+
+CACHES = {
+    "default": {
+        "BACKEND": config(
+            "CACHE_BACKEND",
+            default="django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": config("CACHE_LOCATION", default=""),
+        "KEY_PREFIX": "majazamooz",
+    }
+}
+
+
+# Write-behind counters
+# Counter changes (likes, votes, views, scores and coins) are buffered
+# and flushed periodically instead of updating them on every request.
+# Buffer is kept in redis if WRITE_BEHIND_COUNTERS_REDIS_URL is set
+# (flush it by "flush_counters" command), otherwise in process memory
+# (flushed every WRITE_BEHIND_COUNTERS_FLUSH_INTERVAL seconds).
+
+WRITE_BEHIND_COUNTERS = config(
+    "WRITE_BEHIND_COUNTERS", default=False, cast=bool
+)
+WRITE_BEHIND_COUNTERS_REDIS_URL = config(
+    "WRITE_BEHIND_COUNTERS_REDIS_URL", default=""
+)
+WRITE_BEHIND_COUNTERS_FLUSH_INTERVAL = config(
+    "WRITE_BEHIND_COUNTERS_FLUSH_INTERVAL", default=5, cast=float
+)
+
+
+# Request profiling
+# ProfilingMiddleware profiles PROFILING_SAMPLE_RATE (0 to 1) of requests
+# and logs their timings by "profiling" logger. Timings are also sent
+# as Server-Timing header if PROFILING_SERVER_TIMING is True.
+
+PROFILING_SAMPLE_RATE = config("PROFILING_SAMPLE_RATE", default=0, cast=float)
+PROFILING_SERVER_TIMING = config(
+    "PROFILING_SERVER_TIMING", default=True, cast=bool
+)
+
+
+# Slow queries
+# Queries slower than SLOW_QUERY_THRESHOLD_MS (0 disables it) are recorded
+# in a per-process ring buffer of SLOW_QUERY_BUFFER_SIZE queries which is
+# snapshotted to cache every SLOW_QUERY_SNAPSHOT_INTERVAL seconds.
+# See "slow_queries" command.
+
+SLOW_QUERY_THRESHOLD_MS = config(
+    "SLOW_QUERY_THRESHOLD_MS", default=0, cast=float
+)
+SLOW_QUERY_BUFFER_SIZE = config(
+    "SLOW_QUERY_BUFFER_SIZE", default=1000, cast=int
+)
+SLOW_QUERY_SNAPSHOT_INTERVAL = config(
+    "SLOW_QUERY_SNAPSHOT_INTERVAL", default=10, cast=float
+)
+
+
+# Async ajax views
+# Under ASGI, ajax reaction endpoints (like, up-vote and down-vote) are
+# served by async views if ASYNC_AJAX_VIEWS is True. See
+# "reactions_load_test" command to compare them with sync ones.
+
+ASYNC_AJAX_VIEWS = config("ASYNC_AJAX_VIEWS", default=False, cast=bool)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.1/ref/settings/#auth-password-validators
 
@@ -285,6 +357,13 @@ LOGGING = {
             "class": "logging.FileHandler",
             "filename": config("LOGGING_FILE_NAME", "logs.log"),
         },
+        # Same file as file_json, but lets profiling records (INFO) in
+        "profiling_file_json": {
+            "level": "INFO",
+            "formatter": "json",
+            "class": "logging.FileHandler",
+            "filename": config("LOGGING_FILE_NAME", "logs.log"),
+        },
     },
     "loggers": {
         "": {
@@ -307,6 +386,11 @@ LOGGING = {
             "level": "ERROR",
             "propagate": False,
         },
+        "profiling": {
+            "handlers": ["profiling_file_json"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
 }
 
@@ -381,6 +465,10 @@ CONSTANCE_CONFIG = OrderedDict(
             "LEARNING_HOME_CAROUSEL_ITEMS_COUNT",
             (6, "صفحه اصلی - تعداد گزینه اسلایدرها", int),
         ),
+        (
+            "LEARNING_HOME_CAROUSELS_CACHE_TIMEOUT",
+            (600, "صفحه اصلی - مدت زمان کش اسلایدرها (ثانیه)", int),
+        ),
         (
             "LEARNING_RECOMMENDATION_ITEMS_COUNT",
             (5, "آموزش - تعداد موارد پیشنهادها", int),
@@ -389,6 +477,26 @@ CONSTANCE_CONFIG = OrderedDict(
             "LEARNING_TUTORIAL_ARCHIVE_PAGINATE_BY",
             (30, "آرشیو آموزش ها - تعداد آموزش هر صفحه", int),
         ),
+        (
+            "LEARNING_TUTORIAL_ARCHIVE_COUNT_CACHE_TIMEOUT",
+            (60, "آرشیو آموزش ها - مدت زمان کش تعداد آموزش ها (ثانیه)", int),
+        ),
+        (
+            "LEARNING_TUTORIAL_COMMENT_THREADS_PAGINATE_BY",
+            (20, "آموزش - تعداد رشته نظرات هر صفحه", int),
+        ),
+        (
+            "LEARNING_REACTION_STATES_CACHE_TIMEOUT",
+            (300, "واکنش ها - مدت زمان کش واکنش های کاربر (ثانیه)", int),
+        ),
+        (
+            "LEARNING_NOTIFICATIONS_DIGEST_WINDOW",
+            (
+                0,
+                "اطلاعیه ها - بازه ارسال خلاصه دیدگاه ها (دقیقه، 0 = غیرفعال)",
+                int,
+            ),
+        ),
         # User panel
         (
             "USER_PANEL_PAGINATE_BY",
@@ -1 +1,11 @@
 from .base import *  # noqa
+from .base import MIDDLEWARE
+
+# Debug toolbar is only shown when DEBUG is True and its middleware is
+# sync only, so under ASGI it would run every request in a single thread
+MIDDLEWARE = [
+    middleware
+    for middleware in MIDDLEWARE
+    if not middleware.startswith("debug_toolbar.")
+]
+SILENCED_SYSTEM_CHECKS = ["debug_toolbar.W001"]
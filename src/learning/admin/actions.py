@@ -10,7 +10,10 @@ from learning.notifications import (
     TutorialCommentReplyNotifier,
     TutorialAuthorNewConfirmedCommentNotifier,
 )
-from learning.models import TutorialComment
+from learning.models import Tutorial, TutorialComment
+from learning.caches import invalidate_home_carousels
+from learning.moderation import set_confirm_status
+from learning.recommendations import schedule_related_tutorials_update
 
 
 def message_user_email_results(
@@ -19,21 +22,75 @@ def message_user_email_results(
     notifications_result: NotificationResult,
 ):
 
-    if notifications_result.success:
-        successful_notifications_msg = (
-            f"{notifications_result.success} اطلاعیه با موفقیت ارسال شد"
+    if notifications_result.queued:
+        queued_notifications_msg = (
+            f"{notifications_result.queued} اطلاعیه در صف ارسال قرار گرفت"
         )
         modeladmin.message_user(
-            request, successful_notifications_msg, messages.SUCCESS
+            request, queued_notifications_msg, messages.SUCCESS
         )
 
-    if notifications_result.failed:
-        failed_notifications_msg = (
-            f"ارسال {notifications_result.failed} اطلاعیه با خطا مواجه شد"
-        )
-        modeladmin.message_user(
-            request, failed_notifications_msg, messages.ERROR
-        )
+
+def moderate_tutorials(
+    request: HttpRequest,
+    queryset: QuerySet[Tutorial],
+    confirm_status: ConfirmStatusChoices,
+) -> tuple[int, NotificationResult]:
+    """Sets confirm status of tutorials and notifies their authors.
+
+    Returns:
+        tuple[int, NotificationResult]: Count of updated tutorials and
+            notifications result.
+    """
+    # Updates and fetches updated tutorials together
+    tutorials = set_confirm_status(queryset, confirm_status)
+
+    # Bulk updates don't trigger tutorials' lifecycle hooks
+    invalidate_home_carousels()
+    schedule_related_tutorials_update(tutorial.pk for tutorial in tutorials)
+
+    notify_result = TutorialConfirmDisproveNotifier(
+        request, tutorials
+    ).notify()
+
+    return len(tutorials), notify_result
+
+
+def moderate_tutorial_comments(
+    request: HttpRequest,
+    queryset: QuerySet[TutorialComment],
+    confirm_status: ConfirmStatusChoices,
+) -> tuple[int, NotificationResult]:
+    """Sets confirm status of comments and notifies their users
+    (and tutorial authors and replied users if comments are confirmed).
+
+    Returns:
+        tuple[int, NotificationResult]: Count of updated comments and
+            notifications result.
+    """
+    # Updates and fetches updated comments together
+    comments = set_confirm_status(queryset, confirm_status)
+
+    # Bulk updates don't trigger comments' lifecycle hooks
+    # thus, recalculate comments count of their tutorials
+    Tutorial.objects.filter(
+        pk__in={comment.tutorial_id for comment in comments}
+    ).update_active_confirmed_comments_count()
+    # Carousels show tutorials' comments count
+    invalidate_home_carousels()
+
+    notifiers = [TutorialCommentConfirmDisproveNotifier]
+    if confirm_status == ConfirmStatusChoices.CONFIRMED:
+        notifiers += [
+            TutorialCommentReplyNotifier,
+            TutorialAuthorNewConfirmedCommentNotifier,
+        ]
+
+    notify_result = NotificationResult()
+    for notifier in notifiers:
+        notify_result += notifier(request, comments).notify()
+
+    return len(comments), notify_result
 
 
 @admin.action(
@@ -42,25 +99,10 @@ def message_user_email_results(
 def confirm_tutorial_action(
     modeladmin: ModelAdmin, request: HttpRequest, queryset: QuerySet
 ):
-
-    update_queryset = queryset.exclude(
-        confirm_status=ConfirmStatusChoices.CONFIRMED
-    ).filter(is_active=True)
-    update_item_pks = [tutorial.pk for tutorial in update_queryset]
-
-    updated = update_queryset.update(
-        confirm_status=ConfirmStatusChoices.CONFIRMED
+    updated, notify_result = moderate_tutorials(
+        request, queryset, ConfirmStatusChoices.CONFIRMED
     )
 
-    # Execute new query to get updated objects for notification
-    send_mail_queryset = queryset.filter(
-        pk__in=update_item_pks
-    ).select_related("author")
-
-    # Send notifications
-    notifier = TutorialConfirmDisproveNotifier(request, send_mail_queryset)
-    notify_result = notifier.notify()
-
     # Send messages
     modeladmin.message_user(
         request, f"{updated} مورد با موفقیت تایید شد", messages.SUCCESS
@@ -75,25 +117,10 @@ def confirm_tutorial_action(
 def disprove_tutorial_action(
     modeladmin: ModelAdmin, request: HttpRequest, queryset: QuerySet
 ):
-
-    update_queryset = queryset.exclude(
-        confirm_status=ConfirmStatusChoices.DISPROVED
-    ).filter(is_active=True)
-    update_item_pks = [tutorial.pk for tutorial in update_queryset]
-
-    updated = update_queryset.update(
-        confirm_status=ConfirmStatusChoices.DISPROVED
+    updated, notify_result = moderate_tutorials(
+        request, queryset, ConfirmStatusChoices.DISPROVED
     )
 
-    # Execute new query to get updated objects for notification
-    send_mail_queryset = queryset.filter(
-        pk__in=update_item_pks
-    ).select_related("author")
-
-    # Send notifications
-    notifier = TutorialConfirmDisproveNotifier(request, send_mail_queryset)
-    notify_result = notifier.notify()
-
     modeladmin.message_user(
         request, f"{updated} مورد با موفقیت رد شد", messages.SUCCESS
     )
@@ -109,44 +136,8 @@ def confirm_tutorial_comment_action(
     request: HttpRequest,
     queryset: QuerySet[TutorialComment],
 ):
-
-    # After update update_queryset becomes empty because of applied exclusion
-    # then we store update item primary keys in update_item_pks t use later
-    update_queryset = queryset.exclude(
-        confirm_status=ConfirmStatusChoices.CONFIRMED
-    ).filter(is_active=True)
-    update_item_pks = [comment.pk for comment in update_queryset]
-
-    updated_count = update_queryset.update(
-        confirm_status=ConfirmStatusChoices.CONFIRMED
-    )
-
-    # Execute new query to get updated objects for notification
-    send_mail_queryset = queryset.filter(
-        pk__in=update_item_pks
-    ).select_related(
-        "user", "tutorial", "parent_comment", "parent_comment__user"
-    )
-
-    # Send notifications
-    confirm_disprove_notifier_result = TutorialCommentConfirmDisproveNotifier(
-        request, send_mail_queryset
-    ).notify()
-
-    reply_notifier_result = TutorialCommentReplyNotifier(
-        request, send_mail_queryset
-    ).notify()
-
-    tutorial_author_new_comment_notifier_result = (
-        TutorialAuthorNewConfirmedCommentNotifier(
-            request, send_mail_queryset
-        ).notify()
-    )
-
-    emails_result = (
-        confirm_disprove_notifier_result
-        + reply_notifier_result
-        + tutorial_author_new_comment_notifier_result
+    updated_count, emails_result = moderate_tutorial_comments(
+        request, queryset, ConfirmStatusChoices.CONFIRMED
     )
 
     # Send messages
@@ -161,32 +152,12 @@ def confirm_tutorial_comment_action(
 def disprove_tutorial_comment_action(
     modeladmin: ModelAdmin, request: HttpRequest, queryset: QuerySet
 ):
-
-    # After update update_queryset becomes empty because of applied exclusion
-    # thus, we store update item primary keys in update_item_pks t use later
-    update_queryset = queryset.exclude(
-        confirm_status=ConfirmStatusChoices.DISPROVED
-    ).filter(is_active=True)
-    update_item_pks = [comment.pk for comment in update_queryset]
-
-    updated_count = update_queryset.update(
-        confirm_status=ConfirmStatusChoices.DISPROVED
+    updated_count, emails_result = moderate_tutorial_comments(
+        request, queryset, ConfirmStatusChoices.DISPROVED
     )
 
-    # Execute new query to get updated objects for notification
-    send_mail_queryset = queryset.filter(
-        pk__in=update_item_pks
-    ).select_related("user", "tutorial")
-
-    # Send notifications
-    confirm_disprove_notifier_result = TutorialCommentConfirmDisproveNotifier(
-        request, send_mail_queryset
-    ).notify()
-
     modeladmin.message_user(
         request, f"{updated_count} مورد با موفقیت رد شد", messages.SUCCESS
     )
 
-    message_user_email_results(
-        request, modeladmin, confirm_disprove_notifier_result
-    )
+    message_user_email_results(request, modeladmin, emails_result)
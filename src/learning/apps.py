@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class LearningConfig(AppConfig):
     name = "learning"
     verbose_name = "آموزش"
+
+    def ready(self):
+        # Connect signal receivers
+        from learning import signals  # noqa: F401 pylint: disable=C0415,W0611
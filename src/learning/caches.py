@@ -0,0 +1,97 @@
+""" Cached data of learning app """
+import hashlib
+from typing import Callable
+from shared.cache import get_or_set_locked, invalidate_namespace, make_key
+from learning.category_tree import CATEGORY_TREE_NAMESPACE
+
+HOME_CAROUSELS_NAMESPACE = "learning:home_carousels"
+REACTION_STATES_NAMESPACE = "learning:reaction_states:{user_id}"
+
+# Navbar is keyed by category tree version, timeout only removes
+# old versions' values
+NAVBAR_CATEGORIES_TIMEOUT = 24 * 60 * 60
+
+
+def get_home_carousels(
+    items_count: int, calculate: Callable[[], dict], timeout: int
+) -> dict:
+    """Returns cached home page carousels.
+
+    Args:
+        items_count (int): Carousels' items count (part of cache key).
+        calculate (Callable[[], dict]): Calculates carousels on cache miss.
+        timeout (int): Cache timeout (seconds).
+
+    Returns:
+        dict: Carousels' names to their (materialized) tutorials.
+    """
+    return get_or_set_locked(
+        make_key(HOME_CAROUSELS_NAMESPACE, items_count),
+        calculate,
+        timeout,
+    )
+
+
+def invalidate_home_carousels():
+    """Invalidates cached home page carousels (e.g. when a tutorial
+    is confirmed or liked).
+    """
+    invalidate_namespace(HOME_CAROUSELS_NAMESPACE)
+
+
+def get_navbar_categories(render: Callable[[], str]) -> str:
+    """Returns cached navbar categories HTML of current category tree
+    version (category tree invalidation invalidates it too).
+
+    Args:
+        render (Callable[[], str]): Renders navbar categories on cache miss.
+
+    Returns:
+        str: Rendered navbar categories.
+    """
+    return get_or_set_locked(
+        make_key(CATEGORY_TREE_NAMESPACE, "navbar"),
+        render,
+        NAVBAR_CATEGORIES_TIMEOUT,
+    )
+
+
+def get_reaction_states(
+    user_id: int,
+    target: str,
+    object_ids: list[int],
+    calculate: Callable[[], dict],
+    timeout: int,
+) -> dict:
+    """Returns cached reaction states of user for given objects.
+
+    Args:
+        user_id (int): User's primary key (each user has a namespace).
+        target (str): Objects' target name (e.g. tutorial_comment).
+        object_ids (list[int]): Objects' sorted primary keys.
+        calculate (Callable[[], dict]): Calculates states on cache miss.
+        timeout (int): Cache timeout (seconds).
+
+    Returns:
+        dict: Objects' primary keys to their reaction states.
+    """
+    ids_hash = hashlib.md5(
+        ",".join(map(str, object_ids)).encode()
+    ).hexdigest()
+
+    return get_or_set_locked(
+        make_key(
+            REACTION_STATES_NAMESPACE.format(user_id=user_id),
+            target,
+            ids_hash,
+        ),
+        calculate,
+        timeout,
+    )
+
+
+def invalidate_reaction_states(user_id: int):
+    """Invalidates cached reaction states of user (e.g. when user likes
+    a tutorial or comment).
+    """
+    invalidate_namespace(REACTION_STATES_NAMESPACE.format(user_id=user_id))
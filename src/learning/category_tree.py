@@ -0,0 +1,137 @@
+""" Process-wide category tree snapshot
+
+Categories are few and rarely change but their hierarchy is needed on
+many requests (archive filter, recommendations, navbar). So each process
+keeps a snapshot of the whole tree (ids, parents, names and slugs with
+precomputed ancestors and descendants) and reuses it while the tree's
+version in cache (CATEGORY_TREE_NAMESPACE) doesn't change.
+
+Category hooks increase the version, then every process reloads its
+snapshot (by a single query) on next access.
+"""
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Iterable, Optional
+from django.apps import apps
+from shared.cache import get_namespace_version, invalidate_namespace
+
+CATEGORY_TREE_NAMESPACE = "learning:category_tree"
+
+_snapshot_lock = threading.Lock()
+# (version, tree) tuple
+_snapshot: Optional[tuple] = None
+
+
+@dataclass(frozen=True)
+class CategoryNode:
+    id: int
+    parent_id: Optional[int]
+    name: str
+    slug: str
+    is_active: bool
+
+
+class CategoryTree:
+    """Immutable category hierarchy with precomputed lookups.
+
+    Attributes:
+        nodes (dict[int, CategoryNode]): Category ids to their nodes.
+        ancestors (dict[int, tuple[int, ...]]): Category ids to their
+            ancestors' ids (nearest parent first).
+        descendants (dict[int, frozenset[int]]): Category ids to their
+            descendants' ids.
+    """
+
+    def __init__(self, nodes: Iterable[CategoryNode]):
+        self.nodes: dict[int, CategoryNode] = {
+            node.id: node for node in nodes
+        }
+        self._ids_by_slug = {
+            node.slug: node.id for node in self.nodes.values()
+        }
+
+        self.ancestors: dict[int, tuple[int, ...]] = {}
+        for node in self.nodes.values():
+            chain = []
+            parent_id = node.parent_id
+            # Guard against cycles made by invalid data
+            while (
+                parent_id in self.nodes
+                and parent_id != node.id
+                and parent_id not in chain
+            ):
+                chain.append(parent_id)
+                parent_id = self.nodes[parent_id].parent_id
+
+            self.ancestors[node.id] = tuple(chain)
+
+        descendants = defaultdict(set)
+        for category_id, ancestor_ids in self.ancestors.items():
+            for ancestor_id in ancestor_ids:
+                descendants[ancestor_id].add(category_id)
+
+        self.descendants: dict[int, frozenset[int]] = {
+            category_id: frozenset(descendants[category_id])
+            for category_id in self.nodes
+        }
+
+    def get_id(self, slug: str) -> Optional[int]:
+        """Returns id of category with given slug (None if not found)."""
+        return self._ids_by_slug.get(slug)
+
+    def is_ancestor(self, ancestor_id: int, category_id: int) -> bool:
+        """Returns whether ancestor_id is one of category's ancestors."""
+        return category_id in self.descendants.get(ancestor_id, ())
+
+    def get_subtree_ids(self, category_id: int) -> frozenset[int]:
+        """Returns ids of category and its descendants."""
+        if category_id not in self.nodes:
+            return frozenset()
+
+        return self.descendants[category_id] | {category_id}
+
+
+def _load_category_tree() -> CategoryTree:
+    category_model = apps.get_model("learning", "Category")
+
+    return CategoryTree(
+        CategoryNode(*values)
+        for values in category_model.objects.order_by("pk").values_list(
+            "pk", "parent_category", "name", "slug", "is_active"
+        )
+    )
+
+
+def get_category_tree() -> CategoryTree:
+    """Returns current category tree snapshot. It's reloaded from database
+    only if tree's version is changed since the last load.
+
+    Returns:
+        CategoryTree: Category tree.
+    """
+    global _snapshot  # pylint: disable=global-statement
+
+    # Version is read before loading tree, so a change during loading
+    # makes this snapshot outdated (not hidden by a newer version)
+    version = get_namespace_version(CATEGORY_TREE_NAMESPACE)
+
+    snapshot = _snapshot
+    if snapshot is not None and snapshot[0] == version:
+        return snapshot[1]
+
+    with _snapshot_lock:
+        if _snapshot is not None and _snapshot[0] == version:
+            return _snapshot[1]
+
+        tree = _load_category_tree()
+        _snapshot = (version, tree)
+
+    return tree
+
+
+def invalidate_category_tree():
+    """Invalidates category tree snapshots of all processes (e.g. when
+    a category changes).
+    """
+    invalidate_namespace(CATEGORY_TREE_NAMESPACE)
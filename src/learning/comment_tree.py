@@ -0,0 +1,144 @@
+""" Tutorial comment tree
+
+Tutorial page shows active and confirmed comments as threads (top-level
+comments with their nested replies). Instead of fetching comments as
+model instances and finding each comment's replies by scanning all of
+them (O(n^2) for n comments), get_comment_tree fetches only rendered
+columns of tutorial's comments by a single query and build_comment_tree
+links every comment to its parent in a single pass (O(n)).
+
+As before, replies of comments which aren't shown (e.g. inactive or
+unconfirmed parent) or don't allow reply aren't shown either.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, NamedTuple, Optional
+from django.contrib.auth import get_user_model
+from django.core.paginator import Page, Paginator
+from django.db.models.fields.files import FieldFile
+
+# Comment columns of CommentNode in order (followed by user columns)
+COMMENT_FIELDS = (
+    "pk",
+    "parent_comment",
+    "title",
+    "body",
+    "up_votes_count",
+    "down_votes_count",
+    "likes_count",
+    "allow_reply",
+    "create_date",
+)
+USER_FIELDS = ("user", "user__first_name", "user__last_name", "user__avatar")
+
+
+class CommentUser(NamedTuple):
+    pk: int
+    first_name: str
+    last_name: str
+    avatar: FieldFile
+
+
+class CommentNode(NamedTuple):
+    pk: int
+    parent_comment_id: Optional[int]
+    title: str
+    body: str
+    up_votes_count: int
+    down_votes_count: int
+    likes_count: int
+    allow_reply: bool
+    create_date: datetime
+    user: CommentUser
+    # Replies in comments' order
+    replies: list
+
+
+@dataclass
+class CommentTree:
+    """Comment threads of a tutorial.
+
+    Attributes:
+        threads (list[CommentNode]): Top-level comments in comments'
+            order.
+        count (int): Count of shown comments (including replies).
+    """
+
+    threads: list[CommentNode]
+    count: int
+
+    def paginate(self, number, per_page: int) -> Page:
+        """Returns given page of threads (first or last page if number
+        is invalid or out of range).
+        """
+        return Paginator(self.threads, per_page).get_page(number)
+
+
+def build_comment_tree(rows: Iterable[tuple]) -> CommentTree:
+    """Builds comment tree of comment rows (COMMENT_FIELDS + USER_FIELDS
+    values) in a single pass.
+
+    Args:
+        rows (Iterable[tuple]): Comment rows in threads' order.
+
+    Returns:
+        CommentTree: Comment tree.
+    """
+    avatar_field = get_user_model()._meta.get_field("avatar")
+    users: dict[int, CommentUser] = {}
+    nodes: dict[int, CommentNode] = {}
+
+    comment_fields_count = len(COMMENT_FIELDS)
+    for row in rows:
+        user_id = row[comment_fields_count]
+        user = users.get(user_id)
+        if user is None:
+            _, first_name, last_name, avatar = row[comment_fields_count:]
+            user = users[user_id] = CommentUser(
+                user_id,
+                first_name,
+                last_name,
+                FieldFile(None, avatar_field, avatar),
+            )
+
+        nodes[row[0]] = CommentNode(
+            *row[:comment_fields_count], user, []
+        )
+
+    threads = []
+    for node in nodes.values():
+        if node.parent_comment_id is None:
+            threads.append(node)
+            continue
+
+        parent = nodes.get(node.parent_comment_id)
+        if parent is not None and parent.allow_reply:
+            parent.replies.append(node)
+
+    # Replies of hidden comments (or of cycles made by invalid data) are
+    # unreachable from threads, so they are not counted
+    count = 0
+    stack = list(threads)
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.replies)
+
+    return CommentTree(threads, count)
+
+
+def get_comment_tree(tutorial) -> CommentTree:
+    """Fetches active and confirmed comments of tutorial (by a single
+    query) and returns their tree.
+
+    Args:
+        tutorial (Tutorial): Tutorial.
+
+    Returns:
+        CommentTree: Tutorial's comment tree.
+    """
+    return build_comment_tree(
+        tutorial.comments.active_and_confirmed_comments().values_list(
+            *COMMENT_FIELDS, *USER_FIELDS
+        )
+    )
@@ -1,5 +1,6 @@
 import django_filters
-from django.db.models import Q, QuerySet
+from django.db.models import QuerySet
+from learning.category_tree import get_category_tree
 
 
 class AscendingDescendingChoices:
@@ -11,10 +12,11 @@ class TutorialArchiveFilterSet(django_filters.FilterSet):
     """FilterSet for tutorial archive page.
 
     Filters:
-        category: Tutorial's category slug.
+        category: Tutorial's category slug (includes its subcategories).
         search: Search condition to search in title, body and more ...
         order_by: Tutorials ordering. (choices: title, user_views_count,
-            likes_count, create_date).
+            likes_count, create_date). Searched tutorials are ordered
+            by their search rank if order_by is not given.
         ascending_or_descending: Overrides ascending/descending order of
             order_by filter.
     """
@@ -27,12 +29,12 @@ class TutorialArchiveFilterSet(django_filters.FilterSet):
         # Make data mutable if it's immutable
         self.data = self.data.copy()
 
-        # Set default order_by
-        if "order_by" not in self.data:
+        # Set default order_by (search results are ordered by rank)
+        if "order_by" not in self.data and not self.data.get("search"):
             self.data["order_by"] = self.DEFAULT_ORDER_BY
 
         # Get ordering value
-        ordering: str = self.data["order_by"]
+        ordering: str = self.data.get("order_by", "")
         # Get ascending_or_descending from data with default value=descending
         ascending_or_descending = self.data.get("ascending_or_descending")
 
@@ -40,6 +42,7 @@ class TutorialArchiveFilterSet(django_filters.FilterSet):
         # '-' at the start, add it.
         if (
             ascending_or_descending == AscendingDescendingChoices.DESCENDING
+            and ordering
             and (not ordering.startswith("-"))
         ):
             self.data["order_by"] = "-" + ordering
@@ -52,9 +55,7 @@ class TutorialArchiveFilterSet(django_filters.FilterSet):
         ):
             self.data["order_by"] = ordering[1:]
 
-    category = django_filters.CharFilter(
-        field_name="categories", lookup_expr="slug"
-    )
+    category = django_filters.CharFilter(method="category_filter")
 
     search = django_filters.CharFilter(method="search_filter")
 
@@ -62,16 +63,20 @@ class TutorialArchiveFilterSet(django_filters.FilterSet):
         fields=("title", "user_views_count", "likes_count", "create_date"),
     )
 
-    def search_filter(self, queryset: QuerySet, _, value):
-        """Search condition in title, body and more ..."""
+    def category_filter(self, queryset: QuerySet, _, value):
+        """Tutorials of category and its subcategories"""
+        tree = get_category_tree()
+        category_id = tree.get_id(value)
+        if category_id is None:
+            return queryset.none()
+
+        tutorial_categories = queryset.model.categories.through
         return queryset.filter(
-            Q(title__contains=value)
-            | Q(short_description__contains=value)
-            | Q(body__contains=value)
-            | Q(slug__contains=value)
-            | (
-                Q(categories__name__contains=value)
-                & Q(categories__is_active=True)
-            )
-            | Q(tags__title__contains=value)
+            pk__in=tutorial_categories.objects.filter(
+                category_id__in=tree.get_subtree_ids(category_id)
+            ).values("tutorial_id")
         )
+
+    def search_filter(self, queryset: QuerySet, _, value):
+        """Search condition in title, body and more ..."""
+        return queryset.search(value)
@@ -0,0 +1,172 @@
+import random
+import time
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.template.loader import render_to_string
+from django.utils import timezone
+from shared.models import ConfirmStatusChoices
+from learning.comment_tree import get_comment_tree
+from learning.models import Tutorial, TutorialComment
+
+TEMPLATE = "learning/shared/tutorial_comments.html"
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares assembling tutorial comment threads by prefetched "
+        "comments (replies are found by scanning all comments, as "
+        "templates used to) and by comment tree. Database changes are "
+        "rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--comments",
+            type=int,
+            default=10000,
+            help="Count of tutorial's comments.",
+        )
+        parser.add_argument(
+            "--legacy-comments",
+            type=int,
+            default=1000,
+            help=(
+                "Count of comments which both ways are compared on "
+                "(scanning is quadratic, so it's measured on fewer comments)."
+            ),
+        )
+        parser.add_argument(
+            "--threads-ratio",
+            type=float,
+            default=0.3,
+            help="Ratio of top-level comments (others are replies).",
+        )
+        parser.add_argument(
+            "--per-page",
+            type=int,
+            default=20,
+            help="Count of threads of rendered page.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            users = [
+                get_user_model().objects.create_user(
+                    username=f"benchmark_comment_tree_{number}",
+                    email=f"benchmark_comment_tree_{number}@example.com",
+                    password=None,
+                )
+                for number in range(10)
+            ]
+
+            legacy_tutorial = self.create_tutorial(
+                "legacy", users, options["legacy_comments"], options
+            )
+            start = time.perf_counter()
+            comments = self.get_legacy_threads(legacy_tutorial)
+            legacy_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            tree = get_comment_tree(legacy_tutorial)
+            tree_elapsed = time.perf_counter() - start
+
+            self.stdout.write(
+                f"{len(comments):,} comments: "
+                f"prefetch and scan {legacy_elapsed * 1000:,.1f}ms, "
+                f"comment tree {tree_elapsed * 1000:,.1f}ms "
+                f"({legacy_elapsed / tree_elapsed:.1f}x)"
+            )
+
+            tutorial = self.create_tutorial(
+                "tree", users, options["comments"], options
+            )
+            start = time.perf_counter()
+            tree = get_comment_tree(tutorial)
+            tree_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            render_to_string(
+                TEMPLATE,
+                {
+                    "comment_threads": tree.paginate(1, options["per_page"]),
+                    "comments_count": tree.count,
+                },
+            )
+            render_elapsed = time.perf_counter() - start
+
+            self.stdout.write(
+                f"{tree.count:,} comments ({len(tree.threads):,} threads): "
+                f"comment tree {tree_elapsed * 1000:,.1f}ms, "
+                f"first page render {render_elapsed * 1000:,.1f}ms"
+            )
+
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def create_tutorial(
+        name: str, users: list, comments_count: int, options: dict
+    ) -> Tutorial:
+        """Creates a tutorial with comments_count random threaded
+        comments (inserted by bulk_create with explicit primary keys, so
+        replies can refer to their parents).
+        """
+        rand = random.Random(0)
+        now = timezone.now()
+
+        tutorial = Tutorial.objects.create(
+            title=f"Comment tree {name}",
+            slug=f"comment-tree-{name}",
+            short_description="Benchmark",
+            body="Benchmark",
+            author=users[0],
+            confirm_status=ConfirmStatusChoices.CONFIRMED,
+        )
+
+        first_pk = (
+            TutorialComment.objects.aggregate(max_pk=Max("pk"))["max_pk"] or 0
+        ) + 1
+        comments = []
+        for index in range(comments_count):
+            parent_pk = None
+            if index and rand.random() >= options["threads_ratio"]:
+                parent_pk = first_pk + rand.randrange(index)
+
+            comments.append(
+                TutorialComment(
+                    pk=first_pk + index,
+                    title=f"Comment {index}",
+                    body="Benchmark comment",
+                    tutorial=tutorial,
+                    user=rand.choice(users),
+                    parent_comment_id=parent_pk,
+                    # Replies are newer than their parents
+                    create_date=now + timedelta(seconds=index),
+                    confirm_status=ConfirmStatusChoices.CONFIRMED,
+                )
+            )
+
+        TutorialComment.objects.bulk_create(comments, batch_size=500)
+        return tutorial
+
+    @staticmethod
+    def get_legacy_threads(tutorial: Tutorial) -> list:
+        """Finds threads' replies like templates used to (scanning all
+        prefetched comments for replies of each shown comment).
+        """
+        tutorial = Tutorial.objects.prefetch_active_confirmed_comments().get(
+            pk=tutorial.pk
+        )
+        comments = list(tutorial.comments.all())
+
+        def get_replies(parent):
+            return [
+                (comment, get_replies(comment) if comment.allow_reply else [])
+                for comment in comments
+                if comment.parent_comment == parent
+            ]
+
+        get_replies(None)
+        return comments
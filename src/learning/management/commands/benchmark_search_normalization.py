@@ -0,0 +1,107 @@
+import random
+import time
+from django.core.management.base import BaseCommand
+from learning.models import Tutorial
+from learning.search import normalize_search_text, tokenize_search_query
+
+# Words containing Arabic/Persian variants, ZWNJ, diacritics and digits
+_SAMPLE_WORDS = [
+    "آموزش",
+    "كتاب‌هاي",
+    "مُعَلِّم",
+    "برنامه‌نویسی",
+    "پايتون",
+    "۱۴۰۰",
+    "٢٠٢١",
+    "جنگو",
+    "Django",
+    "QuerySet",
+]
+
+
+def _synthetic_body(words_count: int) -> str:
+    paragraphs = []
+    for _ in range(words_count // 50 or 1):
+        words = random.choices(_SAMPLE_WORDS, k=50)
+        paragraphs.append(f"<p>{' '.join(words)} &nbsp;<b>{words[0]}</b></p>")
+
+    return "\n".join(paragraphs)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures throughput of search text normalization on tutorial "
+        "bodies (BleachField html)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--count",
+            type=int,
+            default=1000,
+            help="Count of bodies in corpus.",
+        )
+        parser.add_argument(
+            "--words",
+            type=int,
+            default=500,
+            help="Words count of each synthetic body.",
+        )
+        parser.add_argument(
+            "--synthetic",
+            action="store_true",
+            help="Use synthetic bodies instead of database tutorials.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Count of benchmark repeats (best one is reported).",
+        )
+
+    def handle(self, *args, **options):
+        corpus = self.get_corpus(options)
+        if not corpus:
+            self.stderr.write("Corpus is empty.")
+            return
+
+        corpus_size = sum(len(body.encode()) for body in corpus)
+        self.stdout.write(
+            f"Corpus: {len(corpus)} bodies, "
+            f"{corpus_size / 1024 / 1024:.2f} MB"
+        )
+
+        for name, func in (
+            ("normalize", normalize_search_text),
+            ("tokenize", tokenize_search_query),
+        ):
+            elapsed = min(
+                self.measure(func, corpus) for _ in range(options["repeat"])
+            )
+            self.stdout.write(
+                f"{name}: {len(corpus) / elapsed:,.0f} bodies/s, "
+                f"{corpus_size / 1024 / 1024 / elapsed:,.2f} MB/s"
+            )
+
+    @staticmethod
+    def get_corpus(options) -> list[str]:
+        if not options["synthetic"]:
+            corpus = list(
+                Tutorial.objects.values_list("body", flat=True)[
+                    : options["count"]
+                ]
+            )
+            if corpus:
+                return corpus
+
+        return [
+            _synthetic_body(options["words"]) for _ in range(options["count"])
+        ]
+
+    @staticmethod
+    def measure(func, corpus: list[str]) -> float:
+        start = time.perf_counter()
+        for body in corpus:
+            func(body)
+
+        return time.perf_counter() - start
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from learning.recommendations import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CANDIDATES_PER_FEATURE,
+    rebuild_related_tutorials,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds related tutorials index of all tutorials "
+        "(by joint categories/tags weighted by likes)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Count of tutorials to rebuild in each batch.",
+        )
+        parser.add_argument(
+            "--candidates",
+            type=int,
+            default=DEFAULT_CANDIDATES_PER_FEATURE,
+            help="Max candidate tutorials (most liked) of each category/tag.",
+        )
+
+    def handle(self, *args, **options):
+        indexed_count = rebuild_related_tutorials(
+            batch_size=options["batch_size"],
+            candidates_per_feature=options["candidates"],
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{indexed_count} related tutorials indexed.")
+        )
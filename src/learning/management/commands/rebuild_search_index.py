@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from learning.models import Tutorial
+
+
+class Command(BaseCommand):
+    help = "Rebuilds search documents and search index of all tutorials."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Count of tutorials to update in each batch.",
+        )
+
+    def handle(self, *args, **options):
+        updated_count = Tutorial.objects.all().update_search_documents(
+            batch_size=options["batch_size"]
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Search documents of {updated_count} tutorials rebuilt."
+            )
+        )
@@ -0,0 +1,79 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from shared.counters import flush_counters
+from learning.models import (
+    TutorialDailyStatistics,
+    TutorialView,
+    TutorialLike,
+    TutorialUpVote,
+    TutorialDownVote,
+)
+
+STATISTICS_RELATIONS = [
+    TutorialView,
+    TutorialLike,
+    TutorialUpVote,
+    TutorialDownVote,
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds tutorials' daily statistics (views, likes and votes "
+        "per day) from their relation objects."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Count of statistics rows to insert in each statement.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        # Buffered statistics counts would be applied on rebuilt rows
+        flush_counters()
+
+        with transaction.atomic():
+            TutorialDailyStatistics.objects.all().delete()
+
+            for model in STATISTICS_RELATIONS:
+                daily_counts = (
+                    model.objects.filter(create_date__isnull=False)
+                    .order_by()
+                    .values(
+                        "tutorial_id",
+                        # Same days as relation models' hooks
+                        day=TruncDate(
+                            "create_date",
+                            tzinfo=timezone.get_default_timezone(),
+                        ),
+                    )
+                    .annotate(count=Count("pk"))
+                )
+
+                rows = TutorialDailyStatistics.objects.bulk_create(
+                    [
+                        TutorialDailyStatistics(
+                            tutorial_id=daily_count["tutorial_id"],
+                            relation=model.statistics_relation,
+                            date=daily_count["day"],
+                            count=daily_count["count"],
+                        )
+                        for daily_count in daily_counts.iterator()
+                    ],
+                    batch_size=batch_size,
+                )
+
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"{len(rows)} daily statistics of "
+                        f"{model._meta.verbose_name_plural} rebuilt."
+                    )
+                )
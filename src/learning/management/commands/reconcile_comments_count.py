@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from learning.models import Tutorial
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalculates active_confirmed_comments_count of tutorials "
+        "which have drifted from their actual comments count."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Count of tutorials to check in each batch.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report drifted tutorials without updating them.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        pks = list(
+            Tutorial.objects.order_by("pk").values_list("pk", flat=True)
+        )
+        drifted_count = 0
+
+        for start in range(0, len(pks), batch_size):
+            end = start + batch_size
+            batch = Tutorial.objects.filter(pk__in=pks[start:end])
+            drifted_pks = list(
+                batch.drifted_comments_count().values_list("pk", flat=True)
+            )
+            drifted_count += len(drifted_pks)
+
+            if drifted_pks and not options["dry_run"]:
+                Tutorial.objects.filter(
+                    pk__in=drifted_pks
+                ).update_active_confirmed_comments_count()
+
+        action = "found" if options["dry_run"] else "reconciled"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{drifted_count} drifted tutorials {action} "
+                f"(checked {len(pks)} tutorials)."
+            )
+        )
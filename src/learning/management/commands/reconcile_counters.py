@@ -0,0 +1,143 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import models
+from django.db.models import Count, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from shared.counters import flush_counters
+from learning.models import (
+    Tutorial,
+    TutorialComment,
+    TutorialView,
+    TutorialLike,
+    TutorialUpVote,
+    TutorialDownVote,
+    TutorialCommentLike,
+    TutorialCommentUpVote,
+    TutorialCommentDownVote,
+)
+
+TUTORIAL_RELATIONS = [
+    TutorialView,
+    TutorialLike,
+    TutorialUpVote,
+    TutorialDownVote,
+]
+
+COMMENT_RELATIONS = [
+    TutorialCommentLike,
+    TutorialCommentUpVote,
+    TutorialCommentDownVote,
+]
+
+
+def _subquery(queryset: models.QuerySet, value) -> Coalesce:
+    # Group by nothing to get a single aggregated value per outer row
+    return Coalesce(
+        Subquery(
+            queryset.order_by()
+            .values(group=Value(1))
+            .annotate(value=value)
+            .values("value"),
+            output_field=models.IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def _objects_counts(relations: list, owner_field: str) -> dict:
+    """Returns object count fields' expressions of relation models.
+
+    Args:
+        relations (list): Relation models (e.g. TutorialLike).
+        owner_field (str): Relation's field to counted object
+            (e.g. "tutorial").
+
+    Returns:
+        dict: Count fields to their count expressions.
+    """
+    counts = {}
+    for relation in relations:
+        count_field = getattr(relation, f"{owner_field}_object_count_field")
+        if count_field:
+            counts[count_field] = _subquery(
+                relation.objects.filter(**{owner_field: OuterRef("pk")}),
+                Count("pk"),
+            )
+
+    return counts
+
+
+def _users_score_coin(field: str):
+    """Returns user's total score/coin earned by its tutorials and
+    comments relation objects.
+
+    Args:
+        field (str): "score" or "coin".
+    """
+    expressions = [
+        _subquery(
+            relation.objects.filter(tutorial__author=OuterRef("pk")),
+            Sum(field),
+        )
+        for relation in TUTORIAL_RELATIONS
+    ] + [
+        _subquery(
+            relation.objects.filter(comment__user=OuterRef("pk")),
+            Sum(field),
+        )
+        for relation in COMMENT_RELATIONS
+    ]
+
+    total = expressions[0]
+    for expression in expressions[1:]:
+        total = total + expression
+
+    return total
+
+
+class Command(BaseCommand):
+    help = (
+        "Flushes write-behind counters and recalculates tutorials' and "
+        "comments' counters and users' scores and coins from their "
+        "relation objects."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Count of objects to update in each statement.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        # Buffered counters would be applied twice after reconciling
+        flush_counters()
+
+        for model, counts in [
+            (Tutorial, _objects_counts(TUTORIAL_RELATIONS, "tutorial")),
+            (TutorialComment, _objects_counts(COMMENT_RELATIONS, "comment")),
+            (
+                get_user_model(),
+                {
+                    "scores": _users_score_coin("score"),
+                    "coins": _users_score_coin("coin"),
+                },
+            ),
+        ]:
+            pks = list(
+                model.objects.order_by("pk").values_list("pk", flat=True)
+            )
+
+            for start in range(0, len(pks), batch_size):
+                end = start + batch_size
+                model.objects.filter(pk__in=pks[start:end]).update(**counts)
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{len(pks)} {model._meta.verbose_name_plural} "
+                    "reconciled."
+                )
+            )
@@ -0,0 +1,34 @@
+from datetime import timedelta
+from constance import config
+from django.core.management.base import BaseCommand
+from shared.mail import send_digests
+
+
+class Command(BaseCommand):
+    help = (
+        "Queues a digest email for each recipient whose oldest "
+        "notification is older than digest window. Run it periodically "
+        "(e.g. every minute) alongside send_queued_emails."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--window",
+            type=int,
+            default=None,
+            help=(
+                "Digest window in minutes. Defaults to "
+                "LEARNING_NOTIFICATIONS_DIGEST_WINDOW config."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        window = options["window"]
+        if window is None:
+            # Remaining entries are sent immediately if digest is disabled
+            window = max(config.LEARNING_NOTIFICATIONS_DIGEST_WINDOW, 0)
+
+        queued = send_digests(timedelta(minutes=window))
+        self.stdout.write(
+            self.style.SUCCESS(f"{queued} digest emails queued.")
+        )
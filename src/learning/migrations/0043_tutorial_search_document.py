@@ -0,0 +1,55 @@
+# Generated by Django 3.2.4 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+def create_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        schema_editor.execute(
+            "CREATE INDEX learning_tutorial_search_document_fts "
+            "ON learning_tutorial "
+            "USING gin (to_tsvector('simple', search_document))"
+        )
+        schema_editor.execute(
+            "CREATE INDEX learning_tutorial_search_document_trgm "
+            "ON learning_tutorial "
+            "USING gin (search_document gin_trgm_ops)"
+        )
+    elif vendor == "sqlite":
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE learning_tutorial_fts "
+            "USING fts5(search_document, tokenize='unicode61')"
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == "postgresql":
+        schema_editor.execute(
+            "DROP INDEX IF EXISTS learning_tutorial_search_document_fts"
+        )
+        schema_editor.execute(
+            "DROP INDEX IF EXISTS learning_tutorial_search_document_trgm"
+        )
+    elif vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS learning_tutorial_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0042_score_coin_models_score_coin_editable_false'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tutorial',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='سند جستجو'),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 3.2.4 on 2026-10-18 13:46
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def calculate_comments_count(apps, schema_editor):
+    Tutorial = apps.get_model("learning", "Tutorial")
+    TutorialComment = apps.get_model("learning", "TutorialComment")
+
+    comments_count = (
+        TutorialComment.objects.filter(
+            tutorial=OuterRef("pk"), is_active=True, confirm_status=1
+        )
+        .order_by()
+        .values("tutorial")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+
+    Tutorial.objects.update(
+        active_confirmed_comments_count=Coalesce(Subquery(comments_count), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0043_tutorial_search_document'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tutorial',
+            name='active_confirmed_comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='دیدگاه های تایید شده'),
+        ),
+        migrations.RunPython(calculate_comments_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 3.2.4 on 2026-10-18 14:07
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def calculate_daily_statistics(apps, schema_editor):
+    TutorialDailyStatistics = apps.get_model(
+        "learning", "TutorialDailyStatistics"
+    )
+
+    for relation, model_name in [
+        ("view", "TutorialView"),
+        ("like", "TutorialLike"),
+        ("up_vote", "TutorialUpVote"),
+        ("down_vote", "TutorialDownVote"),
+    ]:
+        model = apps.get_model("learning", model_name)
+        daily_counts = (
+            model.objects.filter(create_date__isnull=False)
+            .order_by()
+            .values("tutorial_id", day=TruncDate("create_date"))
+            .annotate(count=Count("pk"))
+        )
+
+        TutorialDailyStatistics.objects.bulk_create(
+            [
+                TutorialDailyStatistics(
+                    tutorial_id=row["tutorial_id"],
+                    relation=relation,
+                    date=row["day"],
+                    count=row["count"],
+                )
+                for row in daily_counts.iterator()
+            ],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0044_tutorial_active_confirmed_comments_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TutorialDailyStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('relation', models.CharField(choices=[('view', 'بازدید'), ('like', 'پسند'), ('up_vote', 'رای مثبت'), ('down_vote', 'رای منفی')], max_length=20, verbose_name='نوع')),
+                ('date', models.DateField(verbose_name='تاریخ')),
+                ('count', models.IntegerField(default=0, verbose_name='تعداد')),
+                ('tutorial', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_statistics', to='learning.tutorial', verbose_name='آموزش')),
+            ],
+            options={
+                'verbose_name': 'آمار روزانه آموزش',
+                'verbose_name_plural': 'آمار روزانه آموزش ها',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='tutorialdailystatistics',
+            constraint=models.UniqueConstraint(fields=('tutorial', 'relation', 'date'), name='unique_tutorial_daily_statistics'),
+        ),
+        migrations.RunPython(calculate_daily_statistics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 3.2.4 on 2026-10-18 14:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0045_tutorialdailystatistics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedTutorial',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(verbose_name='امتیاز')),
+                ('related_tutorial', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='indexed_as_related', to='learning.tutorial', verbose_name='آموزش مرتبط')),
+                ('tutorial', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_tutorials_index', to='learning.tutorial', verbose_name='آموزش')),
+            ],
+            options={
+                'verbose_name': 'آموزش مرتبط',
+                'verbose_name_plural': 'آموزش های مرتبط',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='relatedtutorial',
+            index=models.Index(fields=['tutorial', '-score'], name='related_tutorial_score_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='relatedtutorial',
+            constraint=models.UniqueConstraint(fields=('tutorial', 'related_tutorial'), name='unique_related_tutorial'),
+        ),
+    ]
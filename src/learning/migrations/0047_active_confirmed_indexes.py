@@ -0,0 +1,37 @@
+# Generated by Django 3.2.4 on 2026-10-18 14:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0046_relatedtutorial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tutorial',
+            index=models.Index(condition=models.Q(('confirm_status', 1), ('is_active', True)), fields=['-create_date', '-id'], name='tutorial_confirmed_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tutorial',
+            index=models.Index(condition=models.Q(('confirm_status', 1), ('is_active', True)), fields=['-likes_count', '-id'], name='tutorial_confirmed_likes_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tutorial',
+            index=models.Index(condition=models.Q(('confirm_status', 1), ('is_active', True)), fields=['-user_views_count', '-id'], name='tutorial_confirmed_views_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tutorial',
+            index=models.Index(fields=['author', '-create_date'], name='tutorial_author_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tutorialcomment',
+            index=models.Index(condition=models.Q(('confirm_status', 1), ('is_active', True)), fields=['tutorial', '-create_date'], name='comment_confirmed_tutorial_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tutorialcomment',
+            index=models.Index(fields=['user', '-create_date'], name='comment_user_date_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 3.2.4 on 2026-10-18 14:32
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def remove_duplicate_views(apps, schema_editor):
+    """Keeps the first view of each user and tutorial.
+
+    Note: Run reconcile_counters and rebuild_tutorial_statistics commands
+    to recalculate counters of removed views.
+    """
+    TutorialView = apps.get_model("learning", "TutorialView")
+
+    first_views = (
+        TutorialView.objects.order_by()
+        .values("user", "tutorial")
+        .annotate(first_pk=Min("pk"))
+        .values("first_pk")
+    )
+    TutorialView.objects.exclude(pk__in=first_views).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0047_active_confirmed_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_views, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='tutorialview',
+            constraint=models.UniqueConstraint(fields=('user', 'tutorial'), name='unique_tutorial_view'),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 3.2.4 on 2026-10-18 14:36
+
+from django.db import migrations, models
+from django.db.models import Min
+
+RELATIONS = {
+    "TutorialLike": "tutorial",
+    "TutorialUpVote": "tutorial",
+    "TutorialDownVote": "tutorial",
+    "TutorialCommentLike": "comment",
+    "TutorialCommentUpVote": "comment",
+    "TutorialCommentDownVote": "comment",
+}
+
+
+def remove_duplicate_relations(apps, schema_editor):
+    """Keeps the first object of each user and tutorial/comment.
+
+    Note: Run reconcile_counters and rebuild_tutorial_statistics commands
+    to recalculate counters of removed objects.
+    """
+    for model_name, relation in RELATIONS.items():
+        model = apps.get_model("learning", model_name)
+
+        first_objects = (
+            model.objects.order_by()
+            .values("user", relation)
+            .annotate(first_pk=Min("pk"))
+            .values("first_pk")
+        )
+        model.objects.exclude(pk__in=first_objects).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0048_unique_tutorial_view'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_relations, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='tutorialcommentdownvote',
+            constraint=models.UniqueConstraint(fields=('user', 'comment'), name='unique_tutorial_comment_down_vote'),
+        ),
+        migrations.AddConstraint(
+            model_name='tutorialcommentlike',
+            constraint=models.UniqueConstraint(fields=('user', 'comment'), name='unique_tutorial_comment_like'),
+        ),
+        migrations.AddConstraint(
+            model_name='tutorialcommentupvote',
+            constraint=models.UniqueConstraint(fields=('user', 'comment'), name='unique_tutorial_comment_up_vote'),
+        ),
+        migrations.AddConstraint(
+            model_name='tutorialdownvote',
+            constraint=models.UniqueConstraint(fields=('user', 'tutorial'), name='unique_tutorial_down_vote'),
+        ),
+        migrations.AddConstraint(
+            model_name='tutoriallike',
+            constraint=models.UniqueConstraint(fields=('user', 'tutorial'), name='unique_tutorial_like'),
+        ),
+        migrations.AddConstraint(
+            model_name='tutorialupvote',
+            constraint=models.UniqueConstraint(fields=('user', 'tutorial'), name='unique_tutorial_up_vote'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.2.4 on 2026-10-18 15:29
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def mark_indexed_tutorials(apps, schema_editor):
+    """Marks tutorials which have indexed related tutorials.
+
+    Note: Run rebuild_related_tutorials command to mark tutorials which
+    are indexed without any related tutorial too.
+    """
+    tutorial_model = apps.get_model("learning", "Tutorial")
+    related_model = apps.get_model("learning", "RelatedTutorial")
+
+    tutorial_model.objects.filter(
+        pk__in=related_model.objects.values("tutorial_id")
+    ).update(related_indexed_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0049_unique_user_relations'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tutorial',
+            name='related_indexed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='زمان نمایه سازی آموزش های مرتبط'),
+        ),
+        migrations.RunPython(mark_indexed_tutorials, migrations.RunPython.noop),
+    ]
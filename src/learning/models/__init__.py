@@ -6,6 +6,11 @@ from .tutorial_user_relation_models import (
     TutorialUpVote,
     TutorialDownVote,
 )
+from .tutorial_statistics import (
+    TutorialStatisticsRelationChoices,
+    TutorialDailyStatistics,
+)
+from .related_tutorial import RelatedTutorial
 from .tutorial_comment import TutorialComment
 from .tutorial_comment_user_relation_models import (
     TutorialCommentLike,
@@ -21,6 +26,9 @@ __all__ = [
     "TutorialLike",
     "TutorialUpVote",
     "TutorialDownVote",
+    "TutorialStatisticsRelationChoices",
+    "TutorialDailyStatistics",
+    "RelatedTutorial",
     "TutorialComment",
     "TutorialCommentLike",
     "TutorialCommentUpVote",
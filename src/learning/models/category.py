@@ -2,8 +2,18 @@
 from django.db import models
 from django.utils.text import slugify
 from django.core.exceptions import ValidationError
-from django_lifecycle import LifecycleModel, hook, BEFORE_SAVE
+from django_lifecycle import (
+    LifecycleModel,
+    hook,
+    BEFORE_SAVE,
+    BEFORE_DELETE,
+    AFTER_SAVE,
+    AFTER_UPDATE,
+    AFTER_DELETE,
+)
 from learning.querysets.category_queryset import CategoryQueryset
+from learning.category_tree import get_category_tree, invalidate_category_tree
+from learning.recommendations import schedule_related_tutorials_update
 
 
 class Category(LifecycleModel):
@@ -37,6 +47,61 @@ class Category(LifecycleModel):
     def on_save(self):
         self.slug = slugify(self.name, allow_unicode=True)
 
+    @hook(AFTER_SAVE)
+    @hook(AFTER_DELETE)
+    def invalidate_category_tree_cache(self):
+        # Runs before AFTER_UPDATE hooks and (by name) other AFTER_DELETE
+        # ones, so they see the updated tree
+        invalidate_category_tree()
+
+    @hook(AFTER_UPDATE, when_any=["name", "is_active"], has_changed=True)
+    def update_tutorials_search_documents(self):
+        self.tutorials.all().update_search_documents()
+
+    @hook(BEFORE_DELETE)
+    def collect_tutorials_to_update(self):
+        # Tutorial relations will be deleted with category, so
+        # keep their ids to update their search documents after delete
+        self._deleted_category_tutorial_ids = list(
+            self.tutorials.values_list("pk", flat=True)
+        )
+
+    @hook(AFTER_DELETE)
+    def update_deleted_category_tutorials(self):
+        tutorial_model = self._meta.get_field("tutorials").related_model
+        tutorial_model.objects.filter(
+            pk__in=self._deleted_category_tutorial_ids
+        ).update_search_documents()
+
+    def get_subtree_tutorial_ids(self) -> set[int]:
+        """Returns ids of tutorials of this category and its descendants."""
+        return set(
+            self.tutorials.through.objects.filter(
+                category_id__in=get_category_tree().get_subtree_ids(self.pk)
+            ).values_list("tutorial_id", flat=True)
+        )
+
+    @hook(
+        AFTER_UPDATE,
+        when_any=["is_active", "parent_category"],
+        has_changed=True,
+    )
+    def update_related_tutorials_index(self):
+        # Changes categories (and parents) of subtree's tutorials
+        schedule_related_tutorials_update(self.get_subtree_tutorial_ids())
+
+    @hook(BEFORE_DELETE)
+    def collect_related_tutorials_to_update(self):
+        self._deleted_category_subtree_tutorial_ids = (
+            self.get_subtree_tutorial_ids()
+        )
+
+    @hook(AFTER_DELETE)
+    def update_deleted_category_related_tutorials(self):
+        schedule_related_tutorials_update(
+            self._deleted_category_subtree_tutorial_ids
+        )
+
     def __str__(self):
         return self.name
 
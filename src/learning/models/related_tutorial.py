@@ -0,0 +1,43 @@
+""" Related tutorials index model """
+from django.db import models
+
+
+class RelatedTutorial(models.Model):
+    """A precomputed related tutorial of a tutorial
+    (see learning.recommendations).
+    """
+
+    tutorial = models.ForeignKey(
+        to="learning.Tutorial",
+        on_delete=models.CASCADE,
+        related_name="related_tutorials_index",
+        verbose_name="آموزش",
+    )
+
+    related_tutorial = models.ForeignKey(
+        to="learning.Tutorial",
+        on_delete=models.CASCADE,
+        related_name="indexed_as_related",
+        verbose_name="آموزش مرتبط",
+    )
+
+    score = models.FloatField(verbose_name="امتیاز")
+
+    class Meta:
+        verbose_name = "آموزش مرتبط"
+        verbose_name_plural = "آموزش های مرتبط"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tutorial", "related_tutorial"],
+                name="unique_related_tutorial",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["tutorial", "-score"],
+                name="related_tutorial_score_idx",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.tutorial_id} -> {self.related_tutorial_id}"
@@ -3,10 +3,27 @@ from django.db import models
 from django.utils import timezone
 from django.utils.text import slugify
 from django_resized import ResizedImageField
-from django_lifecycle import LifecycleModel, hook, BEFORE_UPDATE, BEFORE_SAVE
+from django_lifecycle import (
+    LifecycleModel,
+    hook,
+    BEFORE_UPDATE,
+    BEFORE_SAVE,
+    BEFORE_DELETE,
+    AFTER_CREATE,
+    AFTER_UPDATE,
+    AFTER_SAVE,
+    AFTER_DELETE,
+)
 from shared.models import BleachField
 from shared.models import ConfirmStatusChoices
+from learning.querysets import get_active_confirmed_filters
 from learning.querysets.tutorial_queryset import TutorialQueryset
+from learning.search import get_search_backend
+from learning.caches import invalidate_home_carousels
+from learning.recommendations import (
+    get_neighbor_tutorial_ids,
+    schedule_related_tutorials_update,
+)
 
 
 class Tutorial(LifecycleModel):
@@ -41,6 +58,10 @@ class Tutorial(LifecycleModel):
         verbose_name="لایک ها", default=0
     )
 
+    active_confirmed_comments_count = models.PositiveIntegerField(
+        verbose_name="دیدگاه های تایید شده", default=0, editable=False
+    )
+
     image = ResizedImageField(
         upload_to="images/tutorial_thumbnails",
         default="default/learning/tutorial-image.png",
@@ -69,6 +90,20 @@ class Tutorial(LifecycleModel):
 
     is_active = models.BooleanField(default=True, verbose_name="فعال")
 
+    # Denormalized searchable text (maintained by hooks)
+    search_document = models.TextField(
+        blank=True, default="", editable=False, verbose_name="سند جستجو"
+    )
+
+    # Last rebuild of tutorial's related tutorials index (null if it
+    # isn't indexed yet, see learning.recommendations)
+    related_indexed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="زمان نمایه سازی آموزش های مرتبط",
+    )
+
     # Relations
     author = models.ForeignKey(
         "authentication.User",
@@ -131,17 +166,95 @@ class Tutorial(LifecycleModel):
     def on_save(self):
         self.slug = slugify(self.title, allow_unicode=True)
 
+    @hook(AFTER_CREATE)
+    @hook(
+        AFTER_UPDATE,
+        when_any=["title", "slug", "short_description", "body"],
+        has_changed=True,
+    )
+    def update_search_document(self):
+        Tutorial.objects.filter(pk=self.pk).update_search_documents()
+
+    @hook(BEFORE_DELETE)
+    def remove_search_document(self):
+        get_search_backend().remove([self.pk])
+
+    @hook(AFTER_CREATE)
+    @hook(
+        AFTER_UPDATE,
+        when_any=[
+            "title",
+            "slug",
+            "short_description",
+            "image",
+            "confirm_status",
+            "is_active",
+        ],
+        has_changed=True,
+    )
+    @hook(AFTER_DELETE)
+    def invalidate_carousels_cache(self):
+        invalidate_home_carousels()
+
+    @hook(AFTER_CREATE)
+    @hook(
+        AFTER_UPDATE,
+        when_any=["confirm_status", "is_active"],
+        has_changed=True,
+    )
+    def update_related_tutorials_index(self):
+        schedule_related_tutorials_update([self.pk])
+
+    @hook(BEFORE_DELETE)
+    def collect_related_tutorials_to_update(self):
+        # Index rows will be deleted with tutorial, so keep the tutorials
+        # which this one is related to (to rebuild them after delete)
+        self._deleted_tutorial_neighbor_ids = get_neighbor_tutorial_ids(
+            [self.pk]
+        ) - {self.pk}
+
+    @hook(AFTER_DELETE)
+    def update_deleted_tutorial_neighbors(self):
+        schedule_related_tutorials_update(
+            self._deleted_tutorial_neighbor_ids
+        )
+
     class Meta:
         verbose_name = "آموزش"
         verbose_name_plural = "آموزش ها"
         ordering = ("-create_date",)
         permissions = (("confirm_disprove_tutorial", "تایید/رد آموزش ها"),)
+        indexes = [
+            # Partial indexes of active and confirmed tutorials (ignored
+            # by databases which don't support them) by public orderings
+            # (home carousels, archive and its keyset pagination)
+            models.Index(
+                fields=["-create_date", "-id"],
+                condition=get_active_confirmed_filters(),
+                name="tutorial_confirmed_date_idx",
+            ),
+            models.Index(
+                fields=["-likes_count", "-id"],
+                condition=get_active_confirmed_filters(),
+                name="tutorial_confirmed_likes_idx",
+            ),
+            models.Index(
+                fields=["-user_views_count", "-id"],
+                condition=get_active_confirmed_filters(),
+                name="tutorial_confirmed_views_idx",
+            ),
+            # Author's tutorials in user panel
+            models.Index(
+                fields=["author", "-create_date"],
+                name="tutorial_author_date_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
 
-class TutorialTag(models.Model):
+class TutorialTag(LifecycleModel):
     """TutorialTag model"""
 
     title = models.CharField(max_length=20, verbose_name="عنوان")
@@ -153,6 +266,18 @@ class TutorialTag(models.Model):
         verbose_name="آموزش",
     )
 
+    @hook(AFTER_SAVE)
+    @hook(AFTER_DELETE)
+    def update_tutorial_search_document(self):
+        Tutorial.objects.filter(
+            pk=self.tutorial_id
+        ).update_search_documents()
+
+    @hook(AFTER_SAVE)
+    @hook(AFTER_DELETE)
+    def update_tutorial_related_tutorials(self):
+        schedule_related_tutorials_update([self.tutorial_id])
+
     class Meta:
         verbose_name = "کلیدواژه"
         verbose_name_plural = "کلیدواژه ها"
@@ -1,10 +1,20 @@
 """ TutorialComment model """
 from django.db import models
 from django.core.exceptions import ValidationError
+from django.db.models import F
 from django.utils import timezone
-from django_lifecycle import hook, LifecycleModel, BEFORE_UPDATE, BEFORE_SAVE
+from django_lifecycle import (
+    hook,
+    LifecycleModel,
+    BEFORE_UPDATE,
+    BEFORE_SAVE,
+    AFTER_CREATE,
+    AFTER_UPDATE,
+    AFTER_DELETE,
+)
 from shared.models import BleachField
 from shared.models import ConfirmStatusChoices
+from learning.querysets import get_active_confirmed_filters
 from learning.querysets.tutorial_comment_queryset import (
     TutorialCommentQueryset,
 )
@@ -114,6 +124,58 @@ class TutorialComment(LifecycleModel):
         if self.parent_comment:
             self.tutorial = self.parent_comment.tutorial
 
+    @hook(AFTER_CREATE)
+    def increase_tutorial_comments_count(self):
+        if self.is_active_and_confirmed:
+            self._change_tutorial_comments_count(self.tutorial_id, 1)
+
+    @hook(
+        AFTER_UPDATE,
+        when_any=["is_active", "confirm_status", "tutorial"],
+        has_changed=True,
+    )
+    def update_tutorial_comments_count(self):
+        was_active_and_confirmed = (
+            self.initial_value("is_active")
+            and self.initial_value("confirm_status")
+            == ConfirmStatusChoices.CONFIRMED
+        )
+
+        if was_active_and_confirmed:
+            self._change_tutorial_comments_count(
+                self.initial_value("tutorial"), -1
+            )
+
+        if self.is_active_and_confirmed:
+            self._change_tutorial_comments_count(self.tutorial_id, 1)
+
+    @hook(AFTER_DELETE)
+    def decrease_tutorial_comments_count(self):
+        if self.is_active_and_confirmed:
+            self._change_tutorial_comments_count(self.tutorial_id, -1)
+
+    @property
+    def is_active_and_confirmed(self) -> bool:
+        return (
+            self.is_active
+            and self.confirm_status == ConfirmStatusChoices.CONFIRMED
+        )
+
+    def _change_tutorial_comments_count(self, tutorial_id: int, value: int):
+        """Increases/decreases tutorial's active_confirmed_comments_count.
+
+        Args:
+            tutorial_id (int): Tutorial's primary key.
+            value (int): Value to add to count (negative to decrease).
+        """
+        tutorial_model = self._meta.get_field("tutorial").related_model
+        tutorial_model.objects.filter(pk=tutorial_id).update(
+            active_confirmed_comments_count=F(
+                "active_confirmed_comments_count"
+            )
+            + value
+        )
+
     # Validate data (for admin panel)
     def clean(self):
         if self.pk and self.pk == self.parent_comment_id:
@@ -127,6 +189,19 @@ class TutorialComment(LifecycleModel):
         verbose_name_plural = "دیدگاه آموزش ها"
         ordering = ("-create_date",)
         permissions = (("confirm_disprove_tutorialcomment", "تایید/رد نظرات"),)
+        indexes = [
+            # Active and confirmed comments of tutorial page
+            models.Index(
+                fields=["tutorial", "-create_date"],
+                condition=get_active_confirmed_filters(),
+                name="comment_confirmed_tutorial_idx",
+            ),
+            # User's comments in user panel
+            models.Index(
+                fields=["user", "-create_date"],
+                name="comment_user_date_idx",
+            ),
+        ]
 
     # Custom manager
     objects: TutorialCommentQueryset = TutorialCommentQueryset.as_manager()
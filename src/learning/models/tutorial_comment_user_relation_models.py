@@ -4,9 +4,16 @@
 from constance import config
 from django.db import models
 from django.db.models import F
+from django.contrib.auth import get_user_model
 from django.core.exceptions import ImproperlyConfigured
-from django_lifecycle import hook, AFTER_CREATE, BEFORE_DELETE
+from django_lifecycle import hook, AFTER_CREATE, BEFORE_DELETE, AFTER_DELETE
 from shared.models import AbstractScoreCoinModel
+from shared.counters import (
+    CounterKey,
+    write_behind_counters_enabled,
+    buffer_counter_deltas,
+)
+from learning.caches import invalidate_reaction_states
 from learning.querysets.tutorial_comment_user_relation_querysets import (
     TutorialCommentUserRelationQueryset,
 )
@@ -30,6 +37,9 @@ class AbstractCommentScoreCoinModel(AbstractScoreCoinModel):
         AFTER_CREATE: decreases comment.user's score and coin by object's
             score andcoin field and object count on comment model
             (if specified by comment_object_count_field)
+
+        AFTER_CREATE/AFTER_DELETE: invalidates user's cached reaction
+            states.
     """
 
     comment_object_count_field = None
@@ -43,6 +53,10 @@ class AbstractCommentScoreCoinModel(AbstractScoreCoinModel):
 
     @hook(AFTER_CREATE)
     def after_create(self):
+        if write_behind_counters_enabled():
+            self.buffer_counters(1)
+            return
+
         user = self.comment.user
 
         # Increase commnet.user's scores and coins
@@ -61,6 +75,10 @@ class AbstractCommentScoreCoinModel(AbstractScoreCoinModel):
 
     @hook(BEFORE_DELETE)
     def before_delete(self):
+        if write_behind_counters_enabled():
+            self.buffer_counters(-1)
+            return
+
         user = self.comment.user
 
         # Decrease commnet.user's scores and coins
@@ -77,6 +95,49 @@ class AbstractCommentScoreCoinModel(AbstractScoreCoinModel):
             )
             self.comment.save(update_fields=[self.comment_object_count_field])
 
+    @hook(AFTER_CREATE)
+    @hook(AFTER_DELETE)
+    def invalidate_user_reaction_states(self):
+        invalidate_reaction_states(self.user_id)
+
+    def buffer_counters(self, sign: int):
+        """Adds user's score/coin and comment's object count changes
+        to write-behind counters buffer (instead of updating them) when
+        current transaction commits.
+
+        Args:
+            sign (int): 1 for create and -1 for delete.
+        """
+        buffer_counter_deltas(self.get_counter_deltas(sign))
+
+    def get_counter_deltas(self, sign: int) -> dict[CounterKey, int]:
+        """Returns comment.user's score/coin and comment's object count
+        changes of object's creation or deletion.
+
+        Args:
+            sign (int): 1 for create and -1 for delete.
+
+        Returns:
+            dict[CounterKey, int]: Counters' keys to their values.
+        """
+        user_label = get_user_model()._meta.label
+        user_id = self.comment.user_id
+
+        deltas = {
+            (user_label, user_id, "scores"): sign * self.score,
+            (user_label, user_id, "coins"): sign * self.coin,
+        }
+        if self.comment_object_count_field:
+            deltas[
+                (
+                    self.comment._meta.label,
+                    self.comment_id,
+                    self.comment_object_count_field,
+                )
+            ] = sign
+
+        return deltas
+
     # Custom queryset
     objects: TutorialCommentUserRelationQueryset = (
         TutorialCommentUserRelationQueryset.as_manager()
@@ -111,6 +172,14 @@ class TutorialCommentLike(AbstractCommentScoreCoinModel):
     def get_create_coin(self):
         return config.TUTORIAL_COMMENT_LIKE_COIN
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "comment"],
+                name="unique_tutorial_comment_like",
+            )
+        ]
+
 
 class TutorialCommentUpVote(AbstractCommentScoreCoinModel):
     """TutorialCommentUpVote model"""
@@ -137,6 +206,14 @@ class TutorialCommentUpVote(AbstractCommentScoreCoinModel):
     def get_create_coin(self):
         return config.TUTORIAL_COMMENT_UPVOTE_COIN
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "comment"],
+                name="unique_tutorial_comment_up_vote",
+            )
+        ]
+
 
 class TutorialCommentDownVote(AbstractCommentScoreCoinModel):
     """TutorialCommentDownVote model"""
@@ -162,3 +239,11 @@ class TutorialCommentDownVote(AbstractCommentScoreCoinModel):
 
     def get_create_coin(self):
         return config.TUTORIAL_COMMENT_DOWNVOTE_COIN
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "comment"],
+                name="unique_tutorial_comment_down_vote",
+            )
+        ]
@@ -0,0 +1,84 @@
+""" Tutorial statistics rollup model """
+import datetime
+from django.db import models
+from shared.counters import CounterKey
+from learning.querysets.tutorial_statistics_querysets import (
+    TutorialDailyStatisticsQueryset,
+)
+
+
+class TutorialStatisticsRelationChoices(models.TextChoices):
+    """Tutorial-User relation models which their daily counts
+    are stored in TutorialDailyStatistics.
+    """
+
+    VIEW = "view", "بازدید"
+    LIKE = "like", "پسند"
+    UP_VOTE = "up_vote", "رای مثبت"
+    DOWN_VOTE = "down_vote", "رای منفی"
+
+
+class TutorialDailyStatistics(models.Model):
+    """Count of a tutorial's relation objects (e.g. views) created
+    in a day.
+
+    Rows are maintained by relation models' lifecycle hooks and can be
+    rebuilt by rebuild_tutorial_statistics command.
+    """
+
+    tutorial = models.ForeignKey(
+        to="learning.Tutorial",
+        on_delete=models.CASCADE,
+        related_name="daily_statistics",
+        verbose_name="آموزش",
+    )
+
+    relation = models.CharField(
+        max_length=20,
+        choices=TutorialStatisticsRelationChoices.choices,
+        verbose_name="نوع",
+    )
+
+    date = models.DateField(verbose_name="تاریخ")
+
+    count = models.IntegerField(default=0, verbose_name="تعداد")
+
+    objects: TutorialDailyStatisticsQueryset = (
+        TutorialDailyStatisticsQueryset.as_manager()
+    )
+
+    class Meta:
+        verbose_name = "آمار روزانه آموزش"
+        verbose_name_plural = "آمار روزانه آموزش ها"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tutorial", "relation", "date"],
+                name="unique_tutorial_daily_statistics",
+            )
+        ]
+
+    @classmethod
+    def get_counter_key(
+        cls, tutorial_id: int, relation: str, day: datetime.date
+    ) -> CounterKey:
+        """Returns write-behind counter key of given row's count. Row is
+        identified by a natural key, so it's created on flush if it
+        doesn't exist (see TutorialDailyStatisticsQueryset
+        .get_counter_pks).
+
+        Args:
+            tutorial_id (int): Tutorial's primary key.
+            relation (str): TutorialStatisticsRelationChoices value.
+            day (date): Statistics day.
+
+        Returns:
+            CounterKey: Count's counter key.
+        """
+        return (
+            cls._meta.label,
+            f"{tutorial_id}/{relation}/{day.isoformat()}",
+            "count",
+        )
+
+    def __str__(self):
+        return f"{self.tutorial_id} {self.relation} {self.date}"
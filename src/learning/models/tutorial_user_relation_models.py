@@ -4,12 +4,27 @@
 from constance import config
 from django.db import models
 from django.db.models import F
+from django.contrib.auth import get_user_model
 from django.core.exceptions import ImproperlyConfigured
-from django_lifecycle import hook, AFTER_CREATE, BEFORE_DELETE
+from django_lifecycle import hook, AFTER_CREATE, BEFORE_DELETE, AFTER_DELETE
 from shared.models import AbstractScoreCoinModel
+from shared.counters import (
+    CounterKey,
+    write_behind_counters_enabled,
+    buffer_counter_deltas,
+)
+from shared.date_time import to_default_local_date
+from learning.caches import (
+    invalidate_home_carousels,
+    invalidate_reaction_states,
+)
 from learning.querysets.tutorial_user_relation_querysets import (
     TutorialUserRelationQueryset,
 )
+from .tutorial_statistics import (
+    TutorialStatisticsRelationChoices,
+    TutorialDailyStatistics,
+)
 
 
 class AbstractTutorialScoreCoinModel(AbstractScoreCoinModel):
@@ -22,6 +37,13 @@ class AbstractTutorialScoreCoinModel(AbstractScoreCoinModel):
         [tutorial_object_count_field]: object field on tutorial model to
             increase/decrease on insert/delete. Defaults to None.
 
+        [statistics_relation]: TutorialStatisticsRelationChoices value
+            to count objects in TutorialDailyStatistics. Defaults to None.
+
+        [is_reaction]: Whether object is a user's reaction (e.g. like)
+            whose creation/deletion invalidates user's cached reaction
+            states. Defaults to True.
+
     Provides these hooks:
         AFTER_CREATE: increases author's score and coin by object's
             score and coin field and object count for tutorial model
@@ -30,9 +52,14 @@ class AbstractTutorialScoreCoinModel(AbstractScoreCoinModel):
         AFTER_CREATE: decreases author's score and coin by object's
             score andcoin field and object count on tutorial model
             (if specified by tutorial_object_count_field).
+
+        AFTER_CREATE/AFTER_DELETE: invalidates user's cached reaction
+            states (if is_reaction).
     """
 
     tutorial_object_count_field = None
+    statistics_relation = None
+    is_reaction = True
 
     @property
     def tutorial(self):
@@ -42,6 +69,12 @@ class AbstractTutorialScoreCoinModel(AbstractScoreCoinModel):
 
     @hook(AFTER_CREATE)
     def after_create(self):
+        self.update_daily_statistics(1)
+
+        if write_behind_counters_enabled():
+            self.buffer_counters(1)
+            return
+
         author = self.tutorial.author
 
         # Increase author's scores and coins
@@ -62,6 +95,12 @@ class AbstractTutorialScoreCoinModel(AbstractScoreCoinModel):
 
     @hook(BEFORE_DELETE)
     def before_delete(self):
+        self.update_daily_statistics(-1)
+
+        if write_behind_counters_enabled():
+            self.buffer_counters(-1)
+            return
+
         author = self.tutorial.author
 
         # Decrease author's scores and coins
@@ -80,6 +119,75 @@ class AbstractTutorialScoreCoinModel(AbstractScoreCoinModel):
                 update_fields=[self.tutorial_object_count_field]
             )
 
+    @hook(AFTER_CREATE)
+    @hook(AFTER_DELETE)
+    def invalidate_user_reaction_states(self):
+        if self.is_reaction:
+            invalidate_reaction_states(self.user_id)
+
+    def buffer_counters(self, sign: int):
+        """Adds author's score/coin and tutorial's object count changes
+        to write-behind counters buffer (instead of updating them) when
+        current transaction commits.
+
+        Args:
+            sign (int): 1 for create and -1 for delete.
+        """
+        buffer_counter_deltas(self.get_counter_deltas(sign))
+
+    def get_counter_deltas(self, sign: int) -> dict[CounterKey, int]:
+        """Returns author's score/coin and tutorial's object count
+        changes of object's creation or deletion.
+
+        Args:
+            sign (int): 1 for create and -1 for delete.
+
+        Returns:
+            dict[CounterKey, int]: Counters' keys to their values.
+        """
+        user_label = get_user_model()._meta.label
+        author_id = self.tutorial.author_id
+
+        deltas = {
+            (user_label, author_id, "scores"): sign * self.score,
+            (user_label, author_id, "coins"): sign * self.coin,
+        }
+        if self.tutorial_object_count_field:
+            deltas[
+                (
+                    self.tutorial._meta.label,
+                    self.tutorial_id,
+                    self.tutorial_object_count_field,
+                )
+            ] = sign
+
+        return deltas
+
+    def update_daily_statistics(self, sign: int):
+        """Adds object to (or removes it from) its creation day's
+        TutorialDailyStatistics count (if statistics_relation is set).
+
+        Args:
+            sign (int): 1 for create and -1 for delete.
+        """
+        if not self.statistics_relation or not self.create_date:
+            return
+
+        day = to_default_local_date(self.create_date)
+
+        if write_behind_counters_enabled():
+            buffer_counter_deltas(
+                {
+                    TutorialDailyStatistics.get_counter_key(
+                        self.tutorial_id, self.statistics_relation, day
+                    ): sign
+                }
+            )
+        else:
+            TutorialDailyStatistics.objects.add_count(
+                self.tutorial_id, self.statistics_relation, day, sign
+            )
+
     objects: TutorialUserRelationQueryset = (
         TutorialUserRelationQueryset.as_manager()
     )
@@ -92,6 +200,8 @@ class TutorialView(AbstractTutorialScoreCoinModel):
     """TutorialView model"""
 
     tutorial_object_count_field = "user_views_count"
+    statistics_relation = TutorialStatisticsRelationChoices.VIEW
+    is_reaction = False
 
     user = models.ForeignKey(
         to="authentication.User",
@@ -113,11 +223,19 @@ class TutorialView(AbstractTutorialScoreCoinModel):
     def get_create_coin(self) -> int:
         return config.TUTORIAL_VIEW_COIN
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "tutorial"], name="unique_tutorial_view"
+            )
+        ]
+
 
 class TutorialLike(AbstractTutorialScoreCoinModel):
     """TutorialLike model"""
 
     tutorial_object_count_field = "likes_count"
+    statistics_relation = TutorialStatisticsRelationChoices.LIKE
 
     user = models.ForeignKey(
         to="authentication.User",
@@ -139,11 +257,25 @@ class TutorialLike(AbstractTutorialScoreCoinModel):
     def get_create_coin(self) -> int:
         return config.TUTORIAL_LIKE_COIN
 
+    @hook(AFTER_CREATE)
+    @hook(AFTER_DELETE)
+    def invalidate_carousels_cache(self):
+        # Most liked tutorials carousel depends on likes
+        invalidate_home_carousels()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "tutorial"], name="unique_tutorial_like"
+            )
+        ]
+
 
 class TutorialUpVote(AbstractTutorialScoreCoinModel):
     """TutorialUpVote model"""
 
     tutorial_object_count_field = "up_votes_count"
+    statistics_relation = TutorialStatisticsRelationChoices.UP_VOTE
 
     user = models.ForeignKey(
         to="authentication.User",
@@ -165,11 +297,19 @@ class TutorialUpVote(AbstractTutorialScoreCoinModel):
     def get_create_coin(self) -> int:
         return config.TUTORIAL_UPVOTE_COIN
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "tutorial"], name="unique_tutorial_up_vote"
+            )
+        ]
+
 
 class TutorialDownVote(AbstractTutorialScoreCoinModel):
     """TutorialDownVote model"""
 
     tutorial_object_count_field = "down_votes_count"
+    statistics_relation = TutorialStatisticsRelationChoices.DOWN_VOTE
 
     user = models.ForeignKey(
         to="authentication.User",
@@ -190,3 +330,10 @@ class TutorialDownVote(AbstractTutorialScoreCoinModel):
 
     def get_create_coin(self) -> int:
         return config.TUTORIAL_DOWNVOTE_COIN
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "tutorial"], name="unique_tutorial_down_vote"
+            )
+        ]
@@ -0,0 +1,183 @@
+""" Bulk moderation engine
+
+Admin moderation actions update many rows and need updated rows for
+notifying their users. Instead of collecting primary keys, updating
+and querying updated rows again, rows are updated and fetched together:
+
+    - PostgreSQL and SQLite >= 3.35: a single
+      ``UPDATE ... WHERE pk IN (...) RETURNING ...`` statement per chunk.
+    - Other databases: selecting rows of chunk and updating them by
+      their primary keys (in a transaction).
+
+Large selections are processed in chunks ordered by primary key.
+"""
+from typing import Any
+from django.db import connections, transaction
+from django.db.models import Model, QuerySet
+from shared.models import ConfirmStatusChoices
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def supports_update_returning(connection) -> bool:
+    """Returns whether database supports UPDATE ... RETURNING.
+
+    Args:
+        connection: Database connection.
+
+    Returns:
+        bool: True for PostgreSQL and SQLite >= 3.35.
+    """
+    if connection.vendor == "postgresql":
+        return True
+
+    if connection.vendor == "sqlite":
+        return connection.Database.sqlite_version_info >= (3, 35)
+
+    return False
+
+
+def _update_chunk_returning(
+    chunk_queryset: QuerySet, values: dict[str, Any]
+) -> list[Model]:
+    model = chunk_queryset.model
+    db = chunk_queryset.db
+    connection = connections[db]
+    quote_name = connection.ops.quote_name
+    table = quote_name(model._meta.db_table)
+    fields = model._meta.concrete_fields
+
+    set_sql, set_params = [], []
+    for name, value in values.items():
+        field = model._meta.get_field(name)
+        set_sql.append(f"{quote_name(field.column)} = %s")
+        set_params.append(field.get_db_prep_save(value, connection))
+
+    pks_sql, pks_params = (
+        chunk_queryset.values("pk").query.sql_with_params()
+    )
+    returning = ", ".join(
+        f"{table}.{quote_name(field.column)}" for field in fields
+    )
+    sql = (
+        f"UPDATE {table} SET {', '.join(set_sql)} "
+        f"WHERE {quote_name(model._meta.pk.column)} IN ({pks_sql}) "
+        f"RETURNING {returning}"
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, (*set_params, *pks_params))
+        rows = cursor.fetchall()
+
+    # Convert database values like queryset does (e.g. SQLite datetimes)
+    columns_converters = []
+    for field in fields:
+        col = field.get_col(model._meta.db_table)
+        columns_converters.append(
+            (
+                connection.ops.get_db_converters(col)
+                + col.get_db_converters(connection),
+                col,
+            )
+        )
+
+    objects = []
+    for row in rows:
+        row = list(row)
+        for index, (converters, col) in enumerate(columns_converters):
+            for converter in converters:
+                row[index] = converter(row[index], col, connection)
+
+        objects.append(
+            model.from_db(db, [field.attname for field in fields], row)
+        )
+
+    return objects
+
+
+def _update_chunk_fallback(
+    chunk_queryset: QuerySet, values: dict[str, Any]
+) -> list[Model]:
+    with transaction.atomic(using=chunk_queryset.db):
+        objects = list(chunk_queryset.select_for_update())
+        chunk_queryset.model._base_manager.using(chunk_queryset.db).filter(
+            pk__in=[obj.pk for obj in objects]
+        ).update(**values)
+
+    for obj in objects:
+        for name, value in values.items():
+            setattr(obj, name, value)
+
+    return objects
+
+
+def update_returning(
+    queryset: QuerySet,
+    values: dict[str, Any],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> list[Model]:
+    """Updates queryset's rows and returns updated objects.
+
+    Notes:
+        - Like queryset.update(), it doesn't call save() and lifecycle
+          hooks of objects.
+        - values should only contain constant values (no expressions).
+
+    Args:
+        queryset (QuerySet): Rows to update.
+        values (dict[str, Any]): Field names to their new values.
+        chunk_size (int, optional): Max rows updated by each statement.
+            Defaults to DEFAULT_CHUNK_SIZE.
+
+    Returns:
+        list[Model]: Updated objects (ordered by primary key).
+    """
+    update_chunk = (
+        _update_chunk_returning
+        if supports_update_returning(connections[queryset.db])
+        else _update_chunk_fallback
+    )
+
+    objects = []
+    last_pk = None
+    while True:
+        chunk_queryset = queryset.order_by("pk")
+        if last_pk is not None:
+            chunk_queryset = chunk_queryset.filter(pk__gt=last_pk)
+
+        chunk = update_chunk(chunk_queryset[:chunk_size], values)
+        if not chunk:
+            return objects
+
+        chunk.sort(key=lambda obj: obj.pk)
+        objects.extend(chunk)
+        last_pk = chunk[-1].pk
+
+        if len(chunk) < chunk_size:
+            return objects
+
+
+def set_confirm_status(
+    queryset: QuerySet,
+    confirm_status: ConfirmStatusChoices,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> list[Model]:
+    """Sets confirm status of queryset's active objects which don't
+    have it already.
+
+    Args:
+        queryset (QuerySet): Tutorials or comments to moderate.
+        confirm_status (ConfirmStatusChoices): New confirm status.
+        chunk_size (int, optional): Max rows updated by each statement.
+            Defaults to DEFAULT_CHUNK_SIZE.
+
+    Returns:
+        list[Model]: Updated objects.
+    """
+    return update_returning(
+        queryset.exclude(confirm_status=confirm_status).filter(
+            is_active=True
+        ),
+        {"confirm_status": confirm_status},
+        chunk_size,
+    )
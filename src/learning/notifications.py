@@ -1,37 +1,51 @@
-import logging
 from abc import ABC
-from typing import Optional, Dict
-from smtplib import SMTPException
-from django.db.models import Model
+from typing import Iterable, Optional, Dict, Union
+from constance import config
+from django.db import transaction
+from django.db.models import Model, prefetch_related_objects
 from django.http import HttpRequest
 from django.shortcuts import resolve_url
 from django.core.mail import EmailMultiAlternatives
 from django.template.loader import render_to_string
 from django.core.exceptions import ImproperlyConfigured
 from django.db.models import QuerySet, Q
-from shared.models import ConfirmStatusChoices
+from shared.mail import bulk_queue, queue_email
+from shared.models import ConfirmStatusChoices, DigestEntry
 from learning.models import TutorialComment, Tutorial
 
 
-logger = logging.getLogger("emails")
-
-
 class NotificationResult:
-    def __init__(self, success: int = 0, failed: int = 0):
-        self.success = success
-        self.failed = failed
+    def __init__(self, queued: int = 0):
+        self.queued = queued
 
     def __add__(self, other):
-        return NotificationResult(
-            self.success + other.success, self.failed + other.failed
-        )
+        return NotificationResult(self.queued + other.queued)
 
 
 class AbstractQuerysetNotifier(ABC):
-    def __init__(self, request: HttpRequest, queryset: QuerySet):
+    # Notifiers which support digest mode should set these and
+    # implement get_digest_entry(). digest_template renders the part of
+    # notification's email which is shown as an entry of the digest.
+    digest_kind: Optional[str] = None
+    digest_subject: Optional[str] = None
+    digest_template: Optional[str] = None
+
+    # Related objects which are used by notifier
+    related_lookups: tuple[str, ...] = ()
+
+    def __init__(
+        self,
+        request: HttpRequest,
+        queryset: Union[QuerySet, Iterable[Model]],
+        digest: Optional[bool] = None,
+    ):
         self.request = request
         self.queryset = queryset
 
+        if digest is None:
+            digest = config.LEARNING_NOTIFICATIONS_DIGEST_WINDOW > 0
+        self.digest = digest and self.digest_kind is not None
+
     def get_queryset(self) -> QuerySet:
         """Returns queryset to notify about its objects.
 
@@ -40,25 +54,94 @@ class AbstractQuerysetNotifier(ABC):
         """
         return self.queryset
 
+    def is_notifiable(self, obj: Model) -> bool:
+        """Returns whether given object should be notified about.
+        It's equivalent of get_queryset() filters for objects lists.
+
+        Args:
+            obj (Model): Model object (with related_lookups fetched).
+
+        Returns:
+            bool: True if object should be notified about.
+        """
+        return True
+
+    def get_objects(self) -> Iterable[Model]:
+        """Returns objects to notify about. Notifier can be given a
+        queryset (filtered by get_queryset()) or a list of already
+        fetched objects (filtered by is_notifiable()).
+
+        Returns:
+            Iterable[Model]: Notification objects.
+        """
+        if isinstance(self.queryset, QuerySet):
+            return self.get_queryset()
+
+        objects = list(self.queryset)
+        # Fetches each relation once for all objects
+        prefetch_related_objects(objects, *self.related_lookups)
+
+        return [obj for obj in objects if self.is_notifiable(obj)]
+
     def notify(self) -> NotificationResult:
-        """Notifies about queryset objects
+        """Notifies about queryset objects. Emails are queued to be sent
+        by send_queued_emails command, so it returns immediately.
 
         Returns:
-            NotificationResult: Count of succeeded and failed notifications.
+            NotificationResult: Count of queued notifications.
         """
+        if self.digest:
+            return self.notify_by_digest()
+
         notification_email_result = NotificationResult()
 
-        for obj in self.get_queryset():
-            # Notify by email
-            email_result = self.notify_by_email(obj, self.build_url(obj))
-            if email_result:
-                notification_email_result.success += 1
-            else:
-                notification_email_result.failed += 1
+        # Queue all emails together in a single transaction
+        with transaction.atomic(), bulk_queue():
+            for obj in self.get_objects():
+                # Notify by email
+                self.notify_by_email(obj, self.build_url(obj))
+                notification_email_result.queued += 1
 
         return notification_email_result
 
-    def notify_by_email(self, obj: Model, url: Optional[str] = None) -> bool:
+    def notify_by_digest(self) -> NotificationResult:
+        """Adds queryset objects' notifications to their recipients'
+        digests (see shared.mail.send_digests).
+
+        Returns:
+            NotificationResult: Count of queued notifications.
+        """
+        entries = DigestEntry.objects.bulk_create(
+            [
+                self.get_digest_entry(obj, self.build_url(obj))
+                for obj in self.get_objects()
+            ]
+        )
+
+        return NotificationResult(queued=len(entries))
+
+    def get_digest_entry(
+        self, obj: Model, url: Optional[str] = None
+    ) -> DigestEntry:
+        """Returns digest entry of given object's notification.
+
+        Args:
+            obj (Model): Model object to notify about it.
+            url (Optional[str], optional): Notification url.
+                Defaults to None.
+
+        Raises:
+            ImproperlyConfigured: It should be implemented by notifiers
+                which support digest mode.
+
+        Returns:
+            DigestEntry: Unsaved digest entry.
+        """
+        raise ImproperlyConfigured(
+            "get_digest_entry has not been configured yet."
+        )
+
+    def notify_by_email(self, obj: Model, url: Optional[str] = None):
         """Notifies about given object by email.
 
         Args:
@@ -69,10 +152,6 @@ class AbstractQuerysetNotifier(ABC):
         Raises:
             ImproperlyConfigured: It should be implemented by user. otherwise,
                 it will raise ImproperlyConfigured.
-
-        Returns:
-            bool: True if sending email was successful. otherwise,
-                returns False.
         """
         raise ImproperlyConfigured(
             "notify_by_email has not been configured yet."
@@ -96,8 +175,8 @@ class AbstractQuerysetNotifier(ABC):
         plain_message: Optional[str] = None,
         template: Optional[str] = None,
         context: Optional[Dict] = None,
-    ) -> bool:
-        """Send email to given to_emails.
+    ):
+        """Queues email to given to_emails (see shared.mail).
 
         Args:
             subject (str): Email subject.
@@ -108,9 +187,6 @@ class AbstractQuerysetNotifier(ABC):
                 Defaults to None.
             context (Optional[Dict], optional): Email template's context.
                 Defaults to None.
-
-        Returns:
-            bool: True if sending was successful, otherwise False.
         """
         email = EmailMultiAlternatives(subject, plain_message, to=to_emails)
 
@@ -118,23 +194,23 @@ class AbstractQuerysetNotifier(ABC):
             html_message = render_to_string(template, context)
             email.attach_alternative(html_message, "text/html")
 
-        try:
-            email.send()
-            return True
-        except SMTPException as ex:
-            logger.warning(ex)
-            return False
+        queue_email(email)
 
 
 class TutorialConfirmDisproveNotifier(AbstractQuerysetNotifier):
+    related_lookups = ("author",)
+
     def get_queryset(self) -> QuerySet[Tutorial]:
         return self.queryset.exclude(
             confirm_status=ConfirmStatusChoices.WAITING_FOR_CONFIRM
-        )
+        ).select_related(*self.related_lookups)
+
+    def is_notifiable(self, obj: Tutorial) -> bool:
+        return obj.confirm_status != ConfirmStatusChoices.WAITING_FOR_CONFIRM
 
     def notify_by_email(
         self, obj: Tutorial, url: Optional[str] = None
-    ) -> bool:
+    ):
         template = "mails/tutorial_confirm_disprove.html"
         if obj.confirm_status == ConfirmStatusChoices.CONFIRMED:
             status_text = "تایید شد"
@@ -154,8 +230,12 @@ class TutorialConfirmDisproveNotifier(AbstractQuerysetNotifier):
             plain_message += f"\n لینک آموزش: {url}"
             context["url"] = url
 
-        return self.send_email(
-            subject, to_emails, plain_message, template, context
+        self.send_email(
+            subject,
+            to_emails,
+            plain_message,
+            template,
+            context,
         )
 
     def build_url(self, obj: Tutorial):
@@ -165,16 +245,25 @@ class TutorialConfirmDisproveNotifier(AbstractQuerysetNotifier):
 
 
 class TutorialCommentConfirmDisproveNotifier(AbstractQuerysetNotifier):
+    related_lookups = ("user", "tutorial")
+
     def get_queryset(self) -> QuerySet[TutorialComment]:
         return self.queryset.exclude(
             Q(user=None)
             | Q(tutorial=None)
             | Q(confirm_status=ConfirmStatusChoices.WAITING_FOR_CONFIRM)
+        ).select_related(*self.related_lookups)
+
+    def is_notifiable(self, obj: TutorialComment) -> bool:
+        return (
+            obj.user_id is not None
+            and obj.tutorial_id is not None
+            and obj.confirm_status != ConfirmStatusChoices.WAITING_FOR_CONFIRM
         )
 
     def notify_by_email(
         self, obj: TutorialComment, url: Optional[str] = None
-    ) -> bool:
+    ):
         template = "mails/tutorial_comment_confirm_disprove.html"
         tutorial = obj.tutorial
 
@@ -200,8 +289,12 @@ class TutorialCommentConfirmDisproveNotifier(AbstractQuerysetNotifier):
             plain_message += f"\n لینک پاسخ: {url}"
             context["url"] = url
 
-        return self.send_email(
-            subject, to_emails, plain_message, template, context
+        self.send_email(
+            subject,
+            to_emails,
+            plain_message,
+            template,
+            context,
         )
 
     def build_url(self, obj: TutorialComment):
@@ -212,38 +305,80 @@ class TutorialCommentConfirmDisproveNotifier(AbstractQuerysetNotifier):
 
 
 class TutorialAuthorNewConfirmedCommentNotifier(AbstractQuerysetNotifier):
+    digest_kind = "tutorial_new_confirmed_comments"
+    digest_subject = "دیدگاه های جدید آموزش های شما"
+    digest_template = "mails/fragments/tutorial_new_confirmed_comment.html"
+
+    related_lookups = ("user", "tutorial__author")
+
     def get_queryset(self) -> QuerySet[TutorialComment]:
-        return self.queryset.exclude(
-            Q(tutorial=None) | Q(tutorial__author=None)
-        ).filter(
-            confirm_status=ConfirmStatusChoices.CONFIRMED,
-            is_active=True,
-            tutorial__confirm_status=ConfirmStatusChoices.CONFIRMED,
-            tutorial__is_active=True,
+        return (
+            self.queryset.exclude(Q(tutorial=None) | Q(tutorial__author=None))
+            .filter(
+                confirm_status=ConfirmStatusChoices.CONFIRMED,
+                is_active=True,
+                tutorial__confirm_status=ConfirmStatusChoices.CONFIRMED,
+                tutorial__is_active=True,
+            )
+            .select_related(*self.related_lookups)
+        )
+
+    def is_notifiable(self, obj: TutorialComment) -> bool:
+        tutorial = obj.tutorial
+
+        return (
+            tutorial is not None
+            and tutorial.author_id is not None
+            and obj.confirm_status == ConfirmStatusChoices.CONFIRMED
+            and obj.is_active
+            and tutorial.confirm_status == ConfirmStatusChoices.CONFIRMED
+            and tutorial.is_active
         )
 
     def notify_by_email(
         self, obj: TutorialComment, url: Optional[str] = None
-    ) -> bool:
+    ):
         template = "mails/tutorial_new_confirmed_comment.html"
-        tutorial = obj.tutorial
 
         to_emails = [obj.tutorial.author.email]
         subject = "ثبت دیدگاه جدید برای آموزش شما"
-        plain_message = (
+        plain_message = f"{self.get_message(obj)} \nلینک دیدگاه: {url}"
+        context = {"subject": subject, **self.get_context(obj, url)}
+
+        self.send_email(
+            subject,
+            to_emails,
+            plain_message,
+            template,
+            context,
+        )
+
+    def get_context(
+        self, obj: TutorialComment, url: Optional[str] = None
+    ) -> dict:
+        return {"comment": obj, "tutorial": obj.tutorial, "url": url}
+
+    def get_message(self, obj: TutorialComment) -> str:
+        return (
             f'دیدگاه "{obj.title}" برای آموزش '
-            f'"{tutorial.title}" ثبت و تایید شد \n'
-            f"لینک دیدگاه: {url}"
+            f'"{obj.tutorial.title}" ثبت و تایید شد'
         )
-        context = {
-            "subject": subject,
-            "comment": obj,
-            "tutorial": tutorial,
-            "url": url,
-        }
 
-        return self.send_email(
-            subject, to_emails, plain_message, template, context
+    def get_digest_entry(
+        self, obj: TutorialComment, url: Optional[str] = None
+    ) -> DigestEntry:
+        author = obj.tutorial.author
+
+        return DigestEntry(
+            kind=self.digest_kind,
+            recipient=author.email,
+            recipient_name=author.first_name,
+            subject=self.digest_subject,
+            message=self.get_message(obj),
+            html_message=render_to_string(
+                self.digest_template, self.get_context(obj, url)
+            ),
+            url=url or "",
         )
 
     def build_url(self, obj: TutorialComment):
@@ -254,6 +389,17 @@ class TutorialAuthorNewConfirmedCommentNotifier(AbstractQuerysetNotifier):
 
 
 class TutorialCommentReplyNotifier(AbstractQuerysetNotifier):
+    digest_kind = "tutorial_comment_replies"
+    digest_subject = "پاسخ های جدید به نظرات شما"
+    digest_template = "mails/fragments/tutorial_comment_reply.html"
+
+    related_lookups = (
+        "user",
+        "tutorial",
+        "parent_comment__user",
+        "parent_comment__tutorial",
+    )
+
     def get_queryset(self) -> QuerySet[TutorialComment]:
         return (
             self.queryset.exclude(parent_comment=None)
@@ -262,32 +408,73 @@ class TutorialCommentReplyNotifier(AbstractQuerysetNotifier):
                 parent_comment__is_active=True,
                 parent_comment__notify_replies=True,
             )
-            .select_related("parent_comment", "parent_comment__user")
+            .select_related(*self.related_lookups)
+        )
+
+    def is_notifiable(self, obj: TutorialComment) -> bool:
+        parent_comment = obj.parent_comment
+
+        return (
+            parent_comment is not None
+            and parent_comment.confirm_status
+            == ConfirmStatusChoices.CONFIRMED
+            and parent_comment.is_active
+            and parent_comment.notify_replies
         )
 
     def notify_by_email(
         self, obj: TutorialComment, url: Optional[str] = None
-    ) -> bool:
+    ):
         template = "mails/tutorial_comment_reply.html"
         parent_comment: TutorialComment = obj.parent_comment
-        tutorial: Tutorial = parent_comment.tutorial
 
         to_emails = [parent_comment.user.email]
         subject = f'پاسخ به نظر "{parent_comment.title}"'
-        plain_message = (
-            f'پاسخی برای نظر "{parent_comment.title}" ثبت شده و اکنون تایید شد'
-            f"لینک پاسخ: {url}"
+        plain_message = f"{self.get_message(obj)}لینک پاسخ: {url}"
+        context = {"subject": subject, **self.get_context(obj, url)}
+
+        self.send_email(
+            subject,
+            to_emails,
+            plain_message,
+            template,
+            context,
         )
-        context = {
-            "subject": subject,
+
+    def get_context(
+        self, obj: TutorialComment, url: Optional[str] = None
+    ) -> dict:
+        parent_comment: TutorialComment = obj.parent_comment
+        tutorial: Tutorial = parent_comment.tutorial
+
+        return {
             "child_comment": obj,
             "parent_comment": parent_comment,
             "tutorial": tutorial,
             "url": url,
         }
 
-        return self.send_email(
-            subject, to_emails, plain_message, template, context
+    def get_message(self, obj: TutorialComment) -> str:
+        return (
+            f'پاسخی برای نظر "{obj.parent_comment.title}" '
+            "ثبت شده و اکنون تایید شد"
+        )
+
+    def get_digest_entry(
+        self, obj: TutorialComment, url: Optional[str] = None
+    ) -> DigestEntry:
+        user = obj.parent_comment.user
+
+        return DigestEntry(
+            kind=self.digest_kind,
+            recipient=user.email,
+            recipient_name=user.first_name,
+            subject=self.digest_subject,
+            message=self.get_message(obj),
+            html_message=render_to_string(
+                self.digest_template, self.get_context(obj, url)
+            ),
+            url=url or "",
         )
 
     def build_url(self, obj: TutorialComment):
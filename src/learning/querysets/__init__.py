@@ -1,5 +1,10 @@
-from django.db.models import Q
+from datetime import date
+from typing import Optional
+from django.db.models import Q, QuerySet, Aggregate, F
+from django.db.models.functions import TruncDate
+from shared.date_time import calendar, bucket_month_indexes, get_last_months
 from shared.models import ConfirmStatusChoices
+from shared.statistics import MonthlyCountStatistics
 
 
 _ACTIVE_CONFIRMED_FILTERS = {
@@ -30,4 +35,75 @@ def get_active_confirmed_filters(rel_name: str = "") -> Q:
     )
 
 
-__all__ = ["get_active_confirmed_filters"]
+def get_monthly_count_statistics(
+    queryset: QuerySet,
+    date_field: str,
+    value: Aggregate,
+    last_months_count: int = 5,
+    today: Optional[date] = None,
+    ascending: bool = True,
+) -> list[MonthlyCountStatistics]:
+    """Aggregates queryset's value per last given jalali months.
+
+    Values are grouped by day in database and days are bucketed into
+    months by precomputed jalali calendar. Thus, query doesn't grow
+    with count of months.
+
+    Args:
+        queryset (QuerySet): Objects to aggregate.
+        date_field (str): Date or datetime field to group objects by.
+        value (Aggregate): Aggregate of each day's objects (e.g. Count).
+        last_months_count (int, optional): Count of last months to
+            calculate. Defaults to 5.
+        today (Optional[date], optional): Defaults to today.
+        ascending (bool, optional): Sort months ascending.
+            Defaults to True.
+
+    Returns:
+        list[MonthlyCountStatistics]: Month's label and
+            aggregated value for that month.
+    """
+    # Months are sorted in descending order
+    months = list(get_last_months(last_months_count, today))
+    if not months:
+        return []
+
+    start, end = months[-1].gregorian_start, months[0].gregorian_end
+    first_index = calendar.get_month_index(start.date())
+
+    field = queryset.model._meta.get_field(date_field)
+    if field.get_internal_type() == "DateTimeField":
+        day = TruncDate(date_field)
+    else:
+        day = F(date_field)
+        start, end = start.date(), end.date()
+
+    daily_values = (
+        queryset.filter(
+            **{f"{date_field}__gte": start, f"{date_field}__lt": end}
+        )
+        .order_by()
+        .values(day=day)
+        .annotate(value=value)
+        .values_list("day", "value")
+    )
+
+    daily_values = list(daily_values)
+    month_indexes = bucket_month_indexes(day for day, _ in daily_values)
+
+    monthly_values = [0] * len(months)
+    for month_index, (_, day_value) in zip(month_indexes, daily_values):
+        monthly_values[month_index - first_index] += day_value or 0
+
+    count_statistics: list[MonthlyCountStatistics] = [
+        MonthlyCountStatistics({"label": month.label, "count": month_value})
+        for month, month_value in zip(
+            months[::-1] if ascending else months,
+            monthly_values if ascending else monthly_values[::-1],
+        )
+    ]
+
+    return count_statistics
+
+
+__all__ = ["get_active_confirmed_filters", "get_monthly_count_statistics"]
@@ -1,9 +1,14 @@
 """ QuerySet for tutorial comment model """
 from django.db.models import QuerySet
+from learning.category_tree import invalidate_category_tree
 
 
 class CategoryQueryset(QuerySet):
-    """Category queryset"""
+    """Category queryset
+
+    Bulk operations don't trigger categories' lifecycle hooks, thus
+    they invalidate category tree themselves.
+    """
 
     def active_categories(self) -> QuerySet:
         """
@@ -11,3 +16,18 @@ class CategoryQueryset(QuerySet):
             [QuerySet]: Active categories
         """
         return self.filter(is_active=True)
+
+    def update(self, **kwargs) -> int:
+        updated = super().update(**kwargs)
+        invalidate_category_tree()
+        return updated
+
+    def delete(self):
+        deleted = super().delete()
+        invalidate_category_tree()
+        return deleted
+
+    def bulk_create(self, *args, **kwargs):
+        categories = super().bulk_create(*args, **kwargs)
+        invalidate_category_tree()
+        return categories
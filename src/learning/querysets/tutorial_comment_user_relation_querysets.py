@@ -1,4 +1,4 @@
-from django.db.models import QuerySet
+from django.db.models import QuerySet, F
 from . import get_active_confirmed_filters
 
 
@@ -9,3 +9,12 @@ class TutorialCommentUserRelationQueryset(QuerySet):
             [QuerySet]: objects with active and confirmed comment
         """
         return self.filter(get_active_confirmed_filters("comment"))
+
+    def user_object_ids(self, user, comment_ids) -> QuerySet:
+        """
+        Returns:
+            [QuerySet]: object_id of user's objects of given comments
+        """
+        return self.filter(user=user, comment_id__in=comment_ids).values(
+            object_id=F("comment_id")
+        )
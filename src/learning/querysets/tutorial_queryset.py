@@ -1,13 +1,43 @@
 """ QuerySet for tutorial model """
 from __future__ import annotations
-from django.db.models import QuerySet, Prefetch, Count, Sum, Q
+from collections import defaultdict
+from django.db.models import (
+    QuerySet,
+    Prefetch,
+    Count,
+    Sum,
+    F,
+    OuterRef,
+    Subquery,
+    Exists,
+    Value,
+    BooleanField,
+)
 from django.db.models.functions import Coalesce
 from shared.statistics import TutorialStatistics
+from learning.search import build_search_document, get_search_backend
+from learning.category_tree import get_category_tree
 from learning.models.category import Category
 from learning.models.tutorial_comment import TutorialComment
 from . import get_active_confirmed_filters
 
 
+def _active_confirmed_comments_count() -> Coalesce:
+    """Subquery expression which counts tutorial's (OuterRef("pk"))
+    active and confirmed comments.
+    """
+    comments_count = (
+        TutorialComment.objects.filter(tutorial=OuterRef("pk"))
+        .active_and_confirmed_comments()
+        .order_by()
+        .values("tutorial")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+
+    return Coalesce(Subquery(comments_count), 0)
+
+
 class TutorialQueryset(QuerySet):
     """Tutorial queryset"""
 
@@ -18,32 +48,43 @@ class TutorialQueryset(QuerySet):
         """
         return self.filter(get_active_confirmed_filters())
 
-    def annonate_comments_count(self) -> TutorialQueryset:
-        """Annonates active and confirmed comments count
-        as comments_count.
+    def drifted_comments_count(self) -> TutorialQueryset:
+        """Filters tutorials which their stored active_confirmed_comments_count
+        doesn't match their actual active and confirmed comments count.
+        Annonates actual count as actual_comments_count.
 
         Returns:
-            TutorialQueryset: Tutorials with comments_count.
+            TutorialQueryset: Tutorials with wrong comments count.
         """
         return self.annotate(
-            comments_count=Count(
-                # Note: if distinct=False it will count comments
-                # multiple times then count will go wrong
-                "comments",
-                distinct=True,
-                filter=Q(get_active_confirmed_filters("comments")),
-            ),
+            actual_comments_count=_active_confirmed_comments_count()
+        ).exclude(active_confirmed_comments_count=F("actual_comments_count"))
+
+    def update_active_confirmed_comments_count(self) -> int:
+        """Recalculates active_confirmed_comments_count of tutorials
+        in a single query.
+
+        Returns:
+            int: Count of updated tutorials.
+        """
+        return self.update(
+            active_confirmed_comments_count=_active_confirmed_comments_count()
         )
 
     def only_main_fields(self) -> TutorialQueryset:
-        """Only gets title, slug, short_description, likes_count
-        and image from db and returns them.
+        """Only gets title, slug, short_description, likes_count,
+        active_confirmed_comments_count and image from db and returns them.
 
         Returns:
             TutorialQueryset: Main fields of tutorials.
         """
         return self.only(
-            "title", "slug", "short_description", "likes_count", "image"
+            "title",
+            "slug",
+            "short_description",
+            "likes_count",
+            "active_confirmed_comments_count",
+            "image",
         )
 
     def prefetch_active_categories(self) -> TutorialQueryset:
@@ -76,6 +117,38 @@ class TutorialQueryset(QuerySet):
             ),
         )
 
+    def annotate_user_relations(self, user) -> TutorialQueryset:
+        """Annotates whether user has liked (liked_by_current_user) and
+        viewed (viewed_by_current_user) tutorials by Exists subqueries.
+        Both are False for anonymous users.
+
+        Args:
+            user (User): Current user.
+
+        Returns:
+            TutorialQueryset: Tutorials with user's relation flags.
+        """
+        relations = {
+            "liked_by_current_user": "likes",
+            "viewed_by_current_user": "views",
+        }
+
+        return self.annotate(
+            **{
+                name: (
+                    Exists(
+                        self.model._meta.get_field(relation)
+                        .related_model.objects.filter(
+                            tutorial=OuterRef("pk"), user=user
+                        )
+                    )
+                    if user.is_authenticated
+                    else Value(False, output_field=BooleanField())
+                )
+                for name, relation in relations.items()
+            }
+        )
+
     def aggregate_statistics(self) -> TutorialStatistics:
         """Aggregates statistics contining tutorials_count,
         likes_count, views_count and comments_count.
@@ -88,15 +161,104 @@ class TutorialQueryset(QuerySet):
             # Use Coalesce to ensure aggregation result won't be None
             likes_count=Coalesce(Sum("likes_count"), 0),
             views_count=Coalesce(Sum("user_views_count"), 0),
-            # Aggregate count of active and confirmed tutorial comments
-            comments_count=Count(
-                "comments",
-                filter=Q(get_active_confirmed_filters("comments")),
-            ),
+            comments_count=Coalesce(Sum("active_confirmed_comments_count"), 0),
         )
 
         return TutorialStatistics(statistics)
 
+    def search(self, value: str) -> TutorialQueryset:
+        """Searches tutorials by their search documents (title, slug,
+        descriptions, active categories names and tags titles).
+
+        Args:
+            value (str): Search query.
+
+        Returns:
+            TutorialQueryset: Matched tutorials annonated with search_rank.
+                Tutorials are ordered by their search_rank (descending).
+        """
+        return (
+            get_search_backend(self.db)
+            .search(self, value)
+            .order_by("-search_rank", "-create_date")
+        )
+
+    def update_search_documents(self, batch_size: int = 500) -> int:
+        """Rebuilds search documents of tutorials and updates search index.
+
+        Args:
+            batch_size (int, optional): Count of tutorials to update
+                in each batch. Defaults to 500.
+
+        Returns:
+            int: Count of updated tutorials.
+        """
+        pks = list(self.order_by().values_list("pk", flat=True))
+
+        for start in range(0, len(pks), batch_size):
+            end = start + batch_size
+            self._update_search_documents(pks[start:end])
+
+        return len(pks)
+
+    def _update_search_documents(self, pks: list[int]):
+        categories = defaultdict(list)
+        for tutorial_id, name in (
+            Category.objects.active_categories()
+            .filter(tutorials__in=pks)
+            .values_list("tutorials", "name")
+        ):
+            categories[tutorial_id].append(name)
+
+        tags = defaultdict(list)
+        for tutorial_id, title in self.model.objects.filter(
+            pk__in=pks, tags__isnull=False
+        ).values_list("pk", "tags__title"):
+            tags[tutorial_id].append(title)
+
+        documents = {
+            pk: build_search_document(
+                title,
+                slug,
+                short_description,
+                body,
+                categories[pk],
+                tags[pk],
+            )
+            for pk, title, slug, short_description, body in (
+                self.model.objects.filter(pk__in=pks).values_list(
+                    "pk", "title", "slug", "short_description", "body"
+                )
+            )
+        }
+
+        self.model.objects.bulk_update(
+            [
+                self.model(pk=pk, search_document=document)
+                for pk, document in documents.items()
+            ],
+            ["search_document"],
+        )
+        get_search_backend(self.db).index(documents)
+
+    def get_indexed_related_tutorials(
+        self, tutorial, tutorial_count: int = 5
+    ) -> TutorialQueryset:
+        """Gets related tutorials to given tutorial from precomputed
+        related tutorials index (see learning.recommendations).
+
+        Args:
+            tutorial (Tutorial): Base tutorial.
+            tutorial_count (int, optional): Expected max count of tutorial.
+                Defaults to 5.
+
+        Returns:
+            TutorialQueryset: Related tutorials ordered by their score.
+        """
+        return self.filter(
+            indexed_as_related__tutorial=tutorial
+        ).order_by("-indexed_as_related__score", "pk")[:tutorial_count]
+
     def get_related_tutorials(
         self, tutorial, tutorial_count: int = 5
     ) -> TutorialQueryset:
@@ -113,24 +275,18 @@ class TutorialQueryset(QuerySet):
             TutorialQueryset: Related tutorials to given one.
         """
 
-        def _flat_categories_parents(categories: list):
-            """Returns list of categories and their parents"""
-            result = categories
-
-            for category in categories:
-                while category.parent_category:
-                    category = category.parent_category
-                    result.append(category)
-
-            # Distinct result
-            return list(dict.fromkeys(result))
-
-        categories_and_parents = list(tutorial.categories.all())
+        categories = list(tutorial.categories.all())
         # If tutorial doesn't have any active category return empty
-        if len(categories_and_parents) == 0:
+        if len(categories) == 0:
             return self.none()
 
-        categories = _flat_categories_parents(categories_and_parents)
+        # Add categories' parents (without querying them one by one)
+        ancestors = get_category_tree().ancestors
+        categories = {
+            ancestor_id
+            for category in categories
+            for ancestor_id in (category.pk, *ancestors.get(category.pk, ()))
+        }
 
         # Get tutorials with joint categories
         related_tutorials = (
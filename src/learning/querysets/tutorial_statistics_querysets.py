@@ -0,0 +1,142 @@
+from datetime import date
+from typing import Optional
+from django.db.models import QuerySet, F, Sum
+from shared.statistics import MonthlyCountStatistics
+from . import get_active_confirmed_filters, get_monthly_count_statistics
+
+
+class TutorialDailyStatisticsQueryset(QuerySet):
+    def active_confirmed_tutorials(self) -> QuerySet:
+        """
+        Returns:
+            [QuerySet]: objects with active and confirmed tutorial
+        """
+        return self.filter(get_active_confirmed_filters("tutorial"))
+
+    def add_count(
+        self, tutorial_id: int, relation: str, day: date, value: int
+    ) -> None:
+        """Adds value to count of given tutorial, relation and day
+        (creates the row if it doesn't exist).
+
+        Args:
+            tutorial_id (int): Tutorial's primary key.
+            relation (str): TutorialStatisticsRelationChoices value.
+            day (date): Statistics day.
+            value (int): Value to add to count (negative to decrease).
+        """
+        row_filters = {
+            "tutorial_id": tutorial_id,
+            "relation": relation,
+            "date": day,
+        }
+
+        if self.filter(**row_filters).update(count=F("count") + value):
+            return
+
+        # Ignore conflicts in case a concurrent request creates it too
+        self.bulk_create(
+            [self.model(**row_filters, count=0)], ignore_conflicts=True
+        )
+        self.filter(**row_filters).update(count=F("count") + value)
+
+    def get_ids(self, keys: set[tuple[int, str, date]]) -> dict:
+        """Returns primary keys of rows of given tutorials, relations and
+        days. Missing rows are created, except ones of deleted tutorials
+        (which aren't returned).
+
+        Args:
+            keys (set[tuple[int, str, date]]): Rows' (tutorial_id,
+                relation, date) tuples.
+
+        Returns:
+            dict: Keys to their rows' primary keys.
+        """
+        if not keys:
+            return {}
+
+        ids = self._get_existing_ids(keys)
+        missing_keys = keys - ids.keys()
+        if not missing_keys:
+            return ids
+
+        tutorial_model = self.model.tutorial.field.related_model
+        tutorial_ids = set(
+            tutorial_model.objects.filter(
+                pk__in={key[0] for key in missing_keys}
+            ).values_list("pk", flat=True)
+        )
+        missing_keys = {key for key in missing_keys if key[0] in tutorial_ids}
+
+        # Ignore conflicts of concurrently created rows
+        self.bulk_create(
+            [
+                self.model(
+                    tutorial_id=tutorial_id, relation=relation, date=day
+                )
+                for tutorial_id, relation, day in missing_keys
+            ],
+            ignore_conflicts=True,
+        )
+        ids.update(self._get_existing_ids(missing_keys))
+
+        return ids
+
+    def _get_existing_ids(self, keys: set[tuple[int, str, date]]) -> dict:
+        if not keys:
+            return {}
+
+        rows = self.filter(
+            tutorial_id__in={key[0] for key in keys},
+            relation__in={key[1] for key in keys},
+            date__in={key[2] for key in keys},
+        ).values_list("tutorial_id", "relation", "date", "pk")
+
+        return {
+            (tutorial_id, relation, day): pk
+            for tutorial_id, relation, day, pk in rows
+            if (tutorial_id, relation, day) in keys
+        }
+
+    def get_counter_pks(self, natural_keys: set[str]) -> dict[str, int]:
+        """Resolves natural keys of buffered count counters (see
+        TutorialDailyStatistics.get_counter_key) to their rows' primary
+        keys (see get_ids).
+
+        Args:
+            natural_keys (set[str]): Counters' natural keys.
+
+        Returns:
+            dict[str, int]: Natural keys to their rows' primary keys.
+        """
+        keys = {}
+        for natural_key in natural_keys:
+            tutorial_id, relation, day = natural_key.split("/")
+            keys[
+                (int(tutorial_id), relation, date.fromisoformat(day))
+            ] = natural_key
+
+        return {keys[key]: pk for key, pk in self.get_ids(set(keys)).items()}
+
+    def get_last_months_count_statistics(
+        self,
+        last_months_count: int = 5,
+        today: Optional[date] = None,
+        ascending: bool = True,
+    ) -> list[MonthlyCountStatistics]:
+        """Calculates sum of daily counts per last given jalali months.
+
+        Only daily rows of last months are read. thus, its cost doesn't
+        depend on count of relation objects.
+
+        Args:
+            last_months_count (int, optional): Count of last months to
+                calculate. Defaults to 5.
+
+        Returns:
+            list[MonthlyCountStatistics]: Month's label and
+                count of objects for that month.
+        """
+        return get_monthly_count_statistics(
+            self, "date", Sum("count"), last_months_count, today, ascending
+        )
@@ -0,0 +1,316 @@
+""" Reactions
+
+Reaction states (get_reaction_states) of a user for many tutorials or
+comments are fetched by a single UNION query of reaction models and
+cached per user (invalidated when user's reactions change).
+
+Batch reactions (apply_reactions) applies a batch of user's reaction
+toggles (like, up-vote and down-vote of tutorials and comments) in a
+single transaction:
+
+    - Targets are fetched (and locked) by one query per target model.
+    - User's existing reactions are fetched by one query per reaction
+      model.
+    - Toggles are applied in order in memory, so only net changes are
+      written by one INSERT ... ON CONFLICT DO NOTHING and one DELETE
+      per reaction model.
+    - Counter changes of all reactions (including daily statistics) are
+      aggregated and written by one UPDATE per counter model (or added to
+      write-behind buffer on commit).
+
+Reactions changed by a concurrent request roll the whole batch back, so
+counters always match reaction rows.
+"""
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Optional
+from constance import config
+from django.db import IntegrityError, transaction
+from django.db.models import CharField, Value
+from shared.counters import (
+    CounterKey,
+    apply_counter_deltas,
+    buffer_counter_deltas,
+    write_behind_counters_enabled,
+)
+from shared.date_time import to_default_local_date
+from learning.caches import (
+    get_reaction_states as get_cached_reaction_states,
+    invalidate_home_carousels,
+    invalidate_reaction_states,
+)
+from learning.models import (
+    Tutorial,
+    TutorialComment,
+    TutorialLike,
+    TutorialUpVote,
+    TutorialDownVote,
+    TutorialCommentLike,
+    TutorialCommentUpVote,
+    TutorialCommentDownVote,
+    TutorialDailyStatistics,
+)
+
+# Target name -> (target relation field name, reaction name -> model)
+REACTION_MODELS = {
+    "tutorial": (
+        "tutorial",
+        {
+            "like": TutorialLike,
+            "upvote": TutorialUpVote,
+            "downvote": TutorialDownVote,
+        },
+    ),
+    "tutorial_comment": (
+        "comment",
+        {
+            "like": TutorialCommentLike,
+            "upvote": TutorialCommentUpVote,
+            "downvote": TutorialCommentDownVote,
+        },
+    ),
+}
+
+
+@dataclass(frozen=True)
+class ReactionOperation:
+    target: str
+    reaction: str
+    object_id: int
+
+    @property
+    def model(self):
+        return REACTION_MODELS[self.target][1][self.reaction]
+
+    @property
+    def relation(self) -> str:
+        return REACTION_MODELS[self.target][0]
+
+
+def get_reaction_states(
+    user, target: str, object_ids
+) -> dict[int, dict[str, bool]]:
+    """Returns whether user has each reaction (e.g. like) on given
+    objects of target.
+
+    Args:
+        user (User): Authenticated user.
+        target (str): REACTION_MODELS key (e.g. tutorial_comment).
+        object_ids (Iterable[int]): Objects' primary keys.
+
+    Returns:
+        dict[int, dict[str, bool]]: Objects' primary keys to reaction
+            names to whether user has that reaction.
+    """
+    models = REACTION_MODELS[target][1]
+    object_ids = sorted(set(object_ids))
+
+    def calculate():
+        states = {
+            object_id: {reaction: False for reaction in models}
+            for object_id in object_ids
+        }
+        querysets = [
+            model.objects.user_object_ids(user, object_ids).annotate(
+                reaction=Value(reaction, output_field=CharField())
+            )
+            for reaction, model in models.items()
+        ]
+
+        for row in querysets[0].union(*querysets[1:], all=True):
+            states[row["object_id"]][row["reaction"]] = True
+
+        return states
+
+    if not object_ids:
+        return {}
+
+    return get_cached_reaction_states(
+        user.pk,
+        target,
+        object_ids,
+        calculate,
+        config.LEARNING_REACTION_STATES_CACHE_TIMEOUT,
+    )
+
+
+def get_targets(operations: list[ReactionOperation]) -> dict[str, dict]:
+    """Fetches and locks active and confirmed targets of operations.
+
+    Returns:
+        dict[str, dict]: Target names to their objects by primary key.
+    """
+    ids = defaultdict(set)
+    for operation in operations:
+        ids[operation.target].add(operation.object_id)
+
+    querysets = {
+        "tutorial": Tutorial.objects.active_and_confirmed_tutorials(),
+        "tutorial_comment": (
+            TutorialComment.objects.active_and_confirmed_comments()
+        ),
+    }
+
+    return {
+        target: querysets[target]
+        .select_for_update()
+        .order_by("pk")
+        .in_bulk(target_ids)
+        for target, target_ids in ids.items()
+    }
+
+
+def apply_reactions(
+    user, operations: list[ReactionOperation]
+) -> list[Optional[bool]]:
+    """Toggles user's reactions by operations (in order).
+
+    Args:
+        user (User): Reacting user.
+        operations (list[ReactionOperation]): Toggle operations.
+
+    Raises:
+        IntegrityError: When user's reactions are changed by a concurrent
+            request (whole batch is rolled back).
+
+    Returns:
+        list[Optional[bool]]: Result of each operation. True if reaction
+            is inserted, False if it's deleted and None if its target
+            doesn't exist (or isn't active and confirmed).
+    """
+    with transaction.atomic():
+        targets = get_targets(operations)
+
+        # Reaction model -> target's pk -> user's existing reaction
+        existing = {}
+        # Reaction model -> target's pk -> whether reaction should exist
+        states = defaultdict(dict)
+
+        for operation in operations:
+            model = operation.model
+            if model not in existing:
+                target_ids = {
+                    item.object_id
+                    for item in operations
+                    if item.model is model
+                    and item.object_id in targets[item.target]
+                }
+                existing[model] = {
+                    getattr(reaction, operation.relation + "_id"): reaction
+                    for reaction in model.objects.filter(
+                        user=user,
+                        **{operation.relation + "_id__in": target_ids},
+                    )
+                }
+
+        results = []
+        for operation in operations:
+            target = targets[operation.target].get(operation.object_id)
+            if target is None:
+                results.append(None)
+                continue
+
+            model_states = states[operation.model]
+            exists = model_states.get(
+                target.pk, target.pk in existing[operation.model]
+            )
+            model_states[target.pk] = not exists
+            results.append(not exists)
+
+        deltas: dict[CounterKey, int] = defaultdict(int)
+        for operation in operations:
+            model = operation.model
+            if model not in states:
+                continue
+
+            toggled_targets = {
+                pk: targets[operation.target][pk]
+                for pk, should_exist in states.pop(model).items()
+                if should_exist != (pk in existing[model])
+            }
+            for reaction, sign in save_reactions(
+                user,
+                model,
+                operation.relation,
+                toggled_targets,
+                existing[model],
+            ):
+                for key, value in reaction.get_counter_deltas(sign).items():
+                    deltas[key] += value
+
+                statistics_relation = getattr(
+                    reaction, "statistics_relation", None
+                )
+                if statistics_relation and reaction.create_date:
+                    # Statistics rows are resolved (created if missing)
+                    # by their natural key when deltas are applied
+                    deltas[
+                        TutorialDailyStatistics.get_counter_key(
+                            reaction.tutorial_id,
+                            statistics_relation,
+                            to_default_local_date(reaction.create_date),
+                        )
+                    ] += sign
+
+        if write_behind_counters_enabled():
+            buffer_counter_deltas(deltas)
+        else:
+            apply_counter_deltas(deltas)
+
+        if deltas:
+            invalidate_reaction_states(user.pk)
+
+    return results
+
+
+def save_reactions(
+    user, model, relation: str, targets: dict, existing: dict
+) -> list[tuple]:
+    """Inserts and deletes model's reactions of targets (whose state
+    changed by operations).
+
+    Args:
+        user (User): Reacting user.
+        model (Type[AbstractScoreCoinModel]): Reaction model.
+        relation (str): Model's target relation field name.
+        targets (dict): Targets' pks to targets whose reaction should be
+            inserted (if not exists) or deleted (if exists).
+        existing (dict): Targets' pks to user's existing reactions.
+
+    Raises:
+        IntegrityError: When reactions are changed concurrently.
+
+    Returns:
+        list[tuple]: Inserted and deleted reactions with their signs
+            (1 for insert and -1 for delete).
+    """
+    inserted = [
+        model(user=user, **{relation: target})
+        for pk, target in targets.items()
+        if pk not in existing
+    ]
+    deleted = [existing[pk] for pk in targets if pk in existing]
+
+    if model.bulk_insert_if_not_exist(inserted) != len(inserted):
+        raise IntegrityError("Reactions are inserted concurrently.")
+
+    deleted_count, _ = model.objects.filter(
+        pk__in=[reaction.pk for reaction in deleted]
+    ).delete()
+    if deleted_count != len(deleted):
+        raise IntegrityError("Reactions are deleted concurrently.")
+
+    for reaction in deleted:
+        # Use locked target instead of fetching it again
+        target_pk = getattr(reaction, relation + "_id")
+        setattr(reaction, relation, targets[target_pk])
+
+    changes = [(reaction, 1) for reaction in inserted] + [
+        (reaction, -1) for reaction in deleted
+    ]
+
+    if model is TutorialLike and changes:
+        # Most liked tutorials carousel depends on likes
+        invalidate_home_carousels()
+
+    return changes
@@ -0,0 +1,371 @@
+""" Related tutorials index
+
+Related tutorials of every active and confirmed tutorial are precomputed
+in RelatedTutorial table, so tutorial page gets them by a single indexed
+lookup. A candidate's score is its overlap with the tutorial weighted
+by candidate's likes:
+
+    overlap = CATEGORY_WEIGHT * joint categories + TAG_WEIGHT * joint tags
+    score = overlap * (1 + log(1 + likes_count))
+
+Tutorial's categories include their parents (like previous live query).
+
+Candidates are found by an inverted index of categories/tags to their
+tutorials which only keeps most liked tutorials of each category/tag
+(candidates_per_feature). Thus, rebuilding a tutorial's related
+tutorials doesn't depend on total count of tutorials.
+
+Rebuilt tutorials are marked by Tutorial.related_indexed_at, so tutorial
+page can tell tutorials which aren't indexed yet from ones without any
+related tutorial.
+
+Index is updated when tutorials, their categories/tags or categories
+change. Lifecycle hooks and signals schedule updates which are applied
+when transaction commits and discarded if it's rolled back
+(schedule_related_tutorials_update).
+Likes only change scores, so they're applied by rebuild_related_tutorials
+command (e.g. periodically).
+"""
+import heapq
+import math
+from collections import defaultdict
+from typing import Iterable, Optional
+from constance import config
+from django.apps import apps
+from django.db import transaction
+from django.utils import timezone
+from learning.category_tree import CategoryTree, get_category_tree
+from learning.querysets import get_active_confirmed_filters
+
+CATEGORY_WEIGHT = 2.0
+TAG_WEIGHT = 1.0
+
+DEFAULT_CANDIDATES_PER_FEATURE = 200
+DEFAULT_BATCH_SIZE = 1000
+
+# Features are ("category", category_id) and ("tag", title) tuples
+Feature = tuple[str, object]
+
+
+def _get_model(name: str):
+    # Models import this module (for their hooks)
+    return apps.get_model("learning", name)
+
+
+def get_tutorials_features(
+    tutorial_ids: Iterable[int], tree: CategoryTree
+) -> dict[int, dict[Feature, float]]:
+    """Returns weighted features (active categories with their parents
+    and tags) of given tutorials.
+
+    Args:
+        tutorial_ids (Iterable[int]): Tutorials' ids.
+        tree (CategoryTree): Category tree snapshot.
+
+    Returns:
+        dict[int, dict[Feature, float]]: Tutorial ids to their features'
+            weights.
+    """
+    tutorial_categories = _get_model("Tutorial").categories.through
+    features = defaultdict(dict)
+
+    for tutorial_id, category_id in tutorial_categories.objects.filter(
+        tutorial_id__in=tutorial_ids, category__is_active=True
+    ).values_list("tutorial_id", "category_id"):
+        for feature_category_id in [category_id, *tree.ancestors[category_id]]:
+            features[tutorial_id][
+                ("category", feature_category_id)
+            ] = CATEGORY_WEIGHT
+
+    for tutorial_id, title in _get_model("TutorialTag").objects.filter(
+        tutorial_id__in=tutorial_ids
+    ).values_list("tutorial_id", "title"):
+        features[tutorial_id][("tag", title)] = TAG_WEIGHT
+
+    return features
+
+
+def get_candidates(
+    features: Optional[set[Feature]] = None,
+    candidates_per_feature: int = DEFAULT_CANDIDATES_PER_FEATURE,
+) -> tuple[dict[Feature, list[int]], dict[int, int]]:
+    """Builds inverted index of features to their most liked active and
+    confirmed tutorials.
+
+    Args:
+        features (Optional[set[Feature]], optional): Features to load.
+            Defaults to None (all features).
+        candidates_per_feature (int, optional): Max tutorials of each
+            feature. Defaults to DEFAULT_CANDIDATES_PER_FEATURE.
+
+    Returns:
+        tuple[dict[Feature, list[int]], dict[int, int]]: Features to
+            their tutorials' ids and tutorial ids to their likes count.
+    """
+    tutorial_model = _get_model("Tutorial")
+    active_confirmed = get_active_confirmed_filters("tutorial")
+
+    categories = tutorial_model.categories.through.objects.filter(
+        active_confirmed, category__is_active=True
+    )
+    tags = _get_model("TutorialTag").objects.filter(active_confirmed)
+
+    if features is not None:
+        categories = categories.filter(
+            category_id__in=[
+                value for kind, value in features if kind == "category"
+            ]
+        )
+        tags = tags.filter(
+            title__in=[value for kind, value in features if kind == "tag"]
+        )
+
+    candidates = defaultdict(dict)
+    likes = {}
+
+    for kind, rows in [
+        (
+            "category",
+            categories.order_by(
+                "category_id", "-tutorial__likes_count", "tutorial_id"
+            ).values_list(
+                "category_id", "tutorial_id", "tutorial__likes_count"
+            ),
+        ),
+        (
+            "tag",
+            tags.order_by(
+                "title", "-tutorial__likes_count", "tutorial_id"
+            ).values_list("title", "tutorial_id", "tutorial__likes_count"),
+        ),
+    ]:
+        for value, tutorial_id, likes_count in rows.iterator():
+            feature_candidates = candidates[(kind, value)]
+            if len(feature_candidates) < candidates_per_feature:
+                # dict keeps order and ignores duplicate tags
+                feature_candidates[tutorial_id] = None
+                likes[tutorial_id] = likes_count
+
+    return (
+        {feature: list(ids) for feature, ids in candidates.items()},
+        likes,
+    )
+
+
+def rank_related_tutorials(
+    tutorial_id: int,
+    features: dict[Feature, float],
+    candidates: dict[Feature, list[int]],
+    likes: dict[int, int],
+    count: int,
+) -> list[tuple[int, float]]:
+    """Returns top related tutorials of a tutorial.
+
+    Returns:
+        list[tuple[int, float]]: Related tutorials' ids and their scores
+            (descending).
+    """
+    overlaps = defaultdict(float)
+    for feature, weight in features.items():
+        for candidate_id in candidates.get(feature, ()):
+            overlaps[candidate_id] += weight
+
+    overlaps.pop(tutorial_id, None)
+
+    return heapq.nlargest(
+        count,
+        (
+            (candidate_id, overlap * (1 + math.log1p(likes[candidate_id])))
+            for candidate_id, overlap in overlaps.items()
+        ),
+        key=lambda item: (item[1], -item[0]),
+    )
+
+
+def rebuild_related_tutorials(
+    tutorial_ids: Optional[Iterable[int]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    candidates_per_feature: int = DEFAULT_CANDIDATES_PER_FEATURE,
+    count: Optional[int] = None,
+) -> int:
+    """Rebuilds related tutorials index of given tutorials batch by batch.
+
+    Args:
+        tutorial_ids (Optional[Iterable[int]], optional): Tutorials to
+            rebuild. Defaults to None (all tutorials).
+        batch_size (int, optional): Count of tutorials in each batch.
+            Defaults to DEFAULT_BATCH_SIZE.
+        candidates_per_feature (int, optional): Max candidates of each
+            category/tag. Defaults to DEFAULT_CANDIDATES_PER_FEATURE.
+        count (Optional[int], optional): Count of related tutorials to
+            keep for each tutorial. Defaults to
+            config.LEARNING_RECOMMENDATION_ITEMS_COUNT.
+
+    Returns:
+        int: Count of indexed related tutorials.
+    """
+    tutorial_model = _get_model("Tutorial")
+    related_model = _get_model("RelatedTutorial")
+    count = count or config.LEARNING_RECOMMENDATION_ITEMS_COUNT
+
+    rebuild_all = tutorial_ids is None
+    if rebuild_all:
+        related_model.objects.all().delete()
+        tutorial_ids = tutorial_model.objects.order_by("pk").values_list(
+            "pk", flat=True
+        )
+    tutorial_ids = list(dict.fromkeys(tutorial_ids))
+    if not tutorial_ids:
+        return 0
+
+    tree = get_category_tree()
+    if rebuild_all:
+        candidates, likes = get_candidates(
+            candidates_per_feature=candidates_per_feature
+        )
+
+    indexed_count = 0
+    for start in range(0, len(tutorial_ids), batch_size):
+        end = start + batch_size
+        batch_ids = set(
+            tutorial_model.objects.filter(
+                get_active_confirmed_filters(),
+                pk__in=tutorial_ids[start:end],
+            ).values_list("pk", flat=True)
+        )
+        features = get_tutorials_features(batch_ids, tree)
+
+        if not rebuild_all:
+            candidates, likes = get_candidates(
+                set().union(*features.values()), candidates_per_feature
+            )
+
+        related_tutorials = [
+            related_model(
+                tutorial_id=tutorial_id,
+                related_tutorial_id=related_id,
+                score=score,
+            )
+            for tutorial_id, tutorial_features in features.items()
+            for related_id, score in rank_related_tutorials(
+                tutorial_id, tutorial_features, candidates, likes, count
+            )
+        ]
+
+        with transaction.atomic():
+            if not rebuild_all:
+                # Inactive/unconfirmed ones' rows are deleted too
+                related_model.objects.filter(
+                    tutorial_id__in=tutorial_ids[start:end]
+                ).delete()
+            related_model.objects.bulk_create(related_tutorials)
+            tutorial_model.objects.filter(
+                pk__in=tutorial_ids[start:end]
+            ).update(related_indexed_at=timezone.now())
+
+        indexed_count += len(related_tutorials)
+
+    return indexed_count
+
+
+def get_neighbor_tutorial_ids(tutorial_ids: Iterable[int]) -> set[int]:
+    """Returns tutorials which are related to given tutorials or
+    given tutorials are related to them (by current index).
+    """
+    related_model = _get_model("RelatedTutorial")
+    tutorial_ids = list(tutorial_ids)
+
+    return set(
+        related_model.objects.filter(
+            tutorial_id__in=tutorial_ids
+        ).values_list("related_tutorial_id", flat=True)
+    ) | set(
+        related_model.objects.filter(
+            related_tutorial_id__in=tutorial_ids
+        ).values_list("tutorial_id", flat=True)
+    )
+
+
+def get_candidate_of_tutorial_ids(
+    tutorial_ids: Iterable[int], limit: int = DEFAULT_CANDIDATES_PER_FEATURE
+) -> set[int]:
+    """Returns tutorials which given tutorials can be their candidates
+    (tutorials of given tutorials' categories, their descendants and
+    tags). Only limit most liked ones of categories and tags are returned.
+    """
+    tutorial_categories = _get_model("Tutorial").categories.through
+    tag_model = _get_model("TutorialTag")
+    active_confirmed = get_active_confirmed_filters("tutorial")
+    tutorial_ids = list(tutorial_ids)
+
+    category_ids = set(
+        tutorial_categories.objects.filter(
+            tutorial_id__in=tutorial_ids, category__is_active=True
+        ).values_list("category_id", flat=True)
+    )
+    tree = get_category_tree()
+    subtree_ids = set().union(
+        *(tree.get_subtree_ids(category_id) for category_id in category_ids)
+    )
+
+    return set(
+        tutorial_categories.objects.filter(
+            active_confirmed, category_id__in=subtree_ids
+        )
+        .order_by("-tutorial__likes_count")
+        .values_list("tutorial_id", flat=True)[:limit]
+    ) | set(
+        tag_model.objects.filter(
+            active_confirmed,
+            title__in=tag_model.objects.filter(
+                tutorial_id__in=tutorial_ids
+            ).values("title"),
+        )
+        .order_by("-tutorial__likes_count")
+        .values_list("tutorial_id", flat=True)[:limit]
+    )
+
+
+def update_related_tutorials(tutorial_ids: Iterable[int]):
+    """Incrementally updates index after given tutorials change.
+
+    Given tutorials, their old and new neighbors and (most liked)
+    tutorials which have them as candidate are rebuilt, as changed
+    tutorials may enter or leave their related tutorials. Other ones
+    are updated by next full rebuild.
+
+    Args:
+        tutorial_ids (Iterable[int]): Changed tutorials' ids.
+    """
+    tutorial_ids = set(tutorial_ids)
+    if not tutorial_ids:
+        return
+
+    rebuilt_ids = tutorial_ids | get_neighbor_tutorial_ids(tutorial_ids)
+    rebuild_related_tutorials(rebuilt_ids)
+
+    rebuild_related_tutorials(
+        (
+            get_neighbor_tutorial_ids(tutorial_ids)
+            | get_candidate_of_tutorial_ids(tutorial_ids)
+        )
+        - rebuilt_ids
+    )
+
+
+def schedule_related_tutorials_update(tutorial_ids: Iterable[int]):
+    """Updates index after given tutorials change (see
+    update_related_tutorials) when current transaction commits
+    (immediately if there isn't any). Nothing is updated if the
+    transaction (or savepoint) is rolled back.
+
+    Args:
+        tutorial_ids (Iterable[int]): Changed tutorials' ids.
+    """
+    tutorial_ids = set(tutorial_ids)
+    if not tutorial_ids:
+        return
+
+    # Ids are kept by the callback only, so Django discards them with
+    # the callback when the transaction or savepoint is rolled back
+    transaction.on_commit(lambda: update_related_tutorials(tutorial_ids))
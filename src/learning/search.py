@@ -0,0 +1,241 @@
+""" Tutorial full-text search backends
+
+Every tutorial keeps a denormalized search document (title, slug,
+descriptions, active category names and tag titles) in its
+``search_document`` column. Documents and search queries are normalized
+by the same pipeline (see shared.text_normalization) in Python, so no
+normalization runs in SQL at query time. Documents are maintained by
+lifecycle hooks and indexed differently for each database vendor:
+
+    - PostgreSQL: GIN index on ``to_tsvector('simple', search_document)``
+      for word/prefix matches and a trigram GIN index for substring
+      matches (useful for Persian text without stemming support).
+    - SQLite: FTS5 virtual table (used by tests and local development).
+    - Other vendors: plain ``LIKE`` lookup on the search document.
+"""
+from html import unescape
+from typing import Iterable, Optional
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import BooleanField, FloatField, Q, QuerySet, Value
+from django.db.models.expressions import RawSQL
+from django.utils.html import strip_tags
+from shared.text_normalization import normalize_text, tokenize
+
+
+SEARCH_DOCUMENT_FIELD = "search_document"
+SQLITE_FTS_TABLE = "learning_tutorial_fts"
+
+
+def normalize_search_text(text: str) -> str:
+    """Converts text to searchable plain text.
+
+    Args:
+        text (str): Raw (possibly HTML) text.
+
+    Returns:
+        str: Normalized text without HTML tags and entities.
+    """
+    return normalize_text(unescape(strip_tags(text or "")))
+
+
+def tokenize_search_query(value: str) -> list[str]:
+    """Splits search query to its words.
+
+    Args:
+        value (str): Raw search query.
+
+    Returns:
+        list[str]: Normalized words of query.
+    """
+    return tokenize(unescape(strip_tags(value or "")))
+
+
+def build_search_document(
+    title: str,
+    slug: str,
+    short_description: str,
+    body: str,
+    categories: Iterable[str] = (),
+    tags: Iterable[str] = (),
+) -> str:
+    """Builds search document of a tutorial.
+
+    Returns:
+        str: Normalized text containing all searchable parts of tutorial.
+    """
+    parts = [title, slug, short_description, body, *categories, *tags]
+
+    return "\n".join(normalize_search_text(part) for part in parts if part)
+
+
+class BaseSearchBackend:
+    """Base search backend which searches using LIKE lookups.
+    It's used when database vendor doesn't have a specific backend.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def search(self, queryset: QuerySet, value: str) -> QuerySet:
+        """Filters queryset by search value and annotates search_rank.
+
+        Args:
+            queryset (QuerySet): Tutorials queryset.
+            value (str): Search query.
+
+        Returns:
+            QuerySet: Matched tutorials with search_rank.
+        """
+        query = " ".join(tokenize_search_query(value))
+        if not query:
+            return self._empty(queryset)
+
+        return queryset.filter(
+            **{f"{SEARCH_DOCUMENT_FIELD}__contains": query}
+        ).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    def index(self, documents: dict[int, str]) -> None:
+        """Updates external index of given documents (if backend has any).
+
+        Args:
+            documents (dict[int, str]): Tutorial ids to their documents.
+        """
+
+    def remove(self, tutorial_ids: Iterable[int]) -> None:
+        """Removes given tutorials from external index (if backend has any).
+
+        Args:
+            tutorial_ids (Iterable[int]): Tutorial ids to remove.
+        """
+
+    @staticmethod
+    def _empty(queryset: QuerySet) -> QuerySet:
+        return queryset.none().annotate(
+            search_rank=Value(0.0, output_field=FloatField())
+        )
+
+    def _document_column(self, queryset: QuerySet) -> str:
+        quote_name = self.connection.ops.quote_name
+        return "{}.{}".format(
+            quote_name(queryset.model._meta.db_table),
+            quote_name(SEARCH_DOCUMENT_FIELD),
+        )
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """Searches search documents using tsvector expression index.
+    Falls back to trigram indexed substring search for words which
+    are not matched by full-text search.
+    """
+
+    def search(self, queryset: QuerySet, value: str) -> QuerySet:
+        tokens = tokenize_search_query(value)
+        if not tokens:
+            return self._empty(queryset)
+
+        # Prefix match for every word (e.g. "django & orm:*")
+        ts_query = " & ".join(f"{token}:*" for token in tokens)
+        document = self._document_column(queryset)
+
+        matches_document = RawSQL(
+            f"to_tsvector('simple', {document}) "
+            "@@ to_tsquery('simple', %s)",
+            (ts_query,),
+            output_field=BooleanField(),
+        )
+
+        return queryset.filter(
+            Q(matches_document)
+            | Q(**{f"{SEARCH_DOCUMENT_FIELD}__contains": " ".join(tokens)})
+        ).annotate(
+            search_rank=RawSQL(
+                f"ts_rank(to_tsvector('simple', {document}), "
+                "to_tsquery('simple', %s))",
+                (ts_query,),
+                output_field=FloatField(),
+            )
+        )
+
+
+class SqliteSearchBackend(BaseSearchBackend):
+    """Searches search documents using FTS5 virtual table."""
+
+    def search(self, queryset: QuerySet, value: str) -> QuerySet:
+        tokens = tokenize_search_query(value)
+        if not tokens:
+            return self._empty(queryset)
+
+        # Prefix match for every word (e.g. '"django"* "orm"*')
+        match = " ".join(f'"{token}"*' for token in tokens)
+        quote_name = self.connection.ops.quote_name
+        pk_column = "{}.{}".format(
+            quote_name(queryset.model._meta.db_table),
+            quote_name(queryset.model._meta.pk.column),
+        )
+
+        return queryset.filter(
+            pk__in=RawSQL(
+                f"SELECT rowid FROM {SQLITE_FTS_TABLE} "
+                f"WHERE {SQLITE_FTS_TABLE} MATCH %s",
+                (match,),
+            )
+        ).annotate(
+            # bm25 returns lower values for better matches
+            search_rank=RawSQL(
+                f"SELECT -bm25({SQLITE_FTS_TABLE}) FROM {SQLITE_FTS_TABLE} "
+                f"WHERE {SQLITE_FTS_TABLE} MATCH %s "
+                f"AND rowid = {pk_column}",
+                (match,),
+                output_field=FloatField(),
+            )
+        )
+
+    def index(self, documents: dict[int, str]) -> None:
+        if not documents:
+            return
+
+        with self.connection.cursor() as cursor:
+            self._delete(cursor, documents.keys())
+            cursor.executemany(
+                f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, search_document) "
+                "VALUES (%s, %s)",
+                list(documents.items()),
+            )
+
+    def remove(self, tutorial_ids: Iterable[int]) -> None:
+        with self.connection.cursor() as cursor:
+            self._delete(cursor, tutorial_ids)
+
+    @staticmethod
+    def _delete(cursor, tutorial_ids: Iterable[int]):
+        tutorial_ids = list(tutorial_ids)
+        if not tutorial_ids:
+            return
+
+        placeholders = ", ".join(["%s"] * len(tutorial_ids))
+        cursor.execute(
+            f"DELETE FROM {SQLITE_FTS_TABLE} WHERE rowid IN ({placeholders})",
+            tutorial_ids,
+        )
+
+
+_BACKENDS = {
+    "postgresql": PostgresSearchBackend,
+    "sqlite": SqliteSearchBackend,
+}
+
+
+def get_search_backend(using: Optional[str] = None) -> BaseSearchBackend:
+    """Returns search backend of given database.
+
+    Args:
+        using (Optional[str], optional): Database alias.
+            Defaults to default database.
+
+    Returns:
+        BaseSearchBackend: Search backend suitable for database vendor.
+    """
+    connection = connections[using or DEFAULT_DB_ALIAS]
+
+    return _BACKENDS.get(connection.vendor, BaseSearchBackend)(connection)
@@ -0,0 +1,33 @@
+""" Signal receivers of learning app """
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+from learning.models import Tutorial
+from learning.recommendations import schedule_related_tutorials_update
+
+
+@receiver(m2m_changed, sender=Tutorial.categories.through)
+def update_search_documents_on_categories_change(
+    instance, action: str, reverse: bool, pk_set: set, **kwargs
+):
+    """Updates search documents and related tutorials index of tutorials
+    when their categories change.
+    (ManyToMany relations don't trigger lifecycle hooks)
+    """
+    if not reverse:
+        tutorial_ids = [instance.pk]
+    elif action == "pre_clear":
+        # Keep cleared tutorials to update them on post_clear
+        instance._cleared_tutorial_ids = list(
+            instance.tutorials.values_list("pk", flat=True)
+        )
+        return
+    elif action == "post_clear":
+        tutorial_ids = instance._cleared_tutorial_ids
+    else:
+        tutorial_ids = pk_set
+
+    if action in ("post_add", "post_remove", "post_clear"):
+        Tutorial.objects.filter(
+            pk__in=tutorial_ids
+        ).update_search_documents()
+        schedule_related_tutorials_update(tutorial_ids)
@@ -1,34 +1,48 @@
 """ Base template template-tags """
-
+from collections import defaultdict
 from django import template
-
-from learning.models import Category
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+from learning.caches import get_navbar_categories
+from learning.category_tree import get_category_tree
 
 
 register = template.Library()
 
 
-@register.inclusion_tag("shared/navbar_categories.html")
-def navbar_tutorial_categories():
-    """Navbar categories template-tag"""
-
-    categories = (
-        Category.objects.select_related("parent_category")
-        .order_by("parent_category")
-        .active_categories()
-    )
-    return {"categories": categories}
-
+def render_navbar_categories() -> str:
+    """Renders navbar categories from category tree snapshot.
 
-@register.filter
-def is_in_parents(category: Category, categories: list[Category]) -> bool:
-    """Template filter to know is a category a parent category or not
-
-    Args:
-        category (Category): Category that want to search it in parents
-        categories (list[Category]): Categories want to search in their parents
+    Active categories are grouped by their parents (main categories
+    first) and each one knows whether it's a parent of other active
+    categories or not.
 
     Returns:
-        bool: True if category is one of categories' parents and False if not
+        str: Rendered navbar categories.
     """
-    return any(filter(lambda cat: cat.parent_category == category, categories))
+    tree = get_category_tree()
+    categories = [node for node in tree.nodes.values() if node.is_active]
+    parent_ids = {category.parent_id for category in categories}
+
+    groups = defaultdict(list)
+    for category in categories:
+        groups[category.parent_id].append(
+            {"category": category, "is_parent": category.id in parent_ids}
+        )
+
+    category_groups = [
+        {"parent": tree.nodes.get(parent_id), "categories": groups[parent_id]}
+        # Main categories (parent_id=None) first
+        for parent_id in sorted(groups, key=lambda pk: (pk is not None, pk))
+    ]
+
+    return render_to_string(
+        "shared/navbar_categories.html",
+        {"category_groups": category_groups},
+    )
+
+
+@register.simple_tag
+def navbar_tutorial_categories():
+    """Navbar categories template-tag (cached per category tree version)"""
+    return mark_safe(get_navbar_categories(render_navbar_categories))
@@ -1,4 +1,5 @@
 from unittest.mock import MagicMock, patch
+from django.db.models import Sum
 from django.test import TestCase, RequestFactory
 from model_bakery import baker
 from shared.models import ConfirmStatusChoices
@@ -204,6 +205,25 @@ class TutorialCommentAdminActionsTest(TestCase):
         self.disprove_queryset()
         self.assertTrue(self.modeladmin.message_user.called)
 
+    def test_actions_update_tutorials_comments_count(self):
+        """Confirm/disprove actions should update comments' tutorials
+        active_confirmed_comments_count.
+        """
+        self.confirm_queryset()
+        self.assertEqual(
+            Tutorial.objects.aggregate(
+                count=Sum("active_confirmed_comments_count")
+            )["count"],
+            self.queryset.count(),
+        )
+
+        self.disprove_queryset()
+        self.assertFalse(
+            Tutorial.objects.filter(
+                active_confirmed_comments_count__gt=0
+            ).exists()
+        )
+
     def test_disprove_action_call_notifiers(self):
         """Disprove action should only call confirm_disprove notifier."""
         self.disprove_queryset()
@@ -0,0 +1,69 @@
+from django.test import TestCase
+from model_bakery import baker
+from learning.models import Category
+from learning.category_tree import (
+    CategoryNode,
+    CategoryTree,
+    get_category_tree,
+)
+
+
+class CategoryTreeTest(TestCase):
+    def setUp(self):
+        # 1 -> 2 -> 3, 4
+        self.tree = CategoryTree(
+            [
+                CategoryNode(1, None, "root", "root", True),
+                CategoryNode(2, 1, "child", "child", True),
+                CategoryNode(3, 2, "grandchild", "grandchild", True),
+                CategoryNode(4, None, "other", "other", False),
+            ]
+        )
+
+    def test_ancestors(self):
+        """ancestors should contain parent chain (nearest first)."""
+        self.assertEqual(self.tree.ancestors[3], (2, 1))
+        self.assertEqual(self.tree.ancestors[1], ())
+        self.assertTrue(self.tree.is_ancestor(1, 3))
+        self.assertFalse(self.tree.is_ancestor(3, 1))
+
+    def test_subtree_ids(self):
+        """get_subtree_ids should return category and its descendants."""
+        self.assertEqual(self.tree.get_subtree_ids(1), {1, 2, 3})
+        self.assertEqual(self.tree.get_subtree_ids(4), {4})
+        self.assertEqual(self.tree.get_subtree_ids(5), set())
+        self.assertEqual(self.tree.get_id("child"), 2)
+
+    def test_cycle(self):
+        """Invalid cyclic parents shouldn't cause infinite loop."""
+        tree = CategoryTree(
+            [
+                CategoryNode(1, 2, "first", "first", True),
+                CategoryNode(2, 1, "second", "second", True),
+            ]
+        )
+
+        self.assertEqual(tree.ancestors[1], (2,))
+
+
+class CategoryTreeSnapshotTest(TestCase):
+    def test_snapshot_reused(self):
+        """Tree should be loaded once until categories change."""
+        baker.make_recipe("learning.active_category")
+        get_category_tree()
+
+        with self.assertNumQueries(0):
+            get_category_tree()
+
+    def test_invalidated_on_change(self):
+        """Saving or deleting categories should reload the tree."""
+        parent: Category = baker.make_recipe("learning.active_category")
+        child: Category = baker.make_recipe("learning.active_category")
+        self.assertEqual(get_category_tree().ancestors[child.pk], ())
+
+        child.parent_category = parent
+        child.save()
+        self.assertEqual(get_category_tree().ancestors[child.pk], (parent.pk,))
+
+        parent.delete()
+        self.assertNotIn(parent.pk, get_category_tree().nodes)
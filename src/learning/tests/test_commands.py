@@ -0,0 +1,156 @@
+import datetime
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from model_bakery import baker
+from learning.models import (
+    Tutorial,
+    TutorialComment,
+    TutorialLike,
+    TutorialView,
+    TutorialCommentDownVote,
+    TutorialDailyStatistics,
+    TutorialStatisticsRelationChoices,
+    RelatedTutorial,
+)
+
+
+class ReconcileCommentsCountCommandTest(TestCase):
+    def setUp(self):
+        self.tutorial: Tutorial = baker.make_recipe("learning.tutorial")
+        baker.make_recipe(
+            "learning.confirmed_tutorial_comment",
+            is_active=True,
+            tutorial=self.tutorial,
+            _quantity=2,
+        )
+        Tutorial.objects.update(active_confirmed_comments_count=0)
+
+    def test_reconcile(self):
+        """Should fix drifted comments counts."""
+        call_command("reconcile_comments_count", stdout=StringIO())
+        self.tutorial.refresh_from_db()
+
+        self.assertEqual(self.tutorial.active_confirmed_comments_count, 2)
+
+    def test_dry_run(self):
+        """Should not update comments counts with --dry-run."""
+        out = StringIO()
+        call_command("reconcile_comments_count", "--dry-run", stdout=out)
+        self.tutorial.refresh_from_db()
+
+        self.assertEqual(self.tutorial.active_confirmed_comments_count, 0)
+        self.assertIn("1 drifted", out.getvalue())
+
+
+class ReconcileCountersCommandTest(TestCase):
+    def test_reconcile(self):
+        """Should recalculate counters, scores and coins from relations."""
+        author = baker.make(get_user_model())
+        tutorial: Tutorial = baker.make_recipe(
+            "learning.tutorial", author=author
+        )
+        comment: TutorialComment = baker.make_recipe(
+            "learning.tutorial_comment", tutorial=tutorial, user=author
+        )
+        likes = baker.make(TutorialLike, tutorial=tutorial, _quantity=2)
+        down_vote = baker.make(TutorialCommentDownVote, comment=comment)
+
+        Tutorial.objects.update(likes_count=10)
+        TutorialComment.objects.update(down_votes_count=10)
+        get_user_model().objects.update(scores=0, coins=0)
+
+        call_command("reconcile_counters", "--batch-size=1", stdout=StringIO())
+        tutorial.refresh_from_db()
+        comment.refresh_from_db()
+        author.refresh_from_db()
+
+        self.assertEqual(tutorial.likes_count, 2)
+        self.assertEqual(tutorial.user_views_count, 0)
+        self.assertEqual(comment.down_votes_count, 1)
+        self.assertEqual(
+            author.scores,
+            sum(like.score for like in likes) + down_vote.score,
+        )
+        self.assertEqual(
+            author.coins, sum(like.coin for like in likes) + down_vote.coin
+        )
+
+
+class RebuildTutorialStatisticsCommandTest(TestCase):
+    def setUp(self):
+        self.tutorial: Tutorial = baker.make_recipe("learning.tutorial")
+        self.day = datetime.date(2021, 7, 14)
+
+        views = baker.make(TutorialView, tutorial=self.tutorial, _quantity=3)
+        baker.make(TutorialLike, tutorial=self.tutorial)
+
+        # Move views to another day, statistics rows won't change
+        TutorialView.objects.filter(pk__in=[view.pk for view in views]).update(
+            create_date=timezone.make_aware(
+                datetime.datetime(2021, 7, 14),
+                timezone.get_default_timezone(),
+            )
+        )
+
+    def test_rebuild(self):
+        """Should rebuild daily statistics from relation objects."""
+        call_command("rebuild_tutorial_statistics", stdout=StringIO())
+
+        self.assertEqual(
+            set(
+                TutorialDailyStatistics.objects.values_list(
+                    "relation", "date", "count"
+                )
+            ),
+            {
+                (TutorialStatisticsRelationChoices.VIEW, self.day, 3),
+                (
+                    TutorialStatisticsRelationChoices.LIKE,
+                    timezone.localdate(
+                        timezone=timezone.get_default_timezone()
+                    ),
+                    1,
+                ),
+            },
+        )
+
+
+class RebuildRelatedTutorialsCommandTest(TestCase):
+    def test_rebuild(self):
+        """Should rebuild related tutorials index of all tutorials."""
+        category = baker.make_recipe("learning.active_category")
+        tutorials = baker.make_recipe(
+            "learning.confirmed_tutorial",
+            categories=[category],
+            _quantity=3,
+        )
+        RelatedTutorial.objects.all().delete()
+
+        out = StringIO()
+        call_command("rebuild_related_tutorials", stdout=out)
+
+        self.assertEqual(
+            RelatedTutorial.objects.filter(tutorial=tutorials[0]).count(), 2
+        )
+        self.assertIn("6 related tutorials indexed", out.getvalue())
+
+
+class BenchmarkCommentTreeCommandTest(TestCase):
+    def test_benchmark(self):
+        """benchmark_comment_tree should report timings and not keep its
+        tutorials and comments.
+        """
+        out = StringIO()
+        call_command(
+            "benchmark_comment_tree",
+            "--comments=50",
+            "--legacy-comments=20",
+            stdout=out,
+        )
+
+        self.assertIn("comment tree", out.getvalue())
+        self.assertFalse(Tutorial.objects.exists())
+        self.assertFalse(TutorialComment.objects.exists())
@@ -0,0 +1,135 @@
+from datetime import timedelta
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from model_bakery import baker
+from learning.comment_tree import build_comment_tree, get_comment_tree
+
+
+def make_row(pk, parent_id=None, allow_reply=True, user_id=1) -> tuple:
+    return (
+        pk,
+        parent_id,
+        f"Comment {pk}",
+        "Body",
+        0,
+        0,
+        0,
+        allow_reply,
+        timezone.now(),
+        user_id,
+        "First",
+        "Last",
+        "",
+    )
+
+
+class BuildCommentTreeTest(TestCase):
+    def test_threads(self):
+        """Replies should be nested under their parents in rows' order."""
+        tree = build_comment_tree(
+            [
+                make_row(5, 1),
+                make_row(4, 2),
+                make_row(3),
+                make_row(2, 1),
+                make_row(1),
+            ]
+        )
+
+        self.assertEqual([node.pk for node in tree.threads], [3, 1])
+        first_thread = tree.threads[1]
+        self.assertEqual([node.pk for node in first_thread.replies], [5, 2])
+        self.assertEqual(
+            [node.pk for node in first_thread.replies[1].replies], [4]
+        )
+        self.assertEqual(tree.count, 5)
+
+    def test_hidden_replies(self):
+        """Replies of hidden comments and comments which don't allow
+        reply shouldn't be shown (or counted).
+        """
+        tree = build_comment_tree(
+            [
+                # Parent (10) isn't active and confirmed
+                make_row(4, 10),
+                make_row(3, 4),
+                make_row(2, 1),
+                make_row(1, allow_reply=False),
+            ]
+        )
+
+        self.assertEqual([node.pk for node in tree.threads], [1])
+        self.assertEqual(tree.threads[0].replies, [])
+        self.assertEqual(tree.count, 1)
+
+    def test_cycle(self):
+        """Cycles made by invalid data shouldn't be shown."""
+        tree = build_comment_tree([make_row(2, 1), make_row(1, 2)])
+
+        self.assertEqual(tree.threads, [])
+        self.assertEqual(tree.count, 0)
+
+    def test_shared_users(self):
+        """Comments of a user should share the same user object."""
+        tree = build_comment_tree([make_row(2), make_row(1)])
+        self.assertIs(tree.threads[0].user, tree.threads[1].user)
+
+    def test_paginate(self):
+        """paginate should paginate top-level threads."""
+        tree = build_comment_tree(
+            [make_row(pk) for pk in range(5, 0, -1)] + [make_row(6, 1)]
+        )
+
+        page = tree.paginate(3, 2)
+        self.assertEqual([node.pk for node in page], [1])
+        self.assertEqual(page.paginator.num_pages, 3)
+        # Invalid page numbers return first page
+        self.assertEqual(tree.paginate("invalid", 2).number, 1)
+
+
+class GetCommentTreeTest(TestCase):
+    def test_active_confirmed_comments(self):
+        """get_comment_tree should fetch tutorial's active and confirmed
+        comments (newest first) by a single query.
+        """
+        tutorial = baker.make_recipe("learning.confirmed_tutorial")
+        now = timezone.now()
+        parent = baker.make_recipe(
+            "learning.confirmed_tutorial_comment",
+            tutorial=tutorial,
+            allow_reply=True,
+            create_date=now - timedelta(hours=2),
+        )
+        reply = baker.make_recipe(
+            "learning.confirmed_tutorial_comment",
+            tutorial=tutorial,
+            parent_comment=parent,
+            create_date=now - timedelta(hours=1),
+        )
+        latest = baker.make_recipe(
+            "learning.confirmed_tutorial_comment",
+            tutorial=tutorial,
+            create_date=now,
+        )
+        baker.make_recipe(
+            "learning.waiting_for_confirm_tutorial_comment",
+            tutorial=tutorial,
+            parent_comment=parent,
+        )
+        # Other tutorial's comment
+        baker.make_recipe("learning.confirmed_tutorial_comment")
+
+        with CaptureQueriesContext(connection) as captured:
+            tree = get_comment_tree(tutorial)
+
+        self.assertEqual(len(captured), 1)
+        self.assertEqual(
+            [node.pk for node in tree.threads], [latest.pk, parent.pk]
+        )
+        self.assertEqual(
+            [node.pk for node in tree.threads[1].replies], [reply.pk]
+        )
+        self.assertEqual(tree.threads[1].user.pk, parent.user_id)
+        self.assertEqual(tree.count, 3)
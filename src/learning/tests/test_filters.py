@@ -57,6 +57,37 @@ class TutorialArchiveFilterSetTest(TestCase):
 
         self.assertEqual(cat_tutorials, list(qs))
 
+    def test_category_filter_subcategories(self):
+        """category filter should include tutorials of subcategories
+        (once, even with multiple categories of the subtree).
+        """
+        parent: Category = baker.make_recipe("learning.active_category")
+        child: Category = baker.make_recipe(
+            "learning.active_category", parent_category=parent
+        )
+        grandchild: Category = baker.make_recipe(
+            "learning.active_category", parent_category=child
+        )
+        tutorials: list[Tutorial] = [
+            baker.make_recipe("learning.tutorial", categories=[parent]),
+            baker.make_recipe(
+                "learning.tutorial", categories=[child, grandchild]
+            ),
+            baker.make_recipe("learning.tutorial", categories=[grandchild]),
+        ]
+
+        parent_qs = self._get_filterset(category=parent.slug).qs.order_by()
+        child_qs = self._get_filterset(category=child.slug).qs.order_by()
+
+        self.assertEqual(list(parent_qs), tutorials)
+        self.assertEqual(list(child_qs), tutorials[1:])
+
+    def test_category_filter_not_found(self):
+        """Unknown category should filter all tutorials out."""
+        qs = self._get_filterset(category="not-found").qs
+
+        self.assertFalse(qs.exists())
+
     def test_order_by_filter(self):
         """order_by filter should order tutorials by given ordering."""
         order_choices = self._get_ordering_choices()
@@ -0,0 +1,159 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import TestCase
+from shared.models import ConfirmStatusChoices
+from shared.pagination import get_keyset_ordering
+from learning.models import Tutorial, TutorialComment
+
+User = get_user_model()
+
+TUTORIALS_COUNT = 2000
+COMMENTS_COUNT = 4000
+
+
+class QueryPlanTest(TestCase):
+    """Key queries should use composite/partial indexes instead of
+    scanning and sorting the whole table.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.bulk_create(
+            [
+                User(username=f"user{index}", email=f"user{index}@test.com")
+                for index in range(20)
+            ]
+        )
+        # Not all databases set pk of bulk created objects
+        users = list(User.objects.order_by("pk"))
+
+        # Bulk create skips lifecycle hooks which aren't needed here
+        Tutorial.objects.bulk_create(
+            [
+                Tutorial(
+                    title=f"tutorial{index}",
+                    slug=f"tutorial{index}",
+                    short_description="-",
+                    body="-",
+                    author=users[index % len(users)],
+                    confirm_status=index % 3,
+                    is_active=index % 5 != 0,
+                    likes_count=index % 17,
+                    user_views_count=index % 13,
+                )
+                for index in range(TUTORIALS_COUNT)
+            ]
+        )
+        cls.tutorials = list(Tutorial.objects.order_by("pk"))
+
+        TutorialComment.objects.bulk_create(
+            [
+                TutorialComment(
+                    title="-",
+                    body="-",
+                    user=users[index % len(users)],
+                    tutorial=cls.tutorials[index % len(cls.tutorials)],
+                    confirm_status=index % 3,
+                    is_active=index % 5 != 0,
+                )
+                for index in range(COMMENTS_COUNT)
+            ]
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def setUp(self):
+        self.user = User.objects.get(username="user1")
+
+        if connection.vendor == "postgresql":
+            # Tiny test tables are cheaper to scan sequentially. SET LOCAL
+            # is reverted when test's transaction is rolled back, so it
+            # doesn't leak to other tests.
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def assertUsesIndex(self, queryset: QuerySet, index_name: str):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+
+    def active_confirmed_tutorials(self) -> QuerySet:
+        return Tutorial.objects.active_and_confirmed_tutorials()
+
+    def test_latest_tutorials(self):
+        """Latest tutorials (home carousel and archive's default ordering)
+        should use active/confirmed create date index.
+        """
+        self.assertUsesIndex(
+            self.active_confirmed_tutorials().order_by("-create_date")[:10],
+            "tutorial_confirmed_date_idx",
+        )
+
+    def test_most_liked_tutorials(self):
+        """Most liked tutorials should use active/confirmed likes index."""
+        self.assertUsesIndex(
+            self.active_confirmed_tutorials().order_by("-likes_count")[:10],
+            "tutorial_confirmed_likes_idx",
+        )
+
+    def test_archive_keyset_orderings(self):
+        """Archive's keyset orderings should use their indexes."""
+        for field_name, index_name in [
+            ("create_date", "tutorial_confirmed_date_idx"),
+            ("likes_count", "tutorial_confirmed_likes_idx"),
+            ("user_views_count", "tutorial_confirmed_views_idx"),
+        ]:
+            for ordering in [field_name, "-" + field_name]:
+                with self.subTest(ordering=ordering):
+                    self.assertUsesIndex(
+                        self.active_confirmed_tutorials().order_by(
+                            *get_keyset_ordering([ordering])
+                        )[:10],
+                        index_name,
+                    )
+
+    def test_author_tutorials(self):
+        """Author's tutorials should use author and create date index."""
+        self.assertUsesIndex(
+            Tutorial.objects.filter(author=self.user).order_by(
+                "-create_date"
+            )[:10],
+            "tutorial_author_date_idx",
+        )
+
+    def test_tutorial_comments(self):
+        """Tutorial's comments should use active/confirmed comments
+        index.
+        """
+        self.assertUsesIndex(
+            TutorialComment.objects.active_and_confirmed_comments().filter(
+                tutorial=self.tutorials[1]
+            ),
+            "comment_confirmed_tutorial_idx",
+        )
+
+    def test_user_comments(self):
+        """User's comments should use user and create date index."""
+        self.assertUsesIndex(
+            TutorialComment.objects.filter(user=self.user).order_by(
+                "-create_date"
+            ),
+            "comment_user_date_idx",
+        )
+
+    def test_partial_index_condition(self):
+        """Partial indexes should only be used for active and confirmed
+        tutorials.
+        """
+        if not connection.features.supports_partial_indexes:
+            self.skipTest("Database doesn't support partial indexes.")
+
+        plan = (
+            Tutorial.objects.filter(
+                confirm_status=ConfirmStatusChoices.WAITING_FOR_CONFIRM
+            )
+            .order_by("-likes_count")[:10]
+            .explain()
+        )
+        self.assertNotIn("tutorial_confirmed_likes_idx", plan)
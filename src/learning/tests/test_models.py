@@ -1,10 +1,15 @@
 import random
 from copy import deepcopy
-from django.test import TestCase
+from datetime import date, datetime
+from unittest import mock
+from django.db import DatabaseError, transaction
+from django.test import TestCase, override_settings
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from model_bakery import baker
 from shared.models import ConfirmStatusChoices
+from shared.counters import LocalCounterBuffer, flush_counters
 from learning.models.tutorial_user_relation_models import (
     AbstractTutorialScoreCoinModel,
 )
@@ -18,9 +23,12 @@ from learning.models import (
     TutorialLike,
     TutorialUpVote,
     TutorialDownVote,
+    TutorialView,
     TutorialCommentLike,
     TutorialCommentUpVote,
     TutorialCommentDownVote,
+    TutorialDailyStatistics,
+    TutorialStatisticsRelationChoices,
 )
 
 
@@ -137,6 +145,71 @@ class TutorialCommentTest(TestCase):
         )
 
 
+class TutorialCommentsCountTest(TestCase):
+    def setUp(self):
+        self.tutorial: Tutorial = baker.make_recipe("learning.tutorial")
+
+    def _make_comment(self, **kwargs) -> TutorialComment:
+        return baker.make_recipe(
+            "learning.confirmed_tutorial_comment",
+            tutorial=self.tutorial,
+            **{"is_active": True, **kwargs},
+        )
+
+    def _get_comments_count(self) -> int:
+        self.tutorial.refresh_from_db()
+        return self.tutorial.active_confirmed_comments_count
+
+    def test_increase_on_create(self):
+        """Creating active and confirmed comments should increase
+        tutorial's active_confirmed_comments_count.
+        """
+        self._make_comment(_quantity=2)
+        self._make_comment(is_active=False)
+
+        self.assertEqual(self._get_comments_count(), 2)
+
+    def test_update_on_status_change(self):
+        """Confirming/disproving/deactivating comments should update
+        tutorial's active_confirmed_comments_count.
+        """
+        comment = self._make_comment(
+            confirm_status=ConfirmStatusChoices.WAITING_FOR_CONFIRM
+        )
+        self.assertEqual(self._get_comments_count(), 0)
+
+        comment.confirm_status = ConfirmStatusChoices.CONFIRMED
+        comment.save()
+        self.assertEqual(self._get_comments_count(), 1)
+
+        comment.is_active = False
+        comment.save()
+        self.assertEqual(self._get_comments_count(), 0)
+
+    def test_update_on_tutorial_change(self):
+        """Moving comment to another tutorial should update both
+        tutorials' active_confirmed_comments_count.
+        """
+        comment = self._make_comment()
+        new_tutorial: Tutorial = baker.make_recipe("learning.tutorial")
+
+        comment.tutorial = new_tutorial
+        comment.save()
+        new_tutorial.refresh_from_db()
+
+        self.assertEqual(self._get_comments_count(), 0)
+        self.assertEqual(new_tutorial.active_confirmed_comments_count, 1)
+
+    def test_decrease_on_delete(self):
+        """Deleting active and confirmed comments should decrease
+        tutorial's active_confirmed_comments_count.
+        """
+        comment = self._make_comment()
+        comment.delete()
+
+        self.assertEqual(self._get_comments_count(), 0)
+
+
 class TutorialUserScoreCoinRelationsTest(TestCase):
     @classmethod
     def setUpClass(cls):
@@ -226,6 +299,91 @@ class TutorialUserScoreCoinRelationsTest(TestCase):
         self.assertEqual(new_count, old_count - 1)
 
 
+class InsertIfNotExistsTest(TestCase):
+    def setUp(self):
+        self.author: User = baker.make(User)
+        self.user: User = baker.make(User)
+        self.tutorial: Tutorial = baker.make_recipe(
+            "learning.tutorial", author=self.author
+        )
+
+    def test_insert_once(self):
+        """Should insert object and run its hooks only if it doesn't
+        exist.
+        """
+        first_view = TutorialView(user=self.user, tutorial=self.tutorial)
+        second_view = TutorialView(user=self.user, tutorial=self.tutorial)
+
+        self.assertTrue(first_view.insert_if_not_exists())
+        self.assertFalse(second_view.insert_if_not_exists())
+
+        self.tutorial.refresh_from_db()
+        self.author.refresh_from_db()
+
+        self.assertEqual(
+            TutorialView.objects.filter(
+                user=self.user, tutorial=self.tutorial
+            ).count(),
+            1,
+        )
+        self.assertEqual(self.tutorial.user_views_count, 1)
+        self.assertEqual(self.author.scores, first_view.score)
+        self.assertEqual(self.author.coins, first_view.coin)
+
+
+class ToggleTest(TestCase):
+    def setUp(self):
+        self.author: User = baker.make(User)
+        self.user: User = baker.make(User)
+        self.tutorial: Tutorial = baker.make_recipe(
+            "learning.tutorial", author=self.author
+        )
+
+    def test_toggle(self):
+        """toggle should insert object if it doesn't exist, otherwise
+        delete it and update counters once per actual change.
+        """
+        self.assertTrue(
+            TutorialLike.toggle(user=self.user, tutorial=self.tutorial)
+        )
+        like = TutorialLike.objects.get(user=self.user, tutorial=self.tutorial)
+
+        self.tutorial.refresh_from_db()
+        self.author.refresh_from_db()
+        self.assertEqual(self.tutorial.likes_count, 1)
+        self.assertEqual(self.author.scores, like.score)
+
+        self.assertFalse(
+            TutorialLike.toggle(user=self.user, tutorial=self.tutorial)
+        )
+        self.assertFalse(TutorialLike.objects.exists())
+
+        self.tutorial.refresh_from_db()
+        self.author.refresh_from_db()
+        self.assertEqual(self.tutorial.likes_count, 0)
+        self.assertEqual(self.author.scores, 0)
+        self.assertEqual(self.author.coins, 0)
+
+    def test_delete_if_exists(self):
+        """delete_if_exists should return deleted object (with its
+        fields) or None if it doesn't exist.
+        """
+        like = baker.make(TutorialLike, user=self.user, tutorial=self.tutorial)
+
+        deleted = TutorialLike.delete_if_exists(
+            user=self.user, tutorial=self.tutorial
+        )
+        self.assertEqual(deleted.pk, like.pk)
+        self.assertEqual(deleted.score, like.score)
+        self.assertEqual(deleted.create_date, like.create_date)
+
+        self.assertIsNone(
+            TutorialLike.delete_if_exists(
+                user=self.user, tutorial=self.tutorial
+            )
+        )
+
+
 class TutorialCommentUserScoreCoinRelationsTest(TestCase):
     @classmethod
     def setUpClass(cls):
@@ -317,3 +475,156 @@ class TutorialCommentUserScoreCoinRelationsTest(TestCase):
         new_count = getattr(self.comment, count_field)
 
         self.assertEqual(new_count, old_count - 1)
+
+
+class TutorialDailyStatisticsTest(TestCase):
+    def setUp(self):
+        self.tutorial: Tutorial = baker.make_recipe("learning.tutorial")
+
+    def get_count(self, relation: str) -> int:
+        return TutorialDailyStatistics.objects.get(
+            tutorial=self.tutorial,
+            relation=relation,
+            date=timezone.localdate(timezone=timezone.get_default_timezone()),
+        ).count
+
+    def test_create_delete(self):
+        """Relation objects should increase/decrease their creation
+        day's statistics count.
+        """
+        likes = baker.make(TutorialLike, tutorial=self.tutorial, _quantity=3)
+        baker.make(TutorialDownVote, tutorial=self.tutorial)
+        likes[0].delete()
+
+        self.assertEqual(
+            self.get_count(TutorialStatisticsRelationChoices.LIKE), 2
+        )
+        self.assertEqual(
+            self.get_count(TutorialStatisticsRelationChoices.DOWN_VOTE), 1
+        )
+
+    @override_settings(WRITE_BEHIND_COUNTERS=True)
+    def test_write_behind(self):
+        """Statistics counts should be buffered when write-behind counters
+        are enabled.
+        """
+        buffer = LocalCounterBuffer()
+        with mock.patch("shared.counters._buffer", buffer):
+            with self.captureOnCommitCallbacks(execute=True):
+                baker.make(
+                    TutorialUpVote, tutorial=self.tutorial, _quantity=2
+                )
+
+            # Rows are created by flush, not by reactions
+            self.assertFalse(TutorialDailyStatistics.objects.exists())
+
+            flush_counters(buffer)
+
+        self.assertEqual(
+            self.get_count(TutorialStatisticsRelationChoices.UP_VOTE), 2
+        )
+
+    @override_settings(WRITE_BEHIND_COUNTERS=True)
+    def test_write_behind_deleted_tutorial(self):
+        """Buffered statistics of deleted tutorials should be dropped."""
+        buffer = LocalCounterBuffer()
+        with mock.patch("shared.counters._buffer", buffer):
+            with self.captureOnCommitCallbacks(execute=True):
+                baker.make(TutorialLike, tutorial=self.tutorial)
+            self.tutorial.delete()
+
+            flush_counters(buffer)
+
+        self.assertFalse(TutorialDailyStatistics.objects.exists())
+
+    def test_default_timezone_day(self):
+        """Objects should be counted in their creation day in default
+        timezone regardless of current timezone.
+        """
+        create_date = timezone.make_aware(
+            datetime(2021, 6, 1, 22), timezone.utc
+        )
+        # It's 2 June in Tehran (create_date is auto_now_add)
+        with timezone.override("Asia/Tehran"), mock.patch(
+            "django.utils.timezone.now", return_value=create_date
+        ):
+            baker.make(TutorialLike, tutorial=self.tutorial)
+
+        self.assertTrue(
+            TutorialDailyStatistics.objects.filter(
+                tutorial=self.tutorial,
+                relation=TutorialStatisticsRelationChoices.LIKE,
+                date=date(2021, 6, 1),
+                count=1,
+            ).exists()
+        )
+
+
+@override_settings(WRITE_BEHIND_COUNTERS=True)
+class WriteBehindCountersTest(TestCase):
+    def setUp(self):
+        self.buffer = LocalCounterBuffer()
+        patcher = mock.patch("shared.counters._buffer", self.buffer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.author: User = baker.make(User)
+        self.tutorial: Tutorial = baker.make_recipe(
+            "learning.tutorial", author=self.author
+        )
+
+    def test_tutorial_relation_buffered(self):
+        """Tutorial relations should change counters only after flush."""
+        with self.captureOnCommitCallbacks(execute=True):
+            like: TutorialLike = baker.make(
+                TutorialLike, tutorial=self.tutorial
+            )
+            baker.make(TutorialLike, tutorial=self.tutorial)
+            like.delete()
+
+        self.tutorial.refresh_from_db()
+        self.assertEqual(self.tutorial.likes_count, 0)
+
+        flush_counters(self.buffer)
+        self.tutorial.refresh_from_db()
+        self.author.refresh_from_db()
+
+        self.assertEqual(self.tutorial.likes_count, 1)
+        self.assertEqual(self.author.scores, like.score)
+        self.assertEqual(self.author.coins, like.coin)
+
+    def test_comment_relation_buffered(self):
+        """Comment relations should change counters only after flush."""
+        comment: TutorialComment = baker.make_recipe(
+            "learning.tutorial_comment", user=self.author
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            up_vote: TutorialCommentUpVote = baker.make(
+                TutorialCommentUpVote, comment=comment
+            )
+
+        comment.refresh_from_db()
+        self.assertEqual(comment.up_votes_count, 0)
+
+        flush_counters(self.buffer)
+        comment.refresh_from_db()
+        self.author.refresh_from_db()
+
+        self.assertEqual(comment.up_votes_count, 1)
+        self.assertEqual(self.author.scores, up_vote.score)
+
+    def test_rolled_back_relation_not_buffered(self):
+        """Counter changes of rolled back relations shouldn't be buffered."""
+        comment: TutorialComment = baker.make_recipe(
+            "learning.tutorial_comment", user=self.author
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    baker.make(TutorialCommentUpVote, comment=comment)
+                    raise DatabaseError()
+            except DatabaseError:
+                pass
+
+        self.assertEqual(self.buffer.pop_all(), {})
@@ -0,0 +1,161 @@
+from datetime import datetime
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+from shared.models import ConfirmStatusChoices, QueuedEmail
+from learning import moderation
+from learning.admin import actions
+from learning.models import Tutorial, TutorialComment
+
+
+def _make_tutorials(quantity: int) -> None:
+    author = baker.make(get_user_model())
+    Tutorial.objects.bulk_create(
+        [
+            Tutorial(
+                title=f"tutorial {number}",
+                slug=f"tutorial-{number}",
+                # Empty BleachFields are not cleaned (faster inserts)
+                short_description="",
+                body="",
+                author=author,
+                is_active=True,
+                confirm_status=ConfirmStatusChoices.WAITING_FOR_CONFIRM,
+            )
+            for number in range(quantity)
+        ]
+    )
+
+
+class UpdateReturningTest(TestCase):
+    def setUp(self):
+        _make_tutorials(10)
+
+    def update(self, **kwargs) -> list[Tutorial]:
+        return moderation.update_returning(
+            Tutorial.objects.all(),
+            {"confirm_status": ConfirmStatusChoices.CONFIRMED},
+            **kwargs,
+        )
+
+    def test_return_updated_objects(self):
+        """Should update rows and return them with converted values."""
+        tutorials = self.update()
+
+        self.assertEqual(len(tutorials), 10)
+        self.assertTrue(
+            all(
+                tutorial.confirm_status == ConfirmStatusChoices.CONFIRMED
+                and isinstance(tutorial.create_date, datetime)
+                for tutorial in tutorials
+            )
+        )
+        self.assertEqual(
+            tutorials, list(Tutorial.objects.order_by("pk"))
+        )
+        self.assertFalse(
+            Tutorial.objects.exclude(
+                confirm_status=ConfirmStatusChoices.CONFIRMED
+            ).exists()
+        )
+
+    def test_single_query_per_chunk(self):
+        """Should update and fetch each chunk by one query."""
+        if not moderation.supports_update_returning(connection):
+            self.skipTest("Database doesn't support UPDATE ... RETURNING")
+
+        # 5 full chunks and an empty one
+        with self.assertNumQueries(6):
+            tutorials = self.update(chunk_size=2)
+
+        self.assertEqual(len(tutorials), 10)
+
+    def test_fallback(self):
+        """Should update rows without RETURNING support too."""
+        with mock.patch.object(
+            moderation, "supports_update_returning", return_value=False
+        ):
+            tutorials = self.update(chunk_size=3)
+
+        self.assertEqual(len(tutorials), 10)
+        self.assertEqual(
+            Tutorial.objects.filter(
+                confirm_status=ConfirmStatusChoices.CONFIRMED
+            ).count(),
+            10,
+        )
+
+
+class LargeSelectionModerationTest(TestCase):
+    count = 10000
+
+    @classmethod
+    def setUpTestData(cls):
+        _make_tutorials(cls.count)
+
+    def test_set_confirm_status(self):
+        """Should moderate 10k rows by a query per chunk."""
+        with CaptureQueriesContext(connection) as queries:
+            tutorials = moderation.set_confirm_status(
+                Tutorial.objects.all(), ConfirmStatusChoices.CONFIRMED
+            )
+
+        self.assertEqual(len(tutorials), self.count)
+        self.assertLessEqual(
+            len(queries), self.count // moderation.DEFAULT_CHUNK_SIZE + 1
+        )
+
+    def test_set_confirm_status_fallback(self):
+        """Fallback should moderate 10k rows too."""
+        with mock.patch.object(
+            moderation, "supports_update_returning", return_value=False
+        ):
+            tutorials = moderation.set_confirm_status(
+                Tutorial.objects.all(), ConfirmStatusChoices.DISPROVED
+            )
+
+        self.assertEqual(len(tutorials), self.count)
+        self.assertFalse(
+            Tutorial.objects.exclude(
+                confirm_status=ConfirmStatusChoices.DISPROVED
+            ).exists()
+        )
+
+    def test_confirm_action(self):
+        """Confirm action should moderate and notify about 10k rows."""
+        actions.confirm_tutorial_action(
+            mock.MagicMock(), RequestFactory().get("/"), Tutorial.objects.all()
+        )
+
+        self.assertEqual(QueuedEmail.objects.count(), self.count)
+
+
+class CommentModerationTest(TestCase):
+    def test_confirm_comments_notify(self):
+        """Confirming comments should notify about returned comments."""
+        tutorial = baker.make_recipe("learning.confirmed_tutorial")
+        parent = baker.make_recipe(
+            "learning.confirmed_tutorial_comment",
+            is_active=True,
+            tutorial=tutorial,
+        )
+        baker.make_recipe(
+            "learning.waiting_for_confirm_tutorial_comment",
+            is_active=True,
+            tutorial=tutorial,
+            parent_comment=parent,
+            _quantity=3,
+        )
+
+        updated, result = actions.moderate_tutorial_comments(
+            RequestFactory().get("/"),
+            TutorialComment.objects.all(),
+            ConfirmStatusChoices.CONFIRMED,
+        )
+
+        # Confirm/disprove, reply and tutorial author notifications
+        self.assertEqual(updated, 3)
+        self.assertEqual(result.queued, 9)
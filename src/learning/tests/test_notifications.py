@@ -1,12 +1,19 @@
 import abc
 import random
+from datetime import timedelta
+from io import StringIO
 from typing import Type
 from unittest import mock
-from smtplib import SMTPException
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
 from django.test import TestCase, RequestFactory
 from django.db.models import Model, QuerySet
 from django.core.exceptions import ImproperlyConfigured
+from django.contrib.auth import get_user_model
 from model_bakery import baker
+from shared.mail import send_digests
+from shared.models import DigestEntry, QueuedEmail
 from learning import notifications
 from learning.models import Tutorial, TutorialComment
 
@@ -26,53 +33,36 @@ class AbstractQuerysetNotifierTest(TestCase):
         baker.make_recipe("learning.tutorial", _quantity=2)
 
     def setUp(self):
-        self.logger_pathcher = mock.patch.object(notifications, "logger")
+        self.queue_email_pathcher = mock.patch.object(
+            notifications, "queue_email"
+        )
         self.email_cls_pathcher = mock.patch.object(
             notifications, "EmailMultiAlternatives"
         )
 
-        self.logger_mock = self.logger_pathcher.start()
+        self.queue_email_mock = self.queue_email_pathcher.start()
         self.email_instance_mock = self.email_cls_pathcher.start().return_value
 
-    def send_email(self, *args, **kwargs) -> bool:
-        """Sends email using AbstractQuerysetNotifier.send_email
-
-        Returns:
-            bool: Result of send_email() method.
-        """
+    def send_email(self, *args, **kwargs):
+        """Sends email using AbstractQuerysetNotifier.send_email"""
         if not args:
             args = (
                 "subject",
                 ["testmail@mail.com"],
             )
 
-        return notifications.AbstractQuerysetNotifier.send_email(
-            *args, **kwargs
-        )
-
-    def test_send_email_call_send(self):
-        """Should call EmailMultiAlternatives instance's send method."""
-        self.send_email()
-        self.assertTrue(self.email_instance_mock.send.called)
-
-    def test_send_email_smtp_exception_return_false(self):
-        """Should return False if EmailMultiAlternatives instance's
-        save method raise SMTPException.
-        """
-        # send() will raise SMTPException
-        self.email_instance_mock.send.side_effect = SMTPException()
-        self.assertFalse(self.send_email())
+        notifications.AbstractQuerysetNotifier.send_email(*args, **kwargs)
 
-    def test_send_email_smtp_exception_log_warning(self):
-        """Should log exception as warning if EmailMultiAlternatives
-        instance's save method raise SMTPException.
+    def test_send_email_queue_email(self):
+        """Should queue EmailMultiAlternatives instance instead of
+        sending it.
         """
-        self.email_instance_mock.send.side_effect = SMTPException()
         self.send_email()
 
-        self.logger_mock.warning.assert_called_with(
-            self.email_instance_mock.send.side_effect
+        self.queue_email_mock.assert_called_once_with(
+            self.email_instance_mock
         )
+        self.assertFalse(self.email_instance_mock.send.called)
 
     @mock.patch.object(notifications, "render_to_string")
     def test_send_email_render_template(
@@ -109,37 +99,142 @@ class AbstractQuerysetNotifierTest(TestCase):
                 notifier_instance.get_queryset().count(),
             )
 
-    def test_notify_result_success_count(self):
-        """Should correctly calculate count of successful notifications."""
+    def test_notify_result_queued_count(self):
+        """Should correctly calculate count of queued notifications."""
         notifier_instance = self.TestQuerysetNotifier(
             self.factory.get("/"), Tutorial.objects.all()
         )
 
-        with mock.patch.object(
-            notifier_instance, "notify_by_email", return_value=True
-        ):
+        with mock.patch.object(notifier_instance, "notify_by_email"):
             result = notifier_instance.notify()
             self.assertEqual(
-                result.success, notifier_instance.get_queryset().count()
+                result.queued, notifier_instance.get_queryset().count()
             )
 
-    def test_notify_result_failed_count(self):
-        """Should correctly calculate count of failed notifications."""
-        notifier_instance = self.TestQuerysetNotifier(
-            self.factory.get("/"), Tutorial.objects.all()
+    def tearDown(self):
+        self.queue_email_pathcher.stop()
+        self.email_cls_pathcher.stop()
+
+
+class NotifierQueueTest(TestCase):
+    def test_notify_queue_emails(self):
+        """notify() should store emails in queue without sending them."""
+        tutorials = baker.make_recipe(
+            "learning.confirmed_tutorial", _quantity=3
+        )
+        notifier = notifications.TutorialConfirmDisproveNotifier(
+            RequestFactory().get("/"),
+            Tutorial.objects.filter(pk__in=[obj.pk for obj in tutorials]),
         )
 
-        with mock.patch.object(
-            notifier_instance, "notify_by_email", return_value=False
-        ):
-            result = notifier_instance.notify()
-            self.assertEqual(
-                result.failed, notifier_instance.get_queryset().count()
+        result = notifier.notify()
+
+        self.assertEqual(result.queued, 3)
+        self.assertEqual(QueuedEmail.objects.count(), 3)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_notify_queries_count(self):
+        """Notifying about comments of a tutorial should not query
+        related objects for each comment.
+        """
+        tutorial = baker.make_recipe("learning.confirmed_tutorial")
+        baker.make_recipe(
+            "learning.confirmed_tutorial_comment",
+            is_active=True,
+            tutorial=tutorial,
+            _quantity=5,
+        )
+        notifier = notifications.TutorialAuthorNewConfirmedCommentNotifier(
+            RequestFactory().get("/"), TutorialComment.objects.all()
+        )
+
+        # Savepoint, select comments, insert emails and release savepoint
+        with self.assertNumQueries(4):
+            result = notifier.notify()
+
+        self.assertEqual(result.queued, 5)
+
+
+class NotifierDigestTest(TestCase):
+    def setUp(self):
+        self.author = baker.make(
+            get_user_model(), email="author@mail.com", first_name="Author"
+        )
+        tutorials = baker.make_recipe(
+            "learning.confirmed_tutorial", author=self.author, _quantity=2
+        )
+        for tutorial in tutorials:
+            baker.make_recipe(
+                "learning.confirmed_tutorial_comment",
+                is_active=True,
+                tutorial=tutorial,
+                _quantity=3,
             )
 
-    def tearDown(self):
-        self.logger_pathcher.stop()
-        self.email_cls_pathcher.stop()
+    def notify(self):
+        return notifications.TutorialAuthorNewConfirmedCommentNotifier(
+            RequestFactory().get("/"),
+            TutorialComment.objects.all(),
+            digest=True,
+        ).notify()
+
+    def test_notify_add_digest_entries(self):
+        """notify() should add digest entries instead of queuing emails
+        in digest mode.
+        """
+        result = self.notify()
+
+        self.assertEqual(result.queued, 6)
+        self.assertEqual(DigestEntry.objects.count(), 6)
+        self.assertFalse(QueuedEmail.objects.exists())
+
+    def test_send_digests_single_email(self):
+        """Recipient's entries should be sent by a single email after
+        digest window.
+        """
+        self.notify()
+        DigestEntry.objects.update(
+            create_date=timezone.now() - timedelta(minutes=20)
+        )
+
+        self.assertEqual(send_digests(timedelta(minutes=10)), 1)
+
+        queued_email = QueuedEmail.objects.get()
+        self.assertEqual(queued_email.to, ["author@mail.com"])
+        self.assertEqual(
+            queued_email.body.count("ثبت و تایید شد"),
+            TutorialComment.objects.count(),
+        )
+        self.assertFalse(DigestEntry.objects.exists())
+
+    def test_send_digests_notification_templates(self):
+        """Digest should greet recipient by name and render each entry
+        by its notification's template fragment.
+        """
+        self.notify()
+        send_digests(timedelta(0))
+
+        (html_message, _), = QueuedEmail.objects.get().alternatives
+        self.assertIn("سلام Author عزیز!", html_message)
+        for comment in TutorialComment.objects.select_related("tutorial"):
+            self.assertIn(comment.title, html_message)
+            self.assertIn(comment.tutorial.title, html_message)
+
+    def test_send_digests_wait_for_window(self):
+        """Entries should not be sent before digest window ends."""
+        self.notify()
+
+        self.assertEqual(send_digests(timedelta(minutes=10)), 0)
+        self.assertEqual(DigestEntry.objects.count(), 6)
+
+    def test_send_notification_digests_command(self):
+        """send_notification_digests should send due digests."""
+        self.notify()
+        call_command(
+            "send_notification_digests", "--window=0", stdout=StringIO()
+        )
+
+        self.assertEqual(QueuedEmail.objects.count(), 1)
 
 
 class _QuerysetNotifierBaseTest(TestCase, metaclass=abc.ABCMeta):
@@ -173,12 +268,14 @@ class _QuerysetNotifierBaseTest(TestCase, metaclass=abc.ABCMeta):
         )
 
     def setUp(self):
-        self.logger_pathcher = mock.patch.object(notifications, "logger")
+        self.queue_email_pathcher = mock.patch.object(
+            notifications, "queue_email"
+        )
         self.email_cls_pathcher = mock.patch.object(
             notifications, "EmailMultiAlternatives"
         )
 
-        self.logger_mock = self.logger_pathcher.start()
+        self.queue_email_mock = self.queue_email_pathcher.start()
         self.email_instance_mock = self.email_cls_pathcher.start().return_value
 
     def get_notifier_queryset(self) -> QuerySet:
@@ -193,6 +290,23 @@ class _QuerysetNotifierBaseTest(TestCase, metaclass=abc.ABCMeta):
             notifier.notify_by_email(mock.MagicMock())
             send_email_mock.assert_called_once()
 
+    def test_objects_list_filter(self):
+        """is_notifiable() should filter objects lists like
+        get_queryset() filters querysets.
+        """
+        notifier = self.notifier_cls(
+            self.factory.get("/"), list(self.queryset.order_by("pk"))
+        )
+
+        self.assertEqual(
+            [obj.pk for obj in notifier.get_objects()],
+            list(
+                self.get_notifier_queryset()
+                .order_by("pk")
+                .values_list("pk", flat=True)
+            ),
+        )
+
     def test_build_url(self):
         """build_url() should not return None."""
         notifier = self.notifier_cls(
@@ -201,7 +315,7 @@ class _QuerysetNotifierBaseTest(TestCase, metaclass=abc.ABCMeta):
         self.assertIsNotNone(notifier.build_url(notifier.queryset.first()))
 
     def tearDown(self):
-        self.logger_pathcher.stop()
+        self.queue_email_pathcher.stop()
         self.email_cls_pathcher.stop()
 
 
@@ -17,6 +17,8 @@ from learning.models import (
     TutorialCommentLike,
     TutorialCommentUpVote,
     TutorialCommentDownVote,
+    TutorialDailyStatistics,
+    TutorialStatisticsRelationChoices,
 )
 from learning.models.tutorial_user_relation_models import (
     AbstractTutorialScoreCoinModel,
@@ -90,16 +92,17 @@ class TutorialQuerysetTest(TestCase):
         active and confirmed tutorials.
         """
         active_confirmed_qs = (
-            # Note: Call order_by() to reset default ordering
-            self.tutorials_qs.active_and_confirmed_tutorials().order_by()
+            # Note: Order by pk as unordered rows may come in an index's
+            # order (e.g. partial active/confirmed indexes)
+            self.tutorials_qs.active_and_confirmed_tutorials().order_by("pk")
         )
         self.assertEqual(
             list(active_confirmed_qs), list(self.active_confirmed_tutorials)
         )
 
-    def test_annonate_comments_count(self):
-        """annonate_comments_count should annonate active and confirmed
-        comments count.
+    def test_update_active_confirmed_comments_count(self):
+        """update_active_confirmed_comments_count should store active and
+        confirmed comments count of tutorials.
         """
         random_tutorial = random.choice(self.tutorials_qs)
 
@@ -114,15 +117,36 @@ class TutorialQuerysetTest(TestCase):
             tutorial=random_tutorial,
             _quantity=3,
         )
+        # Make count wrong
+        Tutorial.objects.update(active_confirmed_comments_count=10)
+
+        self.tutorials_qs.update_active_confirmed_comments_count()
+        random_tutorial.refresh_from_db()
 
-        tutorials_with_annonation = Tutorial.objects.annonate_comments_count()
         self.assertEqual(
-            tutorials_with_annonation.get(
-                pk=random_tutorial.pk
-            ).comments_count,
+            random_tutorial.active_confirmed_comments_count,
             len(confirmed_comments),
         )
 
+    def test_drifted_comments_count(self):
+        """drifted_comments_count should only return tutorials which
+        their stored comments count is wrong.
+        """
+        tutorial, drifted_tutorial = self.tutorials_qs[:2]
+        baker.make_recipe(
+            "learning.confirmed_tutorial_comment",
+            is_active=True,
+            tutorial=tutorial,
+        )
+        Tutorial.objects.filter(pk=drifted_tutorial.pk).update(
+            active_confirmed_comments_count=3
+        )
+
+        self.assertEqual(
+            list(self.tutorials_qs.drifted_comments_count()),
+            [drifted_tutorial],
+        )
+
     def test_only_main_fields(self):
         """only_main_fields should load all expected fields
         data (In fact they shouldn't be differed).
@@ -271,7 +295,7 @@ class TutorialCommentQuerysetTest(TestCase):
         and confirmed tutorial comments.
         """
         active_confirmed_qs = (
-            self.comments_qs.active_and_confirmed_comments().order_by()
+            self.comments_qs.active_and_confirmed_comments().order_by("pk")
         )
         self.assertEqual(
             list(active_confirmed_qs), list(self.active_confirmed_comments)
@@ -369,6 +393,75 @@ class TutorialUserRelationQuerysetTest(TestCase):
         with self.assertNumQueries(1):
             self.queryset.get_last_months_count_statistics(5, self.today)
 
+    def test_get_last_months_count_long_range(self):
+        """get_last_months_count_statistics should run 1 query for
+        long ranges too and count old months' objects.
+        """
+        with self.assertNumQueries(1):
+            statistics = self.queryset.get_last_months_count_statistics(
+                60, self.today
+            )
+
+        self.assertEqual(len(statistics), 60)
+        self.assertEqual(
+            statistics[-2:], self.expected_monthly_count_statistics
+        )
+        self.assertEqual(sum(month["count"] for month in statistics), 5)
+
+
+class TutorialDailyStatisticsQuerysetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        tutorial = baker.make_recipe("learning.tutorial")
+
+        # date, count
+        date_counts = [
+            # Older than last 2 months
+            (datetime.date(2021, 1, 1), 7),
+            # 3rd jalali month (Khordad)
+            (datetime.date(2021, 6, 10), 1),
+            (datetime.date(2021, 6, 20), 2),
+            # 4th jalali month (Tir), first day
+            (datetime.date(2021, 6, 22), 2),
+        ]
+        TutorialDailyStatistics.objects.bulk_create(
+            [
+                TutorialDailyStatistics(
+                    tutorial=tutorial,
+                    relation=TutorialStatisticsRelationChoices.VIEW,
+                    date=day,
+                    count=count,
+                )
+                for day, count in date_counts
+            ]
+        )
+
+        cls.queryset = TutorialDailyStatistics.objects.all()
+        cls.today = datetime.date(2021, 7, 14)
+        cls.expected_monthly_count_statistics = [
+            MonthlyCountStatistics({"label": "خرداد 1400", "count": 3}),
+            MonthlyCountStatistics({"label": "تیر 1400", "count": 2}),
+        ]
+
+    def test_get_last_months_count_statistics(self):
+        """get_last_months_count_statistics should sum daily counts of
+        last months using a single query.
+        """
+        with self.assertNumQueries(1):
+            statistics = self.queryset.get_last_months_count_statistics(
+                last_months_count=2, today=self.today
+            )
+
+        self.assertEqual(statistics, self.expected_monthly_count_statistics)
+
+    def test_get_last_months_count_statistics_empty(self):
+        """Months without statistics rows should have zero count."""
+        statistics = self.queryset.filter(
+            relation=TutorialStatisticsRelationChoices.LIKE
+        ).get_last_months_count_statistics(2, self.today, ascending=False)
+
+        self.assertEqual([month["count"] for month in statistics], [0, 0])
+
 
 class TutorialCommentUserRelationQuerysetTest(TestCase):
     @classmethod
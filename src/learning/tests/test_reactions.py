@@ -0,0 +1,177 @@
+from datetime import date, datetime
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from model_bakery import baker
+from shared.counters import LocalCounterBuffer, flush_counters
+from learning.models import (
+    Tutorial,
+    TutorialDailyStatistics,
+    TutorialStatisticsRelationChoices,
+    TutorialComment,
+    TutorialLike,
+    TutorialView,
+    TutorialCommentLike,
+    TutorialCommentDownVote,
+)
+from learning.reactions import (
+    ReactionOperation,
+    apply_reactions,
+    get_reaction_states,
+)
+
+User = get_user_model()
+
+
+class ReactionStatesTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = baker.make(User)
+        cls.tutorial: Tutorial = baker.make_recipe(
+            "learning.confirmed_tutorial"
+        )
+        cls.comments: list[TutorialComment] = baker.make_recipe(
+            "learning.confirmed_tutorial_comment",
+            tutorial=cls.tutorial,
+            _quantity=3,
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def get_comment_states(self) -> dict:
+        return get_reaction_states(
+            self.user,
+            "tutorial_comment",
+            [comment.pk for comment in self.comments],
+        )
+
+    def test_states(self):
+        """Should return user's reactions of every object by a single
+        query.
+        """
+        first, second, third = self.comments
+        TutorialCommentLike.objects.create(user=self.user, comment=first)
+        TutorialCommentDownVote.objects.create(user=self.user, comment=first)
+        # Other users' reactions shouldn't be included
+        TutorialCommentLike.objects.create(
+            user=baker.make(User), comment=second
+        )
+
+        with self.assertNumQueries(1):
+            states = self.get_comment_states()
+
+        self.assertEqual(
+            states,
+            {
+                first.pk: {"like": True, "upvote": False, "downvote": True},
+                second.pk: {
+                    "like": False,
+                    "upvote": False,
+                    "downvote": False,
+                },
+                third.pk: {"like": False, "upvote": False, "downvote": False},
+            },
+        )
+
+    def test_cached(self):
+        """States should be cached per user."""
+        self.get_comment_states()
+
+        with self.assertNumQueries(0):
+            self.get_comment_states()
+
+        other_user_states = get_reaction_states(
+            baker.make(User), "tutorial_comment", [self.comments[0].pk]
+        )
+        self.assertFalse(other_user_states[self.comments[0].pk]["like"])
+
+    def test_invalidate_on_toggle(self):
+        """User's reactions changes should invalidate cached states."""
+        comment = self.comments[0]
+        self.get_comment_states()
+
+        TutorialCommentLike.toggle(user=self.user, comment=comment)
+        self.assertTrue(self.get_comment_states()[comment.pk]["like"])
+
+        TutorialCommentLike.toggle(user=self.user, comment=comment)
+        self.assertFalse(self.get_comment_states()[comment.pk]["like"])
+
+        apply_reactions(
+            self.user,
+            [ReactionOperation("tutorial_comment", "like", comment.pk)],
+        )
+        self.assertTrue(self.get_comment_states()[comment.pk]["like"])
+
+    def test_view_keeps_cache(self):
+        """Tutorial views aren't reactions, so they shouldn't invalidate
+        cached states.
+        """
+        get_reaction_states(self.user, "tutorial", [self.tutorial.pk])
+        TutorialView.objects.create(user=self.user, tutorial=self.tutorial)
+        TutorialLike.objects.create(
+            user=baker.make(User), tutorial=self.tutorial
+        )
+
+        with self.assertNumQueries(0):
+            get_reaction_states(self.user, "tutorial", [self.tutorial.pk])
+
+
+class ApplyReactionsTest(TestCase):
+    def setUp(self):
+        self.user = baker.make(User)
+        self.tutorial: Tutorial = baker.make_recipe(
+            "learning.confirmed_tutorial"
+        )
+
+    def like_tutorial(self):
+        return apply_reactions(
+            self.user,
+            [ReactionOperation("tutorial", "like", self.tutorial.pk)],
+        )
+
+    def get_like_statistics(self) -> dict:
+        return dict(
+            TutorialDailyStatistics.objects.filter(
+                tutorial=self.tutorial,
+                relation=TutorialStatisticsRelationChoices.LIKE,
+            ).values_list("date", "count")
+        )
+
+    def test_default_timezone_day(self):
+        """Reactions should be counted in their creation day in default
+        timezone regardless of current timezone.
+        """
+        create_date = timezone.make_aware(
+            datetime(2021, 6, 1, 22), timezone.utc
+        )
+        # It's 2 June in Tehran
+        with timezone.override("Asia/Tehran"), mock.patch(
+            "django.utils.timezone.now", return_value=create_date
+        ):
+            self.assertEqual(self.like_tutorial(), [True])
+
+        self.assertEqual(self.get_like_statistics(), {date(2021, 6, 1): 1})
+
+    @override_settings(WRITE_BEHIND_COUNTERS=True)
+    def test_write_behind(self):
+        """Counters should be buffered on commit and statistics rows
+        should be created on flush.
+        """
+        buffer = LocalCounterBuffer()
+        with mock.patch("shared.counters._buffer", buffer):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.like_tutorial()
+                self.assertEqual(buffer.pop_all(), {})
+
+            self.assertEqual(self.get_like_statistics(), {})
+            flush_counters(buffer)
+
+        self.tutorial.refresh_from_db()
+        self.assertEqual(self.tutorial.likes_count, 1)
+        self.assertEqual(
+            self.get_like_statistics(),
+            {timezone.localdate(timezone=timezone.get_default_timezone()): 1},
+        )
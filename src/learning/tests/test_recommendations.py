@@ -0,0 +1,180 @@
+from unittest import mock
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+from model_bakery import baker
+from shared.models import ConfirmStatusChoices
+from learning.models import Category, RelatedTutorial, Tutorial, TutorialTag
+from learning import recommendations
+from learning.recommendations import (
+    get_candidates,
+    rebuild_related_tutorials,
+    schedule_related_tutorials_update,
+)
+
+
+class RelatedTutorialsIndexTest(TestCase):
+    def setUp(self):
+        self.parent: Category = baker.make_recipe("learning.active_category")
+        self.category: Category = baker.make_recipe(
+            "learning.active_category", parent_category=self.parent
+        )
+        self.other_category: Category = baker.make_recipe(
+            "learning.active_category"
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tutorial: Tutorial = baker.make_recipe(
+                "learning.confirmed_tutorial", categories=[self.category]
+            )
+            baker.make(TutorialTag, tutorial=self.tutorial, title="django")
+
+    def make_tutorial(self, categories=(), tags=(), **kwargs) -> Tutorial:
+        with self.captureOnCommitCallbacks(execute=True):
+            tutorial: Tutorial = baker.make_recipe(
+                "learning.confirmed_tutorial", categories=categories, **kwargs
+            )
+            for tag in tags:
+                baker.make(TutorialTag, tutorial=tutorial, title=tag)
+
+        return tutorial
+
+    def get_related(self, tutorial: Tutorial) -> list[Tutorial]:
+        return list(
+            Tutorial.objects.active_and_confirmed_tutorials()
+            .get_indexed_related_tutorials(tutorial, 5)
+        )
+
+    def test_rank(self):
+        """Related tutorials should be ranked by their joint categories
+        and tags weighted by likes.
+        """
+        category_and_tag = self.make_tutorial([self.category], ["django"])
+        liked_category = self.make_tutorial([self.category], likes_count=10)
+        parent_category = self.make_tutorial([self.parent])
+        tag = self.make_tutorial(tags=["django"])
+        self.make_tutorial([self.other_category])
+        self.make_tutorial(
+            [self.category],
+            confirm_status=ConfirmStatusChoices.WAITING_FOR_CONFIRM,
+        )
+
+        rebuild_related_tutorials()
+
+        self.assertEqual(
+            self.get_related(self.tutorial),
+            [liked_category, category_and_tag, parent_category, tag],
+        )
+
+    def test_single_query(self):
+        """Indexed related tutorials should be fetched by one query."""
+        self.make_tutorial([self.category])
+
+        with self.assertNumQueries(1):
+            self.get_related(self.tutorial)
+
+    def test_candidates_per_feature(self):
+        """Only most liked tutorials of each feature should be kept."""
+        most_liked = self.make_tutorial([self.category], likes_count=5)
+        self.make_tutorial([self.category], likes_count=1)
+
+        candidates, _ = get_candidates(candidates_per_feature=1)
+
+        self.assertEqual(
+            candidates[("category", self.category.pk)], [most_liked.pk]
+        )
+
+    def test_incremental_confirm(self):
+        """Confirmed tutorial should be added to its neighbors' index."""
+        new_tutorial = self.make_tutorial(
+            [self.category],
+            confirm_status=ConfirmStatusChoices.WAITING_FOR_CONFIRM,
+        )
+        self.assertEqual(self.get_related(self.tutorial), [])
+
+        new_tutorial.confirm_status = ConfirmStatusChoices.CONFIRMED
+        with self.captureOnCommitCallbacks(execute=True):
+            new_tutorial.save()
+
+        self.assertEqual(self.get_related(self.tutorial), [new_tutorial])
+        self.assertEqual(self.get_related(new_tutorial), [self.tutorial])
+
+    def test_incremental_categories_change(self):
+        """Changing tutorial's categories should update index."""
+        other = self.make_tutorial([self.other_category])
+        self.assertEqual(self.get_related(self.tutorial), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            other.categories.add(self.category)
+        self.assertEqual(self.get_related(self.tutorial), [other])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            other.categories.clear()
+        self.assertEqual(self.get_related(self.tutorial), [])
+
+    def test_incremental_category_change(self):
+        """Deactivating a category should update its tutorials' index."""
+        other = self.make_tutorial([self.parent])
+        self.assertEqual(self.get_related(self.tutorial), [other])
+
+        self.parent.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.parent.save()
+
+        self.assertFalse(
+            RelatedTutorial.objects.filter(tutorial=self.tutorial).exists()
+        )
+
+    def test_incremental_delete(self):
+        """Deleting a tutorial should rebuild tutorials related to it."""
+        deleted = self.make_tutorial([self.category], likes_count=5)
+        other = self.make_tutorial([self.category])
+        self.assertEqual(self.get_related(self.tutorial), [deleted, other])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            deleted.delete()
+
+        self.assertEqual(self.get_related(self.tutorial), [other])
+
+    def test_mark_indexed(self):
+        """Rebuilt tutorials should be marked as indexed, even if they
+        don't have any related tutorial.
+        """
+        Tutorial.objects.update(related_indexed_at=None)
+
+        rebuild_related_tutorials([self.tutorial.pk])
+
+        self.tutorial.refresh_from_db()
+        self.assertIsNotNone(self.tutorial.related_indexed_at)
+        self.assertEqual(self.get_related(self.tutorial), [])
+
+    def test_schedule_on_commit(self):
+        """Scheduled updates should be applied on commit."""
+        with mock.patch.object(
+            recommendations, "update_related_tutorials"
+        ) as update_related_tutorials:
+            with self.captureOnCommitCallbacks(execute=True):
+                schedule_related_tutorials_update([self.tutorial.pk])
+                update_related_tutorials.assert_not_called()
+
+        update_related_tutorials.assert_called_once_with({self.tutorial.pk})
+
+    def test_schedule_rollback(self):
+        """Updates scheduled in a rolled back savepoint shouldn't be
+        applied on commit.
+        """
+        other = self.make_tutorial([self.other_category])
+
+        with mock.patch.object(
+            recommendations, "update_related_tutorials"
+        ) as update_related_tutorials:
+            with self.captureOnCommitCallbacks(execute=True):
+                try:
+                    with transaction.atomic():
+                        schedule_related_tutorials_update([other.pk])
+                        raise IntegrityError
+                except IntegrityError:
+                    pass
+
+                schedule_related_tutorials_update([self.tutorial.pk])
+
+        update_related_tutorials.assert_called_once_with({self.tutorial.pk})
@@ -0,0 +1,140 @@
+from django.test import TestCase
+from model_bakery import baker
+from learning.models import Category, Tutorial, TutorialTag
+from learning.search import build_search_document, tokenize_search_query
+
+
+class SearchDocumentTest(TestCase):
+    def test_build_search_document_strip_html(self):
+        """build_search_document should remove html tags and entities."""
+        document = build_search_document(
+            "Title", "title", "<p>Short&nbsp;desc</p>", "<b>Body</b>"
+        )
+
+        self.assertNotIn("<", document)
+        self.assertNotIn("&nbsp;", document)
+        self.assertIn("body", document)
+
+    def test_build_search_document_categories_tags(self):
+        """build_search_document should include categories and tags."""
+        document = build_search_document(
+            "title", "title", "", "", ["Category"], ["Tag"]
+        )
+
+        self.assertIn("category", document)
+        self.assertIn("tag", document)
+
+    def test_tokenize_search_query(self):
+        """tokenize_search_query should split query to lowercase words
+        and remove special characters.
+        """
+        self.assertEqual(
+            tokenize_search_query('Django "ORM"* & <b>tips</b>'),
+            ["django", "orm", "tips"],
+        )
+
+
+class TutorialSearchTest(TestCase):
+    def _search(self, value: str) -> list[Tutorial]:
+        return list(Tutorial.objects.search(value))
+
+    def test_document_updated_on_save(self):
+        """Tutorial's search document should update on edit."""
+        tutorial: Tutorial = baker.make_recipe("learning.tutorial")
+        tutorial.body = "updatedbodyword"
+        tutorial.save()
+
+        self.assertEqual(self._search("updatedbodyword"), [tutorial])
+
+    def test_prefix_search(self):
+        """Search should match prefix of words."""
+        tutorial: Tutorial = baker.make_recipe(
+            "learning.tutorial", body="programming"
+        )
+
+        self.assertEqual(self._search("program"), [tutorial])
+
+    def test_tags_sync(self):
+        """Tutorial should be searchable by its tags until they're deleted."""
+        tag: TutorialTag = baker.make(
+            TutorialTag,
+            title="searchabletag",
+            tutorial=baker.make_recipe("learning.tutorial"),
+        )
+        self.assertEqual(self._search("searchabletag"), [tag.tutorial])
+
+        tag.delete()
+        self.assertEqual(self._search("searchabletag"), [])
+
+    def test_categories_sync(self):
+        """Tutorial should be searchable by its active categories' names."""
+        category: Category = baker.make_recipe(
+            "learning.active_category", name="firstname"
+        )
+        tutorial: Tutorial = baker.make_recipe(
+            "learning.tutorial", categories=[category]
+        )
+        self.assertEqual(self._search("firstname"), [tutorial])
+
+        category.name = "secondname"
+        category.save()
+        self.assertEqual(self._search("firstname"), [])
+        self.assertEqual(self._search("secondname"), [tutorial])
+
+        category.is_active = False
+        category.save()
+        self.assertEqual(self._search("secondname"), [])
+
+    def test_categories_relation_sync(self):
+        """Search documents should update when tutorial's
+        categories relation changes.
+        """
+        category: Category = baker.make_recipe(
+            "learning.active_category", name="relatedname"
+        )
+        tutorial: Tutorial = baker.make_recipe("learning.tutorial")
+
+        category.tutorials.add(tutorial)
+        self.assertEqual(self._search("relatedname"), [tutorial])
+
+        tutorial.categories.clear()
+        self.assertEqual(self._search("relatedname"), [])
+
+    def test_deleted_tutorial(self):
+        """Deleted tutorials should be removed from search index."""
+        tutorial: Tutorial = baker.make_recipe(
+            "learning.tutorial", body="deletedword"
+        )
+        tutorial.delete()
+
+        self.assertEqual(self._search("deletedword"), [])
+
+    def test_ranked_results(self):
+        """Tutorials with more relevant documents should come first."""
+        less_relevant: Tutorial = baker.make_recipe(
+            "learning.tutorial", body="ranking " + "filler " * 30
+        )
+        more_relevant: Tutorial = baker.make_recipe(
+            "learning.tutorial", body="ranking ranking ranking"
+        )
+
+        self.assertEqual(
+            self._search("ranking"), [more_relevant, less_relevant]
+        )
+
+    def test_persian_normalization(self):
+        """Search should match Persian text regardless of Arabic
+        characters, ZWNJ, diacritics and Persian digits.
+        """
+        tutorial: Tutorial = baker.make_recipe(
+            "learning.tutorial", body="<p>كتاب\u200cهاي مُعَلِّم ۱۴۰۰</p>"
+        )
+
+        self.assertEqual(self._search("کتابهای"), [tutorial])
+        self.assertEqual(self._search("معلم 1400"), [tutorial])
+
+    def test_empty_query(self):
+        """Search query without any word should return nothing."""
+        baker.make_recipe("learning.tutorial")
+
+        self.assertEqual(self._search("!!"), [])
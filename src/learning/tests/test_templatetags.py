@@ -0,0 +1,55 @@
+from django.core.cache import cache
+from django.template import Context, Template
+from django.test import TestCase
+from model_bakery import baker
+from learning.models import Category
+
+
+class NavbarTutorialCategoriesTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.parent: Category = baker.make_recipe(
+            "learning.active_category", name="parent"
+        )
+        self.child: Category = baker.make_recipe(
+            "learning.active_category",
+            name="child",
+            parent_category=self.parent,
+        )
+        baker.make_recipe("learning.inactive_category", name="inactive")
+
+    def render(self) -> str:
+        return Template(
+            "{% load base_tmplatetags %}{% navbar_tutorial_categories %}"
+        ).render(Context())
+
+    def test_render(self):
+        """Should render active categories grouped by their parents."""
+        html = self.render()
+
+        self.assertIn(f'href="#tutorials-children-{self.parent.pk}', html)
+        self.assertIn(f'id="tutorials-children-{self.parent.pk}"', html)
+        self.assertIn(f"?category={self.child.slug}", html)
+        self.assertNotIn("inactive", html)
+
+    def test_warm_cache_zero_queries(self):
+        """Navbar shouldn't run any query on a warm cache."""
+        html = self.render()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.render(), html)
+
+    def test_invalidation(self):
+        """Category changes (also bulk ones) should invalidate navbar."""
+        self.render()
+
+        self.child.name = "renamed"
+        self.child.save()
+        self.assertIn("renamed", self.render())
+
+        Category.objects.filter(pk=self.child.pk).update(is_active=False)
+        self.assertNotIn("renamed", self.render())
+
+        Category.objects.filter(pk=self.parent.pk).delete()
+        self.assertNotIn("parent", self.render())
@@ -3,11 +3,15 @@ import random
 from typing import Optional
 from unittest import mock
 from django.http import HttpResponse
+from django.db import connection
 from django.db.models import QuerySet
 from django.test import TestCase, RequestFactory
+from django.core.cache import cache
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from django.shortcuts import reverse, resolve_url
 from django.core.exceptions import MultipleObjectsReturned
+from django.test.utils import CaptureQueriesContext
 from model_bakery import baker
 from shared.tests.utils import prevent_request_warnings
 from learning.views import (
@@ -23,8 +27,11 @@ User = get_user_model()
 
 class ConstanceConfigMock:
     LEARNING_HOME_CAROUSEL_ITEMS_COUNT = 4
+    LEARNING_HOME_CAROUSELS_CACHE_TIMEOUT = 600
     LEARNING_RECOMMENDATION_ITEMS_COUNT = 5
     LEARNING_TUTORIAL_ARCHIVE_PAGINATE_BY = 9
+    LEARNING_TUTORIAL_ARCHIVE_COUNT_CACHE_TIMEOUT = 60
+    LEARNING_TUTORIAL_COMMENT_THREADS_PAGINATE_BY = 2
 
 
 @mock.patch.object(home, "config", ConstanceConfigMock)
@@ -35,7 +42,13 @@ class HomeViewTest(TestCase):
     ]
 
     def setUp(self):
-        self.response = self.client.get(reverse("learning:home"))
+        cache.clear()
+        self.response = self.get_response()
+
+    def get_response(self) -> HttpResponse:
+        # Note: class decorator doesn't patch config in setUp
+        with mock.patch.object(home, "config", ConstanceConfigMock):
+            return self.client.get(reverse("learning:home"))
 
     @classmethod
     def setUpTestData(cls):
@@ -82,8 +95,8 @@ class HomeViewTest(TestCase):
         baker.make(TutorialLike, tutorial=self.tutorials[0], _quantity=1)
         baker.make(TutorialLike, tutorial=self.tutorials[1], _quantity=2)
 
-        # Re-send request to refresh response
-        self.setUp()
+        # Re-send request to refresh response (likes invalidate cache)
+        self.response = self.get_response()
 
         view_most_liked_tutorials: list[Tutorial] = list(
             self.response.context["most_liked_tutorials"]
@@ -98,6 +111,28 @@ class HomeViewTest(TestCase):
 
         self.assertEqual(view_most_liked_tutorials, most_liked_tutorials)
 
+    def test_cached_carousels(self):
+        """Carousels should be served from cache on next requests."""
+        with mock.patch.object(home.HomeView, "get_carousels") as mocked:
+            response = self.get_response()
+
+        mocked.assert_not_called()
+        self.assertEqual(
+            list(response.context["latest_published_tutorials"]),
+            list(self.response.context["latest_published_tutorials"]),
+        )
+
+    def test_new_tutorial_invalidate_carousels(self):
+        """Publishing a tutorial should invalidate cached carousels."""
+        tutorial: Tutorial = baker.make_recipe(
+            "learning.confirmed_tutorial", is_active=True
+        )
+        response = self.get_response()
+
+        self.assertEqual(
+            response.context["latest_published_tutorials"][0], tutorial
+        )
+
 
 @mock.patch.object(tutorial_details_view, "config", ConstanceConfigMock)
 class TutorialDetailsViewTest(TestCase):
@@ -200,8 +235,10 @@ class TutorialDetailsViewTest(TestCase):
             )
 
     def test_context_tutorial_prefetch_relations(self):
-        """Tutorial object should prefetch categories, comments and tags."""
-        should_prefeth = ["categories", "comments", "tags"]
+        """Tutorial object should prefetch categories and tags (comments
+        are fetched as comment tree).
+        """
+        should_prefeth = ["categories", "tags"]
 
         context_tutorial: Tutorial = self.get_view_response().context[
             "tutorial"
@@ -259,6 +296,31 @@ class TutorialDetailsViewTest(TestCase):
                 ConstanceConfigMock.LEARNING_RECOMMENDATION_ITEMS_COUNT,
             )
 
+    def test_related_tutorials_fallback(self):
+        """Related tutorials should be queried live only when tutorial
+        isn't indexed yet (even if it has no indexed related tutorial).
+        """
+        tutorial = self.random_active_confirmed_tutorial
+        queryset_cls = type(Tutorial.objects.all())
+
+        for related_indexed_at, live_query in (
+            (None, True),
+            (timezone.now(), False),
+        ):
+            Tutorial.objects.filter(pk=tutorial.pk).update(
+                related_indexed_at=related_indexed_at
+            )
+
+            with mock.patch.object(
+                queryset_cls,
+                "get_related_tutorials",
+                autospec=True,
+                return_value=Tutorial.objects.none(),
+            ) as get_related_tutorials:
+                self.get_view_response(tutorial)
+
+            self.assertEqual(get_related_tutorials.called, live_query)
+
     @mock.patch.object(
         tutorial_details_view.TutorialDetailsView,
         "record_tutorial_view",
@@ -300,6 +362,81 @@ class TutorialDetailsViewTest(TestCase):
                 "record_tutorial_view inserted TutorialView multiple times."
             )
 
+    def test_query_count_independent_of_comments(self):
+        """Query count shouldn't grow with tutorial's comments count."""
+        tutorial = self.random_active_confirmed_tutorial
+        url = resolve_url("learning:tutorial", slug=tutorial.slug)
+        # Warm up caches and record the view
+        self.client.get(url)
+
+        query_counts = []
+        for comments_count in [1, 20]:
+            baker.make_recipe(
+                "learning.confirmed_tutorial_comment",
+                tutorial=tutorial,
+                _quantity=comments_count,
+            )
+            with CaptureQueriesContext(connection) as captured:
+                self.client.get(url)
+
+            query_counts.append(len(captured))
+
+        self.assertEqual(query_counts[0], query_counts[1])
+
+    def test_paginate_comment_threads(self):
+        """Comment threads should be paginated (with their replies)."""
+        tutorial = self.random_active_confirmed_tutorial
+        threads = baker.make_recipe(
+            "learning.confirmed_tutorial_comment",
+            tutorial=tutorial,
+            allow_reply=True,
+            _quantity=3,
+        )
+        reply = baker.make_recipe(
+            "learning.confirmed_tutorial_comment",
+            tutorial=tutorial,
+            parent_comment=threads[0],
+        )
+
+        url = resolve_url("learning:tutorial", slug=tutorial.slug)
+        first_page = self.client.get(url).context["comment_threads"]
+        second_page = self.client.get(
+            url, {"comments_page": 2}
+        ).context["comment_threads"]
+
+        self.assertEqual(len(first_page), 2)
+        self.assertEqual(len(second_page), 1)
+        self.assertEqual(
+            {node.pk for node in [*first_page, *second_page]},
+            {thread.pk for thread in threads},
+        )
+        self.assertIn(
+            reply.pk,
+            [
+                node.pk
+                for thread in [*first_page, *second_page]
+                for node in thread.replies
+            ],
+        )
+
+    def test_repeated_visit_skips_view_insert(self):
+        """Visiting a viewed tutorial shouldn't try to insert its view."""
+        tutorial = self.random_active_confirmed_tutorial
+        self.get_view_response(tutorial)
+
+        with mock.patch.object(
+            TutorialView, "insert_if_not_exists"
+        ) as insert_mock:
+            self.get_view_response(tutorial)
+
+        insert_mock.assert_not_called()
+        self.assertEqual(
+            TutorialView.objects.filter(
+                user=self.user, tutorial=tutorial
+            ).count(),
+            1,
+        )
+
 
 @mock.patch.object(tutorials_archive, "config", ConstanceConfigMock)
 class TutorialListViewTest(TestCase):
@@ -437,3 +574,64 @@ class TutorialListViewTest(TestCase):
         context_category = response.context.get("category")
 
         self.assertEqual(category, context_category)
+
+    def test_keyset_pages(self):
+        """Should paginate by cursor when page parameter isn't given."""
+        first_page = self.client.get(self.get_view_url()).context["page_obj"]
+        self.assertTrue(first_page.has_next)
+        self.assertFalse(first_page.has_previous)
+
+        second_page = self.client.get(
+            self.get_view_url(cursor=first_page.next_cursor)
+        ).context["page_obj"]
+        self.assertEqual(len(second_page), 1)
+        self.assertFalse(second_page.has_next)
+
+        previous_page = self.client.get(
+            self.get_view_url(cursor=second_page.previous_cursor)
+        ).context["page_obj"]
+        self.assertEqual(previous_page.object_list, first_page.object_list)
+
+    def test_keyset_orderings(self):
+        """Cursor pages should keep ordering of tutorials."""
+        for ordering in self.ordering_choices:
+            params = {
+                "order_by": ordering,
+                "ascending_or_descending": "descending",
+            }
+            first_page = self.client.get(
+                self.get_view_url(**params)
+            ).context["page_obj"]
+            second_page = self.client.get(
+                self.get_view_url(**params, cursor=first_page.next_cursor)
+            ).context["page_obj"]
+
+            self.assertEqual(
+                list(first_page) + list(second_page),
+                list(
+                    self.get_view_queryset(**params).order_by(
+                        "-" + ordering, "-pk"
+                    )
+                ),
+            )
+
+    @prevent_request_warnings
+    def test_invalid_cursor_404(self):
+        """Invalid cursor should return 404."""
+        response = self.client.get(self.get_view_url(cursor="invalid"))
+        self.assertEqual(response.status_code, 404)
+
+    def test_keyset_queries_count(self):
+        """Deeper pages shouldn't cost more queries."""
+        # Warm up cached count
+        first_page = self.client.get(self.get_view_url()).context["page_obj"]
+
+        with CaptureQueriesContext(connection) as first_page_queries:
+            self.client.get(self.get_view_url())
+
+        with CaptureQueriesContext(connection) as second_page_queries:
+            self.client.get(self.get_view_url(cursor=first_page.next_cursor))
+
+        self.assertEqual(
+            len(second_page_queries), len(first_page_queries)
+        )
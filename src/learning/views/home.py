@@ -4,6 +4,7 @@ from django.shortcuts import render
 from django.views.generic import View
 from constance import config
 from learning.models import Tutorial
+from learning.caches import get_home_carousels
 
 
 class HomeView(View):
@@ -12,10 +13,28 @@ class HomeView(View):
     def get(self, request: HttpRequest):
         carousel_count = config.LEARNING_HOME_CAROUSEL_ITEMS_COUNT
 
+        context = get_home_carousels(
+            carousel_count,
+            lambda: self.get_carousels(carousel_count),
+            config.LEARNING_HOME_CAROUSELS_CACHE_TIMEOUT,
+        )
+
+        return render(request, "learning/home.html", context)
+
+    @staticmethod
+    def get_carousels(carousel_count: int) -> dict[str, list[Tutorial]]:
+        """Queries carousels' tutorials.
+
+        Args:
+            carousel_count (int): Items count of each carousel.
+
+        Returns:
+            dict[str, list[Tutorial]]: Carousels' names to their
+                materialized tutorials (to be cacheable).
+        """
         tutorials = (
             Tutorial.objects.active_and_confirmed_tutorials()
             .only_main_fields()
-            .annonate_comments_count()
         )
 
         latest_published_tutorials = tutorials.order_by(
@@ -27,9 +46,7 @@ class HomeView(View):
             "-create_date",
         )[:carousel_count]
 
-        context = {
-            "latest_published_tutorials": latest_published_tutorials,
-            "most_liked_tutorials": most_liked_tutorials,
+        return {
+            "latest_published_tutorials": list(latest_published_tutorials),
+            "most_liked_tutorials": list(most_liked_tutorials),
         }
-
-        return render(request, "learning/home.html", context)
@@ -6,11 +6,21 @@ from django.views.generic import View
 from django.views.decorators.csrf import ensure_csrf_cookie
 from constance import config
 from learning.models import Tutorial, TutorialView
+from learning.caches import get_home_carousels
+from learning.comment_tree import get_comment_tree
+from .home import HomeView
 
 
 @method_decorator(ensure_csrf_cookie, name="dispatch")
 class TutorialDetailsView(View):
-    """Tutorial details view"""
+    """Tutorial details view
+
+    Page is assembled by a constant number of queries (regardless of
+    comments count): tutorial with user's liked/viewed flags, its tags,
+    categories and comment tree (paginated by top-level threads), indexed
+    related tutorials and view's insert (only on first visit). Latest and
+    most popular tutorials are shared with home carousels' cache.
+    """
 
     def get(self, request: HttpRequest, slug: str):
         recommendation_items_count = config.LEARNING_RECOMMENDATION_ITEMS_COUNT
@@ -19,53 +29,61 @@ class TutorialDetailsView(View):
 
         tutorial: Tutorial = get_object_or_404(
             all_tutorials.select_related("author")
+            .annotate_user_relations(request.user)
             .prefetch_related("tags")
-            .prefetch_active_categories()
-            .prefetch_active_confirmed_comments(),
+            .prefetch_active_categories(),
             slug=slug,
         )
 
-        related_tutorials = all_tutorials.get_related_tutorials(
-            tutorial, recommendation_items_count
-        ).only_main_fields()
+        if tutorial.related_indexed_at is not None:
+            related_tutorials = all_tutorials.get_indexed_related_tutorials(
+                tutorial, recommendation_items_count
+            ).only_main_fields()
+        else:
+            # Tutorial isn't indexed yet
+            related_tutorials = all_tutorials.get_related_tutorials(
+                tutorial, recommendation_items_count
+            ).only_main_fields()
+        related_tutorials = list(related_tutorials)
 
-        # Check is user logged in and liked this tutorial
-        liked_by_current_user = (
-            request.user.is_authenticated
-            and tutorial.likes.filter(user=request.user).exists()
+        comment_tree = get_comment_tree(tutorial)
+        comment_threads = comment_tree.paginate(
+            request.GET.get("comments_page"),
+            config.LEARNING_TUTORIAL_COMMENT_THREADS_PAGINATE_BY,
         )
 
-        latest_tutorials = all_tutorials.order_by("-create_date")[
-            :recommendation_items_count
-        ]
-        most_popular_tutorials = all_tutorials.order_by(
-            "-likes_count", "-create_date"
-        )[:recommendation_items_count]
+        sidebars = get_home_carousels(
+            recommendation_items_count,
+            lambda: HomeView.get_carousels(recommendation_items_count),
+            config.LEARNING_HOME_CAROUSELS_CACHE_TIMEOUT,
+        )
+        latest_tutorials = sidebars["latest_published_tutorials"]
 
         context = {
             "tutorial": tutorial,
-            "liked_by_current_user": liked_by_current_user,
-            "comments": tutorial.comments.all(),
+            "liked_by_current_user": tutorial.liked_by_current_user,
+            "comment_threads": comment_threads,
+            "comments_count": comment_tree.count,
             "tags": tutorial.tags.all(),
             # If there wasn't any related_tutorial use latest_tutorials instead
             "related_tutorials": related_tutorials or latest_tutorials,
             "latest_tutorials": latest_tutorials,
-            "most_popular_tutorials": most_popular_tutorials,
+            "most_popular_tutorials": sidebars["most_liked_tutorials"],
         }
 
         self.record_tutorial_view(tutorial)
         return render(request, "learning/tutorial.html", context)
 
     def record_tutorial_view(self, tutorial: Tutorial):
-        """Records tutorial's view.
+        """Records tutorial's view (by a single insert which ignores
+        existing view).
 
         Args:
             tutorial (Tutorial): Visited tutorial
         """
         user = self.request.user
-        if (
-            user.is_authenticated
-            and not tutorial.views.filter(user=user).exists()
+        if user.is_authenticated and not getattr(
+            tutorial, "viewed_by_current_user", False
         ):
             # Will automatically specify score and coin
-            TutorialView.objects.create(user=user, tutorial=tutorial)
+            TutorialView(user=user, tutorial=tutorial).insert_if_not_exists()
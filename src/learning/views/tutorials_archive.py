@@ -1,19 +1,52 @@
+from django.http import Http404
 from django.views.generic import ListView
 from constance import config
+from shared.pagination import (
+    CachedCountPaginator,
+    InvalidCursor,
+    paginate_by_keyset,
+)
 from learning.models import Tutorial, Category
 from learning.filters import TutorialArchiveFilterSet
 
+# Orderings which can be paginated by keyset (search rank can't)
+KEYSET_ORDERING_FIELDS = {
+    "title",
+    "likes_count",
+    "user_views_count",
+    "create_date",
+}
+
 
 class TutorialListView(ListView):
+    """Tutorial archive
+
+    Tutorials are paginated by keyset (cursor GET parameter) unless page
+    GET parameter is given or tutorials are ordered by search rank.
+    Both modes show total count of tutorials from cache.
+    """
+
     model = Tutorial
     template_name = "learning/tutorials_archive.html"
 
     page_kwarg = "page"
+    cursor_kwarg = "cursor"
     context_object_name = "tutorials"
+    paginator_class = CachedCountPaginator
 
     def get_paginate_by(self, queryset):
         return config.LEARNING_TUTORIAL_ARCHIVE_PAGINATE_BY
 
+    def get_paginator(self, queryset, per_page, **kwargs):
+        return super().get_paginator(
+            queryset,
+            per_page,
+            count_cache_timeout=(
+                config.LEARNING_TUTORIAL_ARCHIVE_COUNT_CACHE_TIMEOUT
+            ),
+            **kwargs,
+        )
+
     def get_queryset(self):
         # All confirmed and active tutorials
         tutorials = (
@@ -22,13 +55,39 @@ class TutorialListView(ListView):
             .active_and_confirmed_tutorials()
         )
 
-        # Filter and order tutorials, then annonate comments_count
-        tutorials = TutorialArchiveFilterSet(
-            self.request.GET, tutorials
-        ).qs.annonate_comments_count()
+        # Filter and order tutorials
+        tutorials = TutorialArchiveFilterSet(self.request.GET, tutorials).qs
 
         return tutorials
 
+    def use_keyset_pagination(self, queryset) -> bool:
+        return self.page_kwarg not in self.request.GET and all(
+            name.lstrip("-") in KEYSET_ORDERING_FIELDS
+            for name in queryset.query.order_by
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.use_keyset_pagination(queryset):
+            return super().paginate_queryset(queryset, page_size)
+
+        try:
+            page = paginate_by_keyset(
+                queryset,
+                list(queryset.query.order_by),
+                page_size,
+                self.request.GET.get(self.cursor_kwarg),
+            )
+        except InvalidCursor as ex:
+            raise Http404("صفحه نامعتبر است") from ex
+
+        paginator = self.get_paginator(queryset, page_size)
+        return (
+            paginator,
+            page,
+            page.object_list,
+            page.has_next or page.has_previous,
+        )
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class SharedConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "shared"
+
+    def ready(self):
+        # pylint: disable=import-outside-toplevel
+        from shared.slow_queries import install_slow_query_wrapper
+
+        connection_created.connect(install_slow_query_wrapper)
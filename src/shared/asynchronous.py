@@ -0,0 +1,59 @@
+""" Async utilities
+
+Django 3.2's ORM is sync only. Under ASGI, sync code is run by
+sync_to_async(thread_sensitive=True) by default, which runs all of them
+in a single thread, so database operations of concurrent requests are
+serialized. database_sync_to_async runs them in a thread pool instead.
+
+Only code using it leaves that thread: MiddlewareMixin based middleware
+(e.g. session, CSRF, auth and messages middleware) still run their
+process_request/process_response via sync_to_async(thread_sensitive=True)
+on every ASGI request.
+"""
+import functools
+from typing import Any, Awaitable, Callable
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+
+def database_sync_to_async(func: Callable) -> Callable[..., Awaitable[Any]]:
+    """Makes an async version of func which runs in a thread pool and
+    closes the thread's database connections (as a request's start and
+    finish does, respecting CONN_MAX_AGE) before and after calling func.
+
+    Args:
+        func (Callable): Sync function which uses database.
+
+    Returns:
+        Callable[..., Awaitable[Any]]: Async version of func.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return sync_to_async(wrapper, thread_sensitive=False)
+
+
+def async_view(view: Callable) -> Callable[..., Awaitable[Any]]:
+    """Wraps view (e.g. a class-based view function which returns an
+    awaitable) by an async function, as Django 3.2 only detects views
+    defined by async def as async.
+
+    Args:
+        view (Callable): View function returning an awaitable.
+
+    Returns:
+        Callable[..., Awaitable[Any]]: Async view function (with view's
+            attributes, e.g. view_class).
+    """
+
+    @functools.wraps(view)
+    async def wrapper(*args, **kwargs):
+        return await view(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,133 @@
+""" Cache utilities
+
+Cached values are grouped by "namespaces". Every namespace has a version
+number stored in cache which is a part of its values' keys. Invalidating
+a namespace increases its version, so all of its keys (with any
+parameters) become unreachable at once and expire by their timeout.
+"""
+import time
+from typing import Any, Callable, Optional
+from django.core.cache import cache
+from django.db import transaction
+
+_MISSING = object()
+
+
+def _version_key(namespace: str) -> str:
+    return f"{namespace}:version"
+
+
+def get_namespace_version(namespace: str) -> int:
+    """Returns current version of cache namespace.
+
+    Args:
+        namespace (str): Cache namespace.
+
+    Returns:
+        int: Namespace's version.
+    """
+    version = cache.get(_version_key(namespace))
+
+    if version is None:
+        # add() won't override version if another process has set it
+        cache.add(_version_key(namespace), 1, None)
+        version = cache.get(_version_key(namespace), 1)
+
+    return version
+
+
+def make_key(namespace: str, *parts: Any) -> str:
+    """Makes a cache key in namespace's current version.
+
+    Args:
+        namespace (str): Cache namespace.
+        parts (Any): Key parameters (e.g. items count).
+
+    Returns:
+        str: Versioned cache key.
+    """
+    return ":".join(
+        [namespace, f"v{get_namespace_version(namespace)}"]
+        + [str(part) for part in parts]
+    )
+
+
+def _increase_namespace_version(namespace: str):
+    try:
+        cache.incr(_version_key(namespace))
+    except ValueError:
+        # Version key doesn't exist (or has been evicted)
+        cache.set(_version_key(namespace), time.time_ns(), None)
+
+
+def invalidate_namespace(namespace: str):
+    """Invalidates all cached values of namespace.
+
+    Notes:
+        - Namespace gets invalidated immediately and once more after
+          current transaction commits. So, a value which is computed
+          during transaction (from old data) won't be kept in cache.
+
+    Args:
+        namespace (str): Cache namespace.
+    """
+    _increase_namespace_version(namespace)
+    transaction.on_commit(lambda: _increase_namespace_version(namespace))
+
+
+def get_or_set_locked(
+    key: str,
+    default: Callable[[], Any],
+    timeout: Optional[int] = None,
+    lock_timeout: int = 10,
+    poll_interval: float = 0.05,
+) -> Any:
+    """Returns cached value of key. Sets it by calling default() if it
+    doesn't exist. Unlike cache.get_or_set(), only one caller calculates
+    the value on a cold cache and others wait for its result
+    (cache stampede protection).
+
+    Args:
+        key (str): Cache key.
+        default (Callable[[], Any]): Calculates value to cache.
+        timeout (Optional[int], optional): Cache timeout (seconds).
+            Defaults to None (forever).
+        lock_timeout (int, optional): Max seconds to hold calculation lock
+            or wait for calculation result. Defaults to 10.
+        poll_interval (float, optional): Seconds between checking for
+            calculated value. Defaults to 0.05.
+
+    Returns:
+        Any: Cached or calculated value.
+    """
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    lock_key = f"{key}:lock"
+
+    # Only one caller can add the lock key
+    if cache.add(lock_key, True, lock_timeout):
+        try:
+            value = default()
+            cache.set(key, value, timeout)
+        finally:
+            cache.delete(lock_key)
+
+        return value
+
+    # Wait for lock holder to calculate value
+    deadline = time.monotonic() + lock_timeout
+    while time.monotonic() < deadline:
+        time.sleep(poll_interval)
+
+        value = cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        # Lock is released without setting value (calculation failed)
+        if cache.get(lock_key) is None:
+            break
+
+    # Lock holder failed or took too long
+    return default()
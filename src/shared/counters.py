@@ -0,0 +1,332 @@
+""" Write-behind counters
+
+When WRITE_BEHIND_COUNTERS setting is enabled, counter changes (e.g.
+tutorial's likes_count or user's scores) are not written to database
+immediately. They accumulate in a buffer (Redis or an in-process
+buffer) and are flushed periodically in batched UPDATE statements:
+
+    UPDATE table SET field = field + CASE id WHEN 1 THEN 3 ... END
+    WHERE id IN (1, ...)
+
+Counters of rows which may not exist yet (e.g. a tutorial's daily
+statistics) are buffered by a natural key (string) instead of primary
+key. Their model's manager resolves natural keys to primary keys (by
+creating missing rows) on flush using get_counter_pks().
+
+Counters are denormalized data. Relation rows (e.g. TutorialLike) are
+always the source of truth, so counters can be recalculated from them
+(see learning's reconcile_counters command).
+"""
+import logging
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Optional, Type, Union
+from django.apps import apps
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+
+logger = logging.getLogger("database")
+
+# (model label, primary key or natural key, field name)
+CounterKey = tuple[str, Union[int, str], str]
+
+
+def write_behind_counters_enabled() -> bool:
+    return getattr(settings, "WRITE_BEHIND_COUNTERS", False)
+
+
+class BaseCounterBuffer(ABC):
+    """Base class of counter buffers"""
+
+    def add(self, model: Type[models.Model], pk: int, field: str, value: int):
+        """Adds value to model object's counter field.
+
+        Args:
+            model (Type[models.Model]): Counter's model.
+            pk (int): Object's primary key.
+            field (str): Counter field name.
+            value (int): Value to add (negative to decrease).
+        """
+        if value:
+            self.add_many({(model._meta.label, pk, field): value})
+
+    @abstractmethod
+    def add_many(self, deltas: dict[CounterKey, int]):
+        """Adds values to counters.
+
+        Args:
+            deltas (dict[CounterKey, int]): Counters' keys to their values.
+        """
+
+    @abstractmethod
+    def pop_all(self) -> dict[CounterKey, int]:
+        """Removes all counters from buffer and returns them.
+
+        Returns:
+            dict[CounterKey, int]: Counters' keys to their values.
+        """
+
+
+class LocalCounterBuffer(BaseCounterBuffer):
+    """In-process counter buffer. It's suitable for development or
+    single process deployments because other processes (e.g.
+    flush_counters command) can't access it. Thus, it can flush
+    itself periodically in a background thread.
+    """
+
+    def __init__(self, flush_interval: Optional[float] = None):
+        self._counters: dict[CounterKey, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self._flush_interval = flush_interval
+        self._flusher: Optional[threading.Thread] = None
+
+    def add_many(self, deltas: dict[CounterKey, int]):
+        with self._lock:
+            for key, value in deltas.items():
+                self._counters[key] += value
+
+        self._ensure_flusher()
+
+    def pop_all(self) -> dict[CounterKey, int]:
+        with self._lock:
+            counters, self._counters = self._counters, defaultdict(int)
+
+        return {key: value for key, value in counters.items() if value}
+
+    def _ensure_flusher(self):
+        if not self._flush_interval or self._flusher:
+            return
+
+        with self._lock:
+            if not self._flusher:
+                self._flusher = threading.Thread(
+                    target=self._flush_periodically,
+                    name="counters-flusher",
+                    daemon=True,
+                )
+                self._flusher.start()
+
+    def _flush_periodically(self):
+        stop = threading.Event()
+
+        while not stop.wait(self._flush_interval):
+            try:
+                flush_counters(self)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Flushing write-behind counters failed")
+
+
+class RedisCounterBuffer(BaseCounterBuffer):
+    """Counter buffer which keeps counters in a Redis hash.
+    Shared between all processes.
+    """
+
+    def __init__(self, url: str, key: str = "majazamooz:counters"):
+        # pylint: disable=import-outside-toplevel
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._error_class = redis.ResponseError
+        self._key = key
+
+    def add_many(self, deltas: dict[CounterKey, int]):
+        pipeline = self._redis.pipeline()
+        for key, value in deltas.items():
+            pipeline.hincrby(self._key, self._serialize_key(key), value)
+        pipeline.execute()
+
+    def pop_all(self) -> dict[CounterKey, int]:
+        # Rename is atomic, so new counters go to a new hash
+        # while flushing counters of renamed one
+        flushing_key = f"{self._key}:flushing:{uuid.uuid4().hex}"
+        try:
+            self._redis.rename(self._key, flushing_key)
+        except self._error_class:
+            # Hash doesn't exist (there's no counter)
+            return {}
+
+        pipeline = self._redis.pipeline()
+        pipeline.hgetall(flushing_key)
+        pipeline.delete(flushing_key)
+        counters = pipeline.execute()[0]
+
+        return {
+            self._deserialize_key(key.decode()): int(value)
+            for key, value in counters.items()
+            if int(value)
+        }
+
+    @staticmethod
+    def _serialize_key(key: CounterKey) -> str:
+        return "{}:{}:{}".format(*key)
+
+    @staticmethod
+    def _deserialize_key(key: str) -> CounterKey:
+        label, pk, field = key.split(":")
+        return label, int(pk) if pk.isdigit() else pk, field
+
+
+_buffer: Optional[BaseCounterBuffer] = None
+_buffer_lock = threading.Lock()
+
+
+def get_counter_buffer() -> BaseCounterBuffer:
+    """Returns process-wide counter buffer configured by
+    WRITE_BEHIND_COUNTERS_REDIS_URL and
+    WRITE_BEHIND_COUNTERS_FLUSH_INTERVAL settings.
+
+    Returns:
+        BaseCounterBuffer: Redis buffer if redis url is set,
+            otherwise local buffer.
+    """
+    global _buffer  # pylint: disable=global-statement
+
+    with _buffer_lock:
+        if _buffer is None:
+            redis_url = getattr(
+                settings, "WRITE_BEHIND_COUNTERS_REDIS_URL", None
+            )
+            _buffer = (
+                RedisCounterBuffer(redis_url)
+                if redis_url
+                else LocalCounterBuffer(
+                    getattr(
+                        settings, "WRITE_BEHIND_COUNTERS_FLUSH_INTERVAL", 5
+                    )
+                )
+            )
+
+    return _buffer
+
+
+def buffer_counter_deltas(deltas: dict[CounterKey, int]):
+    """Adds values to counter buffer when current transaction commits
+    (immediately if there isn't any), so changes which are rolled back
+    (including savepoints' rollbacks) aren't buffered.
+
+    Args:
+        deltas (dict[CounterKey, int]): Counters' keys to their values.
+    """
+    deltas = {key: value for key, value in deltas.items() if value}
+    if deltas:
+        transaction.on_commit(lambda: get_counter_buffer().add_many(deltas))
+
+
+def resolve_counter_keys(
+    deltas: dict[CounterKey, int]
+) -> dict[CounterKey, int]:
+    """Replaces natural keys of counters with their rows' primary keys
+    using their model manager's get_counter_pks().
+
+    Args:
+        deltas (dict[CounterKey, int]): Counters' keys to their values.
+
+    Returns:
+        dict[CounterKey, int]: Counters' primary keys to their values.
+    """
+    natural_keys = defaultdict(set)
+    for label, pk, _ in deltas:
+        if isinstance(pk, str):
+            natural_keys[label].add(pk)
+
+    if not natural_keys:
+        return deltas
+
+    pks = {}
+    for label, keys in natural_keys.items():
+        manager = apps.get_model(label)._default_manager
+        for natural_key, pk in manager.get_counter_pks(keys).items():
+            pks[(label, natural_key)] = pk
+
+    resolved = defaultdict(int)
+    for (label, pk, field), value in deltas.items():
+        if isinstance(pk, str):
+            pk = pks.get((label, pk))
+            # Row can't be created (e.g. its tutorial is deleted), like
+            # counters of deleted rows which update nothing
+            if pk is None:
+                continue
+        resolved[(label, pk, field)] += value
+
+    return resolved
+
+
+def apply_counter_deltas(
+    deltas: dict[CounterKey, int], batch_size: int = 500
+) -> int:
+    """Adds values to counters in database. Counters of same model are
+    updated by a single UPDATE ... CASE statement (per batch). Natural
+    keys are resolved first (see resolve_counter_keys).
+
+    Args:
+        deltas (dict[CounterKey, int]): Counters' keys to their values.
+        batch_size (int, optional): Max objects count updated by each
+            statement. Defaults to 500.
+
+    Returns:
+        int: Count of updated rows.
+    """
+    # model label -> field -> primary key -> value
+    grouped = defaultdict(lambda: defaultdict(dict))
+    for (label, pk, field), value in resolve_counter_keys(deltas).items():
+        if value:
+            grouped[label][field][pk] = value
+
+    updated = 0
+    for label, fields in grouped.items():
+        model = apps.get_model(label)
+        pks = sorted(
+            set().union(*(values.keys() for values in fields.values()))
+        )
+
+        for start in range(0, len(pks), batch_size):
+            end = start + batch_size
+            batch_pks = pks[start:end]
+            updates = {
+                field: F(field)
+                + Case(
+                    *[
+                        When(pk=pk, then=Value(values[pk]))
+                        for pk in batch_pks
+                        if pk in values
+                    ],
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )
+                for field, values in fields.items()
+                if any(pk in values for pk in batch_pks)
+            }
+            updated += model._default_manager.filter(
+                pk__in=batch_pks
+            ).update(**updates)
+
+    return updated
+
+
+def flush_counters(buffer: Optional[BaseCounterBuffer] = None) -> int:
+    """Writes buffered counters to database.
+
+    Notes:
+        - Counters are returned to buffer if writing them fails.
+
+    Args:
+        buffer (Optional[BaseCounterBuffer], optional): Buffer to flush.
+            Defaults to get_counter_buffer().
+
+    Returns:
+        int: Count of updated rows.
+    """
+    buffer = buffer or get_counter_buffer()
+    deltas = buffer.pop_all()
+    if not deltas:
+        return 0
+
+    try:
+        with transaction.atomic():
+            return apply_counter_deltas(deltas)
+    except Exception:
+        buffer.add_many(deltas)
+        raise
@@ -1,8 +1,20 @@
-from typing import Optional, Generator
-from datetime import datetime, date
+""" Jalali date utilities
+
+Jalali months' Gregorian boundaries are precomputed once (when module
+is loaded) for JALALI_CALENDAR_YEARS. Thus, finding a month or bucketing
+many days into months is a lookup instead of jdatetime conversions.
+
+Month index: (jalali_year - first calendar year) * 12 + (jalali_month - 1)
+"""
+from array import array
+from typing import Iterable, Optional, Generator, Union
+from datetime import datetime, date, time
 from django.utils import timezone
 import jdatetime
 
+# Jalali years supported by precomputed calendar (1921-2122 Gregorian)
+JALALI_CALENDAR_YEARS = (1300, 1500)
+
 
 class JalaliMonth:
     def __init__(
@@ -33,47 +45,139 @@ def normalize_month(month: int):
     return (month - 1) % 12 + 1
 
 
+class JalaliCalendar:
+    """Precomputed Jalali months of a range of Jalali years.
+
+    Attributes:
+        month_starts (array): Gregorian ordinal of each month's first day
+            (and the day after last month) by month index.
+        day_months (array): Month index of each day by its offset from
+            first month's first day.
+    """
+
+    def __init__(self, first_year: int, last_year: int):
+        self.first_year = first_year
+
+        self.month_starts = array(
+            "l",
+            (
+                jdatetime.date(year, month, 1).togregorian().toordinal()
+                for year in range(first_year, last_year + 1)
+                for month in range(1, 13)
+            ),
+        )
+        # End of last month
+        self.month_starts.append(
+            jdatetime.date(last_year + 1, 1, 1).togregorian().toordinal()
+        )
+
+        self.day_months = array("H")
+        for index in range(len(self.month_starts) - 1):
+            self.day_months.extend(
+                [index]
+                * (self.month_starts[index + 1] - self.month_starts[index])
+            )
+
+    def get_month_index(self, day: date) -> int:
+        """Returns month index of given Gregorian day.
+
+        Raises:
+            ValueError: If day is out of calendar's range.
+        """
+        offset = day.toordinal() - self.month_starts[0]
+        if not 0 <= offset < len(self.day_months):
+            raise ValueError(f"{day} is out of Jalali calendar's range.")
+
+        return self.day_months[offset]
+
+    def bucket(self, days: Iterable[date]) -> list[int]:
+        """Maps Gregorian days to their month indexes in one pass.
+
+        Args:
+            days (Iterable[date]): Gregorian days.
+
+        Raises:
+            ValueError: If a day is out of calendar's range.
+
+        Returns:
+            list[int]: Month index of each day.
+        """
+        first_ordinal = self.month_starts[0]
+        day_months = self.day_months
+
+        try:
+            return [
+                day_months[day.toordinal() - first_ordinal] for day in days
+            ]
+        except IndexError as ex:
+            raise ValueError(
+                "A day is out of Jalali calendar's range."
+            ) from ex
+
+    def get_month(self, index: int) -> "JalaliMonth":
+        """Returns JalaliMonth of given month index."""
+        year, month = divmod(index, 12)
+
+        return JalaliMonth(
+            datetime.combine(
+                date.fromordinal(self.month_starts[index]), time()
+            ),
+            datetime.combine(
+                date.fromordinal(self.month_starts[index + 1]), time()
+            ),
+            f"{jdatetime.date.j_months_fa[month]} {self.first_year + year}",
+        )
+
+
+calendar = JalaliCalendar(*JALALI_CALENDAR_YEARS)
+
+
+def to_local_date(value: Union[date, datetime]) -> date:
+    """Returns date of given value (in current timezone if it's
+    an aware datetime).
+    """
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            return timezone.localdate(value)
+        return value.date()
+
+    return value
+
+
+def to_default_local_date(value: datetime) -> date:
+    """Returns date of given aware datetime in default timezone
+    (TIME_ZONE setting) regardless of current (e.g. request's) timezone.
+    Daily rollups use it, so all requests bucket objects into same days.
+    """
+    return timezone.localdate(value, timezone.get_default_timezone())
+
+
+def bucket_month_indexes(values: Iterable[Union[date, datetime]]) -> list:
+    """Maps dates/datetimes to their Jalali month indexes.
+
+    Args:
+        values (Iterable[Union[date, datetime]]): Dates or datetimes.
+
+    Returns:
+        list[int]: Month index of each value.
+    """
+    return calendar.bucket(to_local_date(value) for value in values)
+
+
 def get_last_months(
     count: int = 1, today: Optional[date] = None
 ) -> Generator[JalaliMonth, None, None]:
+    """Yields last given Jalali months (including today's month)
+    in descending order.
 
+    Args:
+        count (int, optional): Count of months. Defaults to 1.
+        today (Optional[date], optional): Defaults to today.
+    """
     if not today:
         today = date.today()
 
-    jdatetime.set_locale("fa_IR")
-    today_jalali = jdatetime.date.fromgregorian(date=today)
-
-    # Year will decrease if month<0
-    year = today_jalali.year
-    # Month will decrease in every loop
-    month = today_jalali.month + 1
-
-    # for each last month
-    for _ in range(count):
-
-        # Decrease 1 month, If result is negative
-        # decrease year and normalize month
-        month -= 1
-        if month <= 0:
-            year -= 1
-            month = normalize_month(month)
-
-        start_date = jdatetime.datetime(year, month, 1)
-
-        # end_date_month is 1 month after start. If result is more than 12,
-        # set end_date_year to 1 year after start year and normalize month,
-        # otherwise set  to start date year.
-        end_date_month = month + 1
-        if month >= 12:
-            end_date_month = normalize_month(end_date_month)
-            end_date_year = year + 1
-        else:
-            end_date_year = year
-
-        end_date = jdatetime.datetime(end_date_year, end_date_month, 1)
-
-        yield JalaliMonth(
-            start_date.togregorian(),
-            end_date.togregorian(),
-            start_date.strftime("%b %Y"),
-        )
+    index = calendar.get_month_index(today)
+
+    for month_index in range(index, index - count, -1):
+        yield calendar.get_month(month_index)
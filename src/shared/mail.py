@@ -0,0 +1,397 @@
+""" Outbound email queue
+
+Emails are stored in QueuedEmail table instead of being sent during
+request/response cycle. send_queued_emails command drains the queue
+using a single (reused) email backend connection and retries failed
+messages with exponential backoff.
+
+Some notifications can be collected as DigestEntry objects instead
+(keeping the notification's rendered email fragment). send_digests()
+groups them per kind and recipient and queues a single email for each
+group once its oldest entry is older than digest window.
+"""
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import timedelta
+from smtplib import SMTPException
+from itertools import groupby
+from typing import Iterable
+from django.core.mail import EmailMessage, EmailMultiAlternatives
+from django.core.mail import get_connection
+from django.db import transaction
+from django.db.models import Min
+from django.template.loader import render_to_string
+from django.utils import timezone
+from shared.models import DigestEntry, QueuedEmail, QueuedEmailStatusChoices
+
+logger = logging.getLogger("emails")
+
+_bulk_queue = threading.local()
+
+# Queued emails which are claimed by a worker won't be claimed by
+# others for this duration (also if the worker dies while sending them)
+CLAIM_TIMEOUT = timedelta(minutes=10)
+
+
+@dataclass
+class QueueSendResult:
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+
+    def __add__(self, other):
+        return QueueSendResult(
+            self.sent + other.sent,
+            self.retried + other.retried,
+            self.failed + other.failed,
+        )
+
+
+def _to_queued_email(message: EmailMessage) -> QueuedEmail:
+    return QueuedEmail(
+        subject=message.subject,
+        body=message.body or "",
+        from_email=message.from_email or "",
+        to=list(message.to),
+        alternatives=[
+            list(alternative)
+            for alternative in getattr(message, "alternatives", [])
+        ],
+    )
+
+
+def _to_message(queued_email: QueuedEmail) -> EmailMultiAlternatives:
+    message = EmailMultiAlternatives(
+        queued_email.subject,
+        queued_email.body,
+        queued_email.from_email or None,
+        queued_email.to,
+    )
+
+    for content, mimetype in queued_email.alternatives:
+        message.attach_alternative(content, mimetype)
+
+    return message
+
+
+def queue_email(message: EmailMessage) -> QueuedEmail:
+    """Adds message to outbound email queue. Inside bulk_queue()
+    block, the returned object is saved when the block exits.
+
+    Args:
+        message (EmailMessage): Message to send.
+
+    Returns:
+        QueuedEmail: Queued email object.
+    """
+    queued_email = _to_queued_email(message)
+
+    pending = getattr(_bulk_queue, "pending", None)
+    if pending is not None:
+        pending.append(queued_email)
+    else:
+        queued_email.save()
+
+    return queued_email
+
+
+@contextmanager
+def bulk_queue(batch_size: int = 500):
+    """Emails queued by queue_email() inside this block are inserted
+    together (by batched queries) when the block exits.
+
+    Args:
+        batch_size (int, optional): Max count of emails inserted by
+            each query. Defaults to 500.
+    """
+    if getattr(_bulk_queue, "pending", None) is not None:
+        # Nested block, outermost one inserts emails
+        yield
+        return
+
+    _bulk_queue.pending = []
+    try:
+        yield
+        pending = _bulk_queue.pending
+    finally:
+        _bulk_queue.pending = None
+
+    QueuedEmail.objects.bulk_create(pending, batch_size=batch_size)
+
+
+def queue_emails(messages: Iterable[EmailMessage]) -> int:
+    """Adds messages to outbound email queue using a single query.
+
+    Args:
+        messages (Iterable[EmailMessage]): Messages to send.
+
+    Returns:
+        int: Count of queued messages.
+    """
+    return len(
+        QueuedEmail.objects.bulk_create(
+            [_to_queued_email(message) for message in messages]
+        )
+    )
+
+
+def get_retry_delay(attempts: int, base_delay: int = 60) -> timedelta:
+    """Returns delay before next attempt (exponential backoff).
+
+    Args:
+        attempts (int): Count of failed attempts.
+        base_delay (int, optional): Delay after first failure (seconds).
+            Defaults to 60.
+
+    Returns:
+        timedelta: Delay before next attempt.
+    """
+    return timedelta(seconds=base_delay * 2 ** max(attempts - 1, 0))
+
+
+# Errors of opening connection and sending messages (e.g. socket.timeout)
+SEND_ERRORS = (SMTPException, OSError)
+
+
+def claim_queued_emails(batch_size: int) -> list[QueuedEmail]:
+    """Claims a batch of sendable queued emails. Claimed emails are
+    postponed by CLAIM_TIMEOUT so other workers skip them.
+
+    Args:
+        batch_size (int): Max count of emails to claim.
+
+    Returns:
+        list[QueuedEmail]: Claimed emails.
+    """
+    now = timezone.now()
+
+    with transaction.atomic():
+        queued_emails = list(
+            QueuedEmail.objects.select_for_update(skip_locked=True)
+            .filter(
+                status=QueuedEmailStatusChoices.PENDING,
+                next_attempt_date__lte=now,
+            )
+            .order_by("next_attempt_date", "pk")[:batch_size]
+        )
+        QueuedEmail.objects.filter(
+            pk__in=[queued_email.pk for queued_email in queued_emails]
+        ).update(next_attempt_date=now + CLAIM_TIMEOUT)
+
+    return queued_emails
+
+
+def _save_send_results(
+    sent: list[QueuedEmail],
+    unsent: list[QueuedEmail],
+    max_attempts: int,
+    retry_delay: int,
+) -> QueueSendResult:
+    result = QueueSendResult(sent=len(sent))
+    now = timezone.now()
+
+    QueuedEmail.objects.filter(
+        pk__in=[queued_email.pk for queued_email in sent]
+    ).update(status=QueuedEmailStatusChoices.SENT, sent_date=now)
+
+    for queued_email in unsent:
+        queued_email.attempts += 1
+
+        if queued_email.attempts >= max_attempts:
+            queued_email.status = QueuedEmailStatusChoices.FAILED
+            result.failed += 1
+        else:
+            queued_email.next_attempt_date = now + get_retry_delay(
+                queued_email.attempts, retry_delay
+            )
+            result.retried += 1
+
+    QueuedEmail.objects.bulk_update(
+        unsent, ["attempts", "status", "next_attempt_date", "last_error"]
+    )
+
+    return result
+
+
+def send_queued_emails(
+    batch_size: int = 100,
+    max_attempts: int = 5,
+    retry_delay: int = 60,
+    connection=None,
+) -> QueueSendResult:
+    """Sends a batch of queued emails through one email backend
+    connection.
+
+    Notes:
+        - Messages are passed to connection one by one (on the same
+          opened connection) to know the result of each one.
+        - Messages which fail with SMTPException or OSError (e.g.
+          socket timeout) are retried with exponential backoff until
+          max_attempts. If connection can't be (re)opened, the rest of
+          batch fails (counts as an attempt) too.
+
+    Args:
+        batch_size (int, optional): Max count of emails to send.
+            Defaults to 100.
+        max_attempts (int, optional): Max sending attempts of each email.
+            Defaults to 5.
+        retry_delay (int, optional): Delay before first retry (seconds).
+            Defaults to 60.
+        connection (optional): Email backend connection.
+            Defaults to get_connection().
+
+    Returns:
+        QueueSendResult: Count of sent, retried and failed emails.
+    """
+    queued_emails = claim_queued_emails(batch_size)
+    if not queued_emails:
+        return QueueSendResult()
+
+    connection = connection or get_connection()
+    sent, unsent = [], []
+    # Error of (re)opening connection which fails the rest of batch
+    connection_error = None
+
+    try:
+        try:
+            connection.open()
+        except SEND_ERRORS as ex:
+            logger.warning(ex)
+            connection_error = ex
+
+        for queued_email in queued_emails:
+            if connection_error is not None:
+                queued_email.last_error = str(connection_error)
+                unsent.append(queued_email)
+                continue
+
+            try:
+                connection.send_messages([_to_message(queued_email)])
+                sent.append(queued_email)
+            except SEND_ERRORS as ex:
+                logger.warning(ex)
+                queued_email.last_error = str(ex)
+                unsent.append(queued_email)
+
+                # Connection may be broken, reconnect for next messages
+                try:
+                    connection.close()
+                    connection.open()
+                except SEND_ERRORS as reconnect_ex:
+                    logger.warning(reconnect_ex)
+                    connection_error = reconnect_ex
+    finally:
+        try:
+            connection.close()
+        except SEND_ERRORS as ex:
+            logger.warning(ex)
+
+        # Save results even if sending fails unexpectedly (to not send
+        # them again)
+        result = _save_send_results(sent, unsent, max_attempts, retry_delay)
+
+    return result
+
+
+def drain_email_queue(
+    batch_size: int = 100, connection=None, **kwargs
+) -> QueueSendResult:
+    """Sends queued emails batch by batch until no sendable email
+    remains.
+
+    Args:
+        batch_size (int, optional): Count of emails in each batch.
+            Defaults to 100.
+        connection (optional): Email backend connection.
+            Defaults to get_connection().
+        kwargs: Other send_queued_emails() arguments.
+
+    Returns:
+        QueueSendResult: Count of sent, retried and failed emails.
+    """
+    result = QueueSendResult()
+
+    while True:
+        batch_result = send_queued_emails(
+            batch_size, connection=connection, **kwargs
+        )
+        result += batch_result
+
+        if (
+            batch_result.sent + batch_result.retried + batch_result.failed
+            < batch_size
+        ):
+            return result
+
+
+def send_digests(
+    window: timedelta, template: str = "mails/digest.html"
+) -> int:
+    """Queues a digest email for each (kind, recipient) group of digest
+    entries whose oldest entry is older than window, then deletes
+    the group's entries.
+
+    Args:
+        window (timedelta): Time to collect entries of a group before
+            sending them.
+        template (str, optional): Digest email template.
+            Defaults to "mails/digest.html".
+
+    Returns:
+        int: Count of queued digest emails.
+    """
+    now = timezone.now()
+    due_groups = set(
+        DigestEntry.objects.values("kind", "recipient")
+        .annotate(first_date=Min("create_date"))
+        .filter(first_date__lte=now - window)
+        .values_list("kind", "recipient")
+    )
+    if not due_groups:
+        return 0
+
+    entries = [
+        entry
+        for entry in DigestEntry.objects.filter(
+            recipient__in={recipient for _, recipient in due_groups},
+            create_date__lte=now,
+        ).order_by("kind", "recipient", "create_date")
+        if (entry.kind, entry.recipient) in due_groups
+    ]
+
+    messages = []
+    for (_, recipient), group in groupby(
+        entries, key=lambda entry: (entry.kind, entry.recipient)
+    ):
+        group = list(group)
+        subject = group[-1].subject
+        recipient_name = group[-1].recipient_name
+        message = EmailMultiAlternatives(
+            subject,
+            "\n\n".join(
+                f"{entry.message}\n{entry.url}".strip() for entry in group
+            ),
+            to=[recipient],
+        )
+        message.attach_alternative(
+            render_to_string(
+                template,
+                {
+                    "subject": subject,
+                    "recipient_name": recipient_name,
+                    "entries": group,
+                },
+            ),
+            "text/html",
+        )
+        messages.append(message)
+
+    with transaction.atomic():
+        queue_emails(messages)
+        DigestEntry.objects.filter(
+            pk__in=[entry.pk for entry in entries]
+        ).delete()
+
+    return len(messages)
@@ -0,0 +1,61 @@
+import time
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from shared.mail import drain_email_queue, queue_emails
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures throughput (messages/second) of queueing and sending "
+        "emails through the email queue using locmem email backend. "
+        "Database changes are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--count",
+            type=int,
+            default=1000,
+            help="Count of emails to queue and send.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Count of emails sent through each connection.",
+        )
+
+    def handle(self, *args, **options):
+        count = options["count"]
+        connection = get_connection(
+            "django.core.mail.backends.locmem.EmailBackend"
+        )
+        messages = [
+            EmailMultiAlternatives(
+                f"Subject {number}",
+                "Plain message",
+                to=[f"user{number}@example.com"],
+                alternatives=[("<p>Html message</p>", "text/html")],
+            )
+            for number in range(count)
+        ]
+
+        with transaction.atomic():
+            start = time.perf_counter()
+            queue_emails(messages)
+            queue_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            result = drain_email_queue(
+                options["batch_size"], connection=connection
+            )
+            send_elapsed = time.perf_counter() - start
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"queue: {count / queue_elapsed:,.0f} messages/s")
+        self.stdout.write(
+            f"send: {result.sent / send_elapsed:,.0f} messages/s "
+            f"({result.sent} sent, {result.failed + result.retried} failed)"
+        )
@@ -0,0 +1,32 @@
+import time
+from django.core.management.base import BaseCommand
+from shared.counters import flush_counters
+
+
+class Command(BaseCommand):
+    help = "Writes buffered write-behind counters to database."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help=(
+                "Keep running and flush counters every given seconds. "
+                "Flushes once if not given."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        interval = options["interval"]
+
+        while True:
+            updated = flush_counters()
+            self.stdout.write(
+                self.style.SUCCESS(f"{updated} counter rows updated.")
+            )
+
+            if not interval:
+                break
+
+            time.sleep(interval)
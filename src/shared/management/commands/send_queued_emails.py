@@ -0,0 +1,60 @@
+import time
+from django.core.management.base import BaseCommand
+from shared.mail import drain_email_queue
+
+
+class Command(BaseCommand):
+    help = (
+        "Sends queued emails using a single email backend connection "
+        "per batch and retries failed ones with exponential backoff."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Count of emails sent through each connection.",
+        )
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            default=5,
+            help="Max sending attempts of each email.",
+        )
+        parser.add_argument(
+            "--retry-delay",
+            type=int,
+            default=60,
+            help="Delay before first retry in seconds (doubles each time).",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help=(
+                "Keep running and check queue every given seconds. "
+                "Drains queue once if not given."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        interval = options["interval"]
+
+        while True:
+            result = drain_email_queue(
+                options["batch_size"],
+                max_attempts=options["max_attempts"],
+                retry_delay=options["retry_delay"],
+            )
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{result.sent} sent, {result.retried} will be retried, "
+                    f"{result.failed} failed."
+                )
+            )
+
+            if not interval:
+                break
+
+            time.sleep(interval)
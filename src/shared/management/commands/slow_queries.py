@@ -0,0 +1,104 @@
+import json
+from django.core.management.base import BaseCommand
+from shared.slow_queries import (
+    HISTOGRAM_BUCKETS_MS,
+    aggregate_slow_queries,
+    clear_slow_queries,
+    collect_slow_queries,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Prints top slow query fingerprints (by total time) recorded by "
+        "all processes (see SLOW_QUERY_THRESHOLD_MS setting)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=20,
+            help="Count of fingerprints to print.",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Print fingerprints as JSON.",
+        )
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Remove recorded slow queries after printing them.",
+        )
+
+    def handle(self, *args, **options):
+        statistics = aggregate_slow_queries(collect_slow_queries())[
+            : options["limit"]
+        ]
+
+        if options["json"]:
+            self.stdout.write(
+                json.dumps(
+                    [
+                        {
+                            "id": item.id,
+                            "fingerprint": item.fingerprint,
+                            "count": item.count,
+                            "total_ms": round(item.total_ms, 3),
+                            "avg_ms": round(item.avg_ms, 3),
+                            "max_ms": item.max_ms,
+                            "histogram": dict(
+                                zip(self.get_bucket_labels(), item.histogram)
+                            ),
+                            "call_sites": dict(item.call_sites),
+                            "entry_points": dict(item.entry_points),
+                        }
+                        for item in statistics
+                    ],
+                    indent=4,
+                )
+            )
+        elif not statistics:
+            self.stdout.write("No slow queries recorded.")
+
+        else:
+            for rank, item in enumerate(statistics, 1):
+                self.print_statistics(rank, item)
+
+        if options["clear"]:
+            clear_slow_queries()
+
+    def print_statistics(self, rank: int, item):
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(
+                f"#{rank} [{item.id}] total={item.total_ms:.1f}ms "
+                f"count={item.count} avg={item.avg_ms:.1f}ms "
+                f"max={item.max_ms:.1f}ms"
+            )
+        )
+        self.stdout.write(f"  {item.fingerprint}")
+
+        self.stdout.write(
+            "  histogram: "
+            + " ".join(
+                f"{label}:{count}"
+                for label, count in zip(
+                    self.get_bucket_labels(), item.histogram
+                )
+                if count
+            )
+        )
+
+        for title, counter in [
+            ("call sites", item.call_sites),
+            ("entry points", item.entry_points),
+        ]:
+            for site, count in counter.most_common(3):
+                self.stdout.write(f"  {title}: {site} ({count})")
+
+    @staticmethod
+    def get_bucket_labels() -> list[str]:
+        return [f"<={bound}ms" for bound in HISTOGRAM_BUCKETS_MS] + [
+            f">{HISTOGRAM_BUCKETS_MS[-1]}ms"
+        ]
@@ -1,7 +1,9 @@
 from .authentication import LoginRequiredMiddleware
+from .profiling import ProfilingMiddleware
 from .timezone import TimezoneMiddleware
 
 __all__ = [
     "LoginRequiredMiddleware",
+    "ProfilingMiddleware",
     "TimezoneMiddleware",
 ]
@@ -1,25 +1,45 @@
 import re
+from asyncio import iscoroutinefunction
 from django.conf import settings
 from django.http import HttpResponseRedirect
+from django.utils.decorators import sync_and_async_middleware
+from shared.asynchronous import database_sync_to_async
 
 
-class LoginRequiredMiddleware:
-    def __init__(self, get_response):
-        self.get_response = get_response
+@sync_and_async_middleware
+def LoginRequiredMiddleware(get_response):  # pylint: disable=invalid-name
+    urls = [
+        re.compile(url) for url in getattr(settings, "LOGIN_REQUIRED_URLS", [])
+    ]
 
-        self.urls = [
-            re.compile(url)
-            for url in getattr(settings, "LOGIN_REQUIRED_URLS", [])
-        ]
+    login_url = getattr(settings, "LOGIN_URL", "/auth/login/")
 
-        self.login_url = getattr(settings, "LOGIN_URL", "/auth/login/")
-
-    def __call__(self, request):
-
-        for url in self.urls:
+    def process_request(request):
+        for url in urls:
             if url.match(request.path) and request.user.is_anonymous:
                 return HttpResponseRedirect(
-                    "{}?next={}".format(self.login_url, request.path)
+                    "{}?next={}".format(login_url, request.path)
                 )
 
-        return self.get_response(request)
+        return None
+
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            if any(url.match(request.path) for url in urls):
+                # Loading user queries the database
+                response = await database_sync_to_async(process_request)(
+                    request
+                )
+                if response:
+                    return response
+
+            return await get_response(request)
+
+    else:
+
+        def middleware(request):
+            response = process_request(request)
+            return response or get_response(request)
+
+    return middleware
@@ -0,0 +1,183 @@
+import logging
+import random
+import threading
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.backends.django import Template
+
+logger = logging.getLogger("profiling")
+
+_MISSING = object()
+
+# Profile of current thread's request (if it's sampled)
+_local = threading.local()
+
+
+@dataclass
+class RequestProfile:
+    """Measurements of a profiled request."""
+
+    db_queries: int = 0
+    db_time: float = 0.0
+    template_time: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    rendering: bool = False
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.db_queries += 1
+
+
+def _install_template_profiling():
+    """Wraps Django templates' render() (once) to add rendering time of
+    top-level templates (including templates they include or render) to
+    current thread's profile.
+    """
+    render = Template.render
+    if getattr(render, "profiled", False):
+        return
+
+    def profiled_render(self, context=None, request=None):
+        profile = getattr(_local, "profile", None)
+        if profile is None or profile.rendering:
+            return render(self, context, request)
+
+        profile.rendering = True
+        start = time.perf_counter()
+        try:
+            return render(self, context, request)
+        finally:
+            profile.template_time += time.perf_counter() - start
+            profile.rendering = False
+
+    profiled_render.profiled = True
+    Template.render = profiled_render
+
+
+class ProfilingMiddleware:
+    """Profiles a sample of requests (settings.PROFILING_SAMPLE_RATE,
+    0 to 1) and reports their wall time, database queries count and
+    time, template rendering time and cache hits/misses as Server-Timing
+    header (if settings.PROFILING_SERVER_TIMING is True) and "profiling"
+    logger's JSON records.
+
+    Only profiled requests are instrumented. Database queries are wrapped
+    by connection.execute_wrapper() and cache get()/get_many() methods of
+    request's thread cache connections are wrapped for the request, so
+    other requests aren't affected. Template rendering is timed by a
+    wrapper which only costs a thread-local lookup when the request
+    isn't profiled.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+        self.sample_rate = getattr(settings, "PROFILING_SAMPLE_RATE", 0.0)
+        self.server_timing = getattr(settings, "PROFILING_SERVER_TIMING", True)
+
+        if not self.sample_rate:
+            # Removes the (sync only) middleware from the chain, so it
+            # doesn't cost a sync/async switch per request under ASGI
+            raise MiddlewareNotUsed()
+
+        _install_template_profiling()
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        profile = RequestProfile()
+        start = time.perf_counter()
+
+        with ExitStack() as stack:
+            _local.profile = profile
+            stack.callback(delattr, _local, "profile")
+
+            for connection in connections.all():
+                stack.enter_context(
+                    connection.execute_wrapper(profile.db_wrapper)
+                )
+            for cache in caches.all():
+                stack.callback(self.instrument_cache(cache, profile))
+
+            response = self.get_response(request)
+
+        total_time = time.perf_counter() - start
+
+        if self.server_timing:
+            response["Server-Timing"] = self.get_server_timing(
+                profile, total_time
+            )
+
+        logger.info(
+            "Request profile",
+            extra={
+                "method": request.method,
+                "path": request.path,
+                "view": getattr(request.resolver_match, "view_name", None),
+                "status_code": response.status_code,
+                "total_ms": round(total_time * 1000, 2),
+                "db_queries": profile.db_queries,
+                "db_ms": round(profile.db_time * 1000, 2),
+                "template_ms": round(profile.template_time * 1000, 2),
+                "cache_hits": profile.cache_hits,
+                "cache_misses": profile.cache_misses,
+            },
+        )
+
+        return response
+
+    @staticmethod
+    def instrument_cache(cache, profile: RequestProfile):
+        """Wraps cache's get() and get_many() to count hits and misses.
+
+        Returns:
+            Callable: Restores cache's original methods.
+        """
+        get, get_many = cache.get, cache.get_many
+
+        def profiled_get(key, default=None, version=None):
+            value = get(key, _MISSING, version)
+            if value is _MISSING:
+                profile.cache_misses += 1
+                return default
+
+            profile.cache_hits += 1
+            return value
+
+        def profiled_get_many(keys, version=None):
+            keys = list(keys)
+            values = get_many(keys, version)
+            profile.cache_hits += len(values)
+            profile.cache_misses += len(keys) - len(values)
+            return values
+
+        cache.get, cache.get_many = profiled_get, profiled_get_many
+
+        def restore():
+            del cache.get, cache.get_many
+
+        return restore
+
+    @staticmethod
+    def get_server_timing(profile: RequestProfile, total_time: float) -> str:
+        return ", ".join(
+            [
+                f"total;dur={total_time * 1000:.2f}",
+                f'db;dur={profile.db_time * 1000:.2f};'
+                f'desc="{profile.db_queries} queries"',
+                f"template;dur={profile.template_time * 1000:.2f}",
+                f'cache;desc="{profile.cache_hits} hits, '
+                f'{profile.cache_misses} misses"',
+            ]
+        )
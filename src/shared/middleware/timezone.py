@@ -1,26 +1,49 @@
 import pytz
 
+from asyncio import iscoroutinefunction
 from django.utils import timezone
+from django.utils.decorators import sync_and_async_middleware
 from django.conf import settings
+from shared.asynchronous import database_sync_to_async
 
 
-class TimezoneMiddleware:
-    def __init__(self, get_response):
-        self.get_response = get_response
+@sync_and_async_middleware
+def TimezoneMiddleware(get_response):  # pylint: disable=invalid-name
+    if iscoroutinefunction(get_response):
 
-    def __call__(self, request):
-        # get default user timezone from settins.
-        # defaults to settings TIME_ZONE
-        default_timezone = getattr(
-            settings, "DEFAULT_USER_TZ", settings.TIME_ZONE
-        )
-        # Try to get timezone from user's session
-        tz_name = request.session.get("timezone", default_timezone)
-        # Activate timezone
-        timezone.activate(pytz.timezone(tz_name))
+        async def middleware(request):
+            # Loading session queries the database
+            tz_name = await database_sync_to_async(get_timezone_name)(
+                request
+            )
+            # Activated timezone is context-local, so it's inherited by
+            # sync_to_async() calls of the view
+            timezone.activate(pytz.timezone(tz_name))
 
-        # Get response and set Time-Zone header
-        response = self.get_response(request)
-        response["Time-Zone"] = tz_name
+            response = await get_response(request)
+            response["Time-Zone"] = tz_name
 
-        return response
+            return response
+
+    else:
+
+        def middleware(request):
+            tz_name = get_timezone_name(request)
+            # Activate timezone
+            timezone.activate(pytz.timezone(tz_name))
+
+            # Get response and set Time-Zone header
+            response = get_response(request)
+            response["Time-Zone"] = tz_name
+
+            return response
+
+    return middleware
+
+
+def get_timezone_name(request) -> str:
+    # get default user timezone from settins.
+    # defaults to settings TIME_ZONE
+    default_timezone = getattr(settings, "DEFAULT_USER_TZ", settings.TIME_ZONE)
+    # Try to get timezone from user's session
+    return request.session.get("timezone", default_timezone)
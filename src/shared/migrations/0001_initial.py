@@ -0,0 +1,40 @@
+# Generated by Django 3.2.4 on 2026-10-18 13:54
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueuedEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=998, verbose_name='موضوع')),
+                ('body', models.TextField(blank=True, verbose_name='متن')),
+                ('from_email', models.CharField(blank=True, max_length=254, verbose_name='فرستنده')),
+                ('to', models.JSONField(default=list, verbose_name='گیرندگان')),
+                ('alternatives', models.JSONField(default=list, verbose_name='جایگزین ها')),
+                ('status', models.IntegerField(choices=[(0, 'در صف ارسال'), (1, 'ارسال شده'), (-1, 'ناموفق')], default=0, verbose_name='وضعیت')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='تعداد تلاش ها')),
+                ('last_error', models.TextField(blank=True, verbose_name='آخرین خطا')),
+                ('create_date', models.DateTimeField(auto_now_add=True, verbose_name='زمان ایجاد')),
+                ('next_attempt_date', models.DateTimeField(default=django.utils.timezone.now, verbose_name='زمان تلاش بعدی')),
+                ('sent_date', models.DateTimeField(blank=True, null=True, verbose_name='زمان ارسال')),
+            ],
+            options={
+                'verbose_name': 'ایمیل در صف',
+                'verbose_name_plural': 'ایمیل های در صف',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='queuedemail',
+            index=models.Index(fields=['status', 'next_attempt_date'], name='queued_email_pending_idx'),
+        ),
+    ]
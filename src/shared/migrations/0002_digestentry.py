@@ -0,0 +1,33 @@
+# Generated by Django 3.2.4 on 2026-10-18 13:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shared', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DigestEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=50, verbose_name='نوع')),
+                ('recipient', models.EmailField(max_length=254, verbose_name='گیرنده')),
+                ('subject', models.CharField(max_length=255, verbose_name='موضوع')),
+                ('message', models.TextField(verbose_name='متن')),
+                ('url', models.URLField(blank=True, max_length=2048, verbose_name='لینک')),
+                ('create_date', models.DateTimeField(auto_now_add=True, verbose_name='زمان ایجاد')),
+            ],
+            options={
+                'verbose_name': 'اطلاعیه خلاصه',
+                'verbose_name_plural': 'اطلاعیه های خلاصه',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='digestentry',
+            index=models.Index(fields=['kind', 'recipient', 'create_date'], name='digest_entry_group_idx'),
+        ),
+    ]
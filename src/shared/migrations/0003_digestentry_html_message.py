@@ -0,0 +1,23 @@
+# Generated by Django 3.2.4 on 2026-10-18 15:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shared', '0002_digestentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='digestentry',
+            name='html_message',
+            field=models.TextField(blank=True, verbose_name='متن HTML'),
+        ),
+        migrations.AddField(
+            model_name='digestentry',
+            name='recipient_name',
+            field=models.CharField(blank=True, max_length=150, verbose_name='نام گیرنده'),
+        ),
+    ]
@@ -1,9 +1,14 @@
 from .abstract_models import AbstractScoreCoinModel
-from .choices import ConfirmStatusChoices
+from .choices import ConfirmStatusChoices, QueuedEmailStatusChoices
 from .fields import BleachField
+from .queued_email import QueuedEmail
+from .digest_entry import DigestEntry
 
 __all__ = [
     "AbstractScoreCoinModel",
     "ConfirmStatusChoices",
+    "QueuedEmailStatusChoices",
     "BleachField",
+    "QueuedEmail",
+    "DigestEntry",
 ]
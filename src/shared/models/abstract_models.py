@@ -1,11 +1,67 @@
-from django.db import models
-from django_lifecycle import LifecycleModel, BEFORE_CREATE, hook
+from typing import Optional
+from django.db import connections, models, router, transaction
+from django.db.models.sql import DeleteQuery, InsertQuery
+from django_lifecycle import (
+    LifecycleModel,
+    hook,
+    BEFORE_CREATE,
+    BEFORE_SAVE,
+    AFTER_CREATE,
+    AFTER_SAVE,
+    BEFORE_DELETE,
+    AFTER_DELETE,
+)
+
+
+def run_lifecycle_hooks(
+    obj: LifecycleModel, *hooks: str, snapshot_state: bool = False
+):
+    """Runs object's lifecycle hooked methods of given hooks in order
+    (as django_lifecycle does in save() and delete()).
+
+    Notes:
+        - django_lifecycle has no public API to run hooks outside of
+          save() and delete(), so it calls LifecycleModelMixin's
+          _run_hooked_methods and _snapshot_state (django-lifecycle
+          0.9, pinned in Pipfile). Tests of shared.tests.test_models
+          fail if that API changes.
+
+    Args:
+        obj (LifecycleModel): Model object.
+        hooks (str): Hooks to run (e.g. AFTER_CREATE).
+        snapshot_state (bool, optional): Whether to take object's
+            current state as its initial state afterwards (as save()
+            does, so has_changed() compares with the saved values).
+            Defaults to False.
+    """
+    for hook_name in hooks:
+        obj._run_hooked_methods(hook_name)
+
+    if snapshot_state:
+        obj._initial_state = obj._snapshot_state()
+
+
+def supports_delete_returning(connection) -> bool:
+    """Whether connection's database supports DELETE ... RETURNING."""
+    if connection.vendor == "postgresql":
+        return True
+    if connection.vendor == "sqlite":
+        return connection.Database.sqlite_version_info >= (3, 35, 0)
+
+    return False
 
 
 class AbstractScoreCoinModel(LifecycleModel):
     """
     Abstract score-coin model for using in
     score-coin based models like upvote, like, etc.
+
+    Notes:
+        - insert_if_not_exists, bulk_insert_if_not_exist,
+          delete_if_exists and toggle write by raw queries and only run
+          lifecycle hooks. Model signals (pre_save, post_save,
+          pre_delete and post_delete) aren't sent, so these models must
+          not rely on signal receivers.
     """
 
     score = models.IntegerField(
@@ -40,3 +96,158 @@ class AbstractScoreCoinModel(LifecycleModel):
     def before_create(self):
         self.score = self.get_create_score()
         self.coin = self.get_create_coin()
+
+    def insert_if_not_exists(self, using=None) -> bool:
+        """Inserts object by a single INSERT ... ON CONFLICT DO NOTHING
+        query (model needs a unique constraint to detect duplicates).
+        Lifecycle hooks of creation run as save() does, but after-create
+        hooks only run if object is inserted.
+
+        Note: Object's pk isn't set.
+
+        Args:
+            using (str, optional): Database alias. Defaults to None.
+
+        Returns:
+            bool: Whether object is inserted.
+        """
+        using = using or router.db_for_write(self.__class__, instance=self)
+
+        if not self.bulk_insert_if_not_exist([self], using=using):
+            return False
+
+        self._state.adding = False
+        self._state.db = using
+
+        run_lifecycle_hooks(
+            self, AFTER_SAVE, AFTER_CREATE, snapshot_state=True
+        )
+
+        return True
+
+    @classmethod
+    def bulk_insert_if_not_exist(cls, objs: list, using=None) -> int:
+        """Inserts objects by a single INSERT ... ON CONFLICT DO NOTHING
+        query. Before-create/save hooks run for every object (e.g. to set
+        score and coin), but after-save/create hooks don't run.
+
+        Note: Objects' pks aren't set.
+
+        Args:
+            objs (list): Objects to insert.
+            using (str, optional): Database alias. Defaults to None.
+
+        Returns:
+            int: Count of inserted objects.
+        """
+        if not objs:
+            return 0
+
+        using = using or router.db_for_write(cls)
+
+        for obj in objs:
+            run_lifecycle_hooks(obj, BEFORE_CREATE, BEFORE_SAVE)
+
+        fields = [
+            field
+            for field in cls._meta.local_concrete_fields
+            if not (field.primary_key and all(obj.pk is None for obj in objs))
+        ]
+        query = InsertQuery(cls, ignore_conflicts=True)
+        query.insert_values(fields, objs)
+
+        inserted_count = 0
+        with connections[using].cursor() as cursor:
+            for sql, params in query.get_compiler(using=using).as_sql():
+                cursor.execute(sql, params)
+                inserted_count += cursor.rowcount
+
+        return inserted_count
+
+    @classmethod
+    def delete_if_exists(cls, using=None, **lookup) -> Optional[models.Model]:
+        """Deletes object matching lookup by a single DELETE ... RETURNING
+        query (or a locked select and delete where RETURNING isn't
+        supported) and runs its delete hooks.
+
+        Note: Model shouldn't have dependent (cascaded) relations. Related
+        objects given in lookup are set on the deleted object.
+
+        Args:
+            using (str, optional): Database alias. Defaults to None.
+
+        Returns:
+            Optional[models.Model]: Deleted object (None if not exists).
+        """
+        using = using or router.db_for_write(cls)
+        connection = connections[using]
+        queryset = cls.objects.using(using).filter(**lookup)
+
+        if not supports_delete_returning(connection):
+            with transaction.atomic(using=using):
+                obj = queryset.select_for_update().first()
+                if obj:
+                    obj.delete()
+            return obj
+
+        fields = cls._meta.concrete_fields
+        sql, params = (
+            queryset.query.chain(DeleteQuery)
+            .get_compiler(using=using)
+            .as_sql()
+        )
+        sql += " RETURNING " + ", ".join(
+            connection.ops.quote_name(field.column) for field in fields
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+
+        if row is None:
+            return None
+
+        values = []
+        for field, value in zip(fields, row):
+            column = field.get_col(cls._meta.db_table)
+            for converter in connection.ops.get_db_converters(
+                column
+            ) + column.get_db_converters(connection):
+                value = converter(value, column, connection)
+            values.append(value)
+
+        obj = cls.from_db(
+            using, [field.attname for field in fields], values
+        )
+        for name, value in lookup.items():
+            if isinstance(value, models.Model):
+                setattr(obj, name, value)
+
+        # Note: Row is already deleted when before-delete hooks run
+        run_lifecycle_hooks(obj, BEFORE_DELETE, AFTER_DELETE)
+
+        return obj
+
+    @classmethod
+    def toggle(cls, using=None, **lookup) -> bool:
+        """Inserts object by lookup (insert_if_not_exists) or deletes it
+        (delete_if_exists) if it exists, in a transaction with its hooks'
+        counter updates. Concurrent toggles never create duplicates (model
+        needs a unique constraint on lookup fields) and counters only
+        change by objects which are actually inserted or deleted.
+
+        Args:
+            using (str, optional): Database alias. Defaults to None.
+
+        Returns:
+            bool: True if object is inserted and False if it's deleted
+                (or concurrently deleted by another toggle).
+        """
+        using = using or router.db_for_write(cls)
+
+        with transaction.atomic(using=using):
+            if cls(**lookup).insert_if_not_exists(using=using):
+                return True
+
+            cls.delete_if_exists(using=using, **lookup)
+            return False
@@ -12,3 +12,16 @@ class ConfirmStatusChoices(IntegerChoices):
     WAITING_FOR_CONFIRM = 0, "در انتظار تایید"
     CONFIRMED = 1, "تایید شده"
     DISPROVED = -1, "رد شده"
+
+
+class QueuedEmailStatusChoices(IntegerChoices):
+    """
+    Queued email status choices:
+        0 : Pending (waiting to be sent or retried)
+        1 : Sent
+        -1 : Failed (all attempts failed)
+    """
+
+    PENDING = 0, "در صف ارسال"
+    SENT = 1, "ارسال شده"
+    FAILED = -1, "ناموفق"
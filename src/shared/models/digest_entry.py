@@ -0,0 +1,36 @@
+""" DigestEntry model """
+from django.db import models
+
+
+class DigestEntry(models.Model):
+    """A notification which is waiting to be sent to its recipient
+    with other ones of the same kind in a single digest email
+    (see shared.mail.send_digests).
+    """
+
+    kind = models.CharField(max_length=50, verbose_name="نوع")
+    recipient = models.EmailField(verbose_name="گیرنده")
+    recipient_name = models.CharField(
+        max_length=150, blank=True, verbose_name="نام گیرنده"
+    )
+    subject = models.CharField(max_length=255, verbose_name="موضوع")
+    message = models.TextField(verbose_name="متن")
+    html_message = models.TextField(blank=True, verbose_name="متن HTML")
+    url = models.URLField(max_length=2048, blank=True, verbose_name="لینک")
+
+    create_date = models.DateTimeField(
+        auto_now_add=True, verbose_name="زمان ایجاد"
+    )
+
+    class Meta:
+        verbose_name = "اطلاعیه خلاصه"
+        verbose_name_plural = "اطلاعیه های خلاصه"
+        indexes = [
+            models.Index(
+                fields=["kind", "recipient", "create_date"],
+                name="digest_entry_group_idx",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.kind}: {self.recipient}"
@@ -0,0 +1,54 @@
+""" QueuedEmail model """
+from django.db import models
+from django.utils import timezone
+from shared.models.choices import QueuedEmailStatusChoices
+
+
+class QueuedEmail(models.Model):
+    """Outbound email which is waiting to be sent by
+    send_queued_emails command (see shared.mail).
+    """
+
+    subject = models.CharField(max_length=998, verbose_name="موضوع")
+    body = models.TextField(blank=True, verbose_name="متن")
+    from_email = models.CharField(
+        max_length=254, blank=True, verbose_name="فرستنده"
+    )
+    to = models.JSONField(default=list, verbose_name="گیرندگان")
+
+    # List of [content, mimetype] pairs (e.g. html version of body)
+    alternatives = models.JSONField(default=list, verbose_name="جایگزین ها")
+
+    status = models.IntegerField(
+        choices=QueuedEmailStatusChoices.choices,
+        default=QueuedEmailStatusChoices.PENDING,
+        verbose_name="وضعیت",
+    )
+
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name="تعداد تلاش ها"
+    )
+    last_error = models.TextField(blank=True, verbose_name="آخرین خطا")
+
+    create_date = models.DateTimeField(
+        auto_now_add=True, verbose_name="زمان ایجاد"
+    )
+    next_attempt_date = models.DateTimeField(
+        default=timezone.now, verbose_name="زمان تلاش بعدی"
+    )
+    sent_date = models.DateTimeField(
+        null=True, blank=True, verbose_name="زمان ارسال"
+    )
+
+    class Meta:
+        verbose_name = "ایمیل در صف"
+        verbose_name_plural = "ایمیل های در صف"
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_date"],
+                name="queued_email_pending_idx",
+            )
+        ]
+
+    def __str__(self):
+        return self.subject
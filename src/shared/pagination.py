@@ -0,0 +1,235 @@
+""" Pagination utilities
+
+Offset pagination (Paginator) needs a COUNT(*) of the whole queryset and
+OFFSET queries which get slower on deeper pages. These utilities provide:
+
+    - CachedCountPaginator: Paginator with cached (approximate) count.
+    - paginate_by_keyset: Keyset (cursor) pagination. Each page is
+      fetched by filtering rows after/before the previous page's
+      boundary row (e.g. ``WHERE (create_date, id) < (..., ...)``), so
+      every page costs the same. Cursors are signed tokens, so clients
+      can't forge them.
+"""
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Optional
+from django.core import signing
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Model, Q, QuerySet
+from django.utils.functional import cached_property
+
+CURSOR_SALT = "shared.pagination.cursor"
+
+DEFAULT_COUNT_CACHE_TIMEOUT = 60
+
+
+class InvalidCursor(Exception):
+    """Cursor is malformed, tampered or made for another ordering."""
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator which caches count of queryset by its SQL query.
+
+    Count may be stale (at most count_cache_timeout seconds) which is
+    acceptable for showing total pages.
+    """
+
+    def __init__(
+        self,
+        *args,
+        count_cache_timeout: int = DEFAULT_COUNT_CACHE_TIMEOUT,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.count_cache_timeout = count_cache_timeout
+
+    @cached_property
+    def count(self) -> int:
+        query = self.object_list.query
+        sql, params = query.sql_with_params()
+        key = "pagination:count:" + hashlib.md5(
+            f"{query.model._meta.label}:{sql}:{params!r}".encode()
+        ).hexdigest()
+
+        return cache.get_or_set(
+            key, self.object_list.count, self.count_cache_timeout
+        )
+
+
+@dataclass
+class KeysetPage:
+    """A page of keyset pagination."""
+
+    object_list: list
+    next_cursor: Optional[str] = None
+    previous_cursor: Optional[str] = None
+    ordering: list[str] = field(default_factory=list)
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def get_keyset_ordering(ordering: list[str]) -> list[str]:
+    """Adds primary key to ordering as tiebreaker (in the same direction
+    as the first field).
+
+    Args:
+        ordering (list[str]): Ordering fields (e.g. ["-create_date"]).
+
+    Returns:
+        list[str]: Unique ordering (e.g. ["-create_date", "-pk"]).
+    """
+    ordering = [value for value in ordering if value.lstrip("-") != "pk"]
+    descending = bool(ordering) and ordering[0].startswith("-")
+
+    return ordering + ["-pk" if descending else "pk"]
+
+
+def _get_field(model: type[Model], name: str):
+    name = name.lstrip("-")
+    return model._meta.pk if name == "pk" else model._meta.get_field(name)
+
+
+def encode_cursor(
+    obj: Model, ordering: list[str], backwards: bool = False
+) -> str:
+    """Makes signed cursor of the page after (or before if backwards
+    is True) given object.
+
+    Args:
+        obj (Model): Page's boundary object.
+        ordering (list[str]): Keyset ordering (get_keyset_ordering).
+        backwards (bool, optional): Cursor points to previous page.
+            Defaults to False.
+
+    Returns:
+        str: Opaque cursor token.
+    """
+    values = [
+        _get_field(obj.__class__, name).value_to_string(obj)
+        for name in ordering
+    ]
+
+    return signing.dumps(
+        {"o": ordering, "v": values, "b": backwards},
+        salt=CURSOR_SALT,
+        compress=True,
+    )
+
+
+def decode_cursor(
+    cursor: str, model: type[Model], ordering: list[str]
+) -> tuple[list[Any], bool]:
+    """Decodes cursor made by encode_cursor.
+
+    Raises:
+        InvalidCursor: If cursor is invalid or made for another ordering.
+
+    Returns:
+        tuple[list[Any], bool]: Boundary values and backwards flag.
+    """
+    try:
+        data = signing.loads(cursor, salt=CURSOR_SALT)
+        if data["o"] != ordering or len(data["v"]) != len(ordering):
+            raise InvalidCursor("Cursor doesn't match ordering.")
+
+        values = [
+            _get_field(model, name).to_python(value)
+            for name, value in zip(ordering, data["v"])
+        ]
+    except (signing.BadSignature, KeyError, TypeError, ValueError) as ex:
+        raise InvalidCursor("Invalid cursor.") from ex
+
+    return values, bool(data["b"])
+
+
+def _keyset_filter(
+    ordering: list[str], values: list[Any], backwards: bool
+) -> Q:
+    """Makes lexicographic "after boundary row" condition:
+    (f1 > v1) OR (f1 = v1 AND f2 > v2) OR ...
+    """
+    condition = Q()
+    equals = {}
+
+    for name, value in zip(ordering, values):
+        field_name = name.lstrip("-")
+        # Descending fields go after boundary by lower values
+        after_lookup = "lt" if name.startswith("-") != backwards else "gt"
+
+        condition |= Q(**equals, **{f"{field_name}__{after_lookup}": value})
+        equals[field_name] = value
+
+    return condition
+
+
+def paginate_by_keyset(
+    queryset: QuerySet,
+    ordering: list[str],
+    per_page: int,
+    cursor: Optional[str] = None,
+) -> KeysetPage:
+    """Gets a page of queryset by keyset pagination.
+
+    Args:
+        queryset (QuerySet): Objects to paginate.
+        ordering (list[str]): Ordering fields (pk is added as tiebreaker).
+        per_page (int): Count of objects in each page.
+        cursor (Optional[str], optional): Cursor of page.
+            Defaults to None (first page).
+
+    Raises:
+        InvalidCursor: If cursor is invalid.
+
+    Returns:
+        KeysetPage: Page's objects and cursors of next and previous pages.
+    """
+    ordering = get_keyset_ordering(ordering)
+    backwards = False
+
+    if cursor:
+        values, backwards = decode_cursor(cursor, queryset.model, ordering)
+        queryset = queryset.filter(_keyset_filter(ordering, values, backwards))
+
+    query_ordering = ordering
+    if backwards:
+        # Fetch previous page in reverse order then reverse it back
+        query_ordering = [
+            name[1:] if name.startswith("-") else "-" + name
+            for name in ordering
+        ]
+
+    # Fetch one more object to know whether there's a further page
+    objects = list(queryset.order_by(*query_ordering)[: per_page + 1])
+    has_more = len(objects) > per_page
+    objects = objects[:per_page]
+
+    if backwards:
+        objects.reverse()
+
+    page = KeysetPage(objects, ordering=ordering)
+    if not objects:
+        return page
+
+    # Going forward, previous page exists if a cursor is given (and vice
+    # versa) and the further page exists if one more object is fetched.
+    if has_more or backwards:
+        page.next_cursor = encode_cursor(objects[-1], ordering)
+    if cursor and (has_more or not backwards):
+        page.previous_cursor = encode_cursor(
+            objects[0], ordering, backwards=True
+        )
+
+    return page
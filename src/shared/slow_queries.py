@@ -0,0 +1,287 @@
+""" Slow queries capture
+
+When SLOW_QUERY_THRESHOLD_MS setting is set, every database connection
+times its queries (by an execute wrapper installed on connection_created
+signal) and queries slower than the threshold are recorded with their:
+
+    - fingerprint: SQL with literals, parameters and IN/VALUES lists
+      normalized (e.g. "... WHERE id IN (...) AND title = ?"), so the
+      same query with different parameters is aggregated together.
+    - call_site: Innermost project code frame which ran the query
+      (e.g. "learning/querysets/tutorial_queryset.py:124
+      aggregate_statistics").
+    - entry_point: Outermost project code frame (e.g. the view).
+
+Each process keeps its last SLOW_QUERY_BUFFER_SIZE slow queries in a ring
+buffer and snapshots it to cache every SLOW_QUERY_SNAPSHOT_INTERVAL
+seconds, so "slow_queries" command can aggregate all processes' slow
+queries by fingerprint.
+"""
+import hashlib
+import os
+import re
+import socket
+import sys
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+from django.conf import settings
+from django.core.cache import cache
+
+SNAPSHOTS_KEY = "slow_queries:snapshots"
+SNAPSHOT_TIMEOUT = 24 * 60 * 60
+
+# Upper bounds (ms) of histogram buckets (last bucket is unbounded)
+HISTOGRAM_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w\"])-?\d+(?:\.\d+)?\b")
+_PARAM_RE = re.compile(r"%s|\?")
+_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_VALUES_RE = re.compile(r"VALUES\s+\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+", re.I)
+_SPACE_RE = re.compile(r"\s+")
+
+_local = threading.local()
+
+
+def fingerprint_sql(sql: str) -> str:
+    """Normalizes SQL by replacing literals and parameters by "?" and
+    parameter lists by "(...)".
+
+    Args:
+        sql (str): SQL query.
+
+    Returns:
+        str: Normalized SQL.
+    """
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _PARAM_RE.sub("?", sql)
+    sql = _LIST_RE.sub("(...)", sql)
+    sql = _VALUES_RE.sub("VALUES (...)", sql)
+
+    return _SPACE_RE.sub(" ", sql).strip()
+
+
+def get_fingerprint_id(fingerprint: str) -> str:
+    return hashlib.md5(fingerprint.encode()).hexdigest()[:16]
+
+
+@dataclass
+class SlowQuery:
+    fingerprint: str
+    duration_ms: float
+    alias: str
+    call_site: Optional[str] = None
+    entry_point: Optional[str] = None
+    timestamp: float = field(default_factory=time.time)
+
+
+def get_call_sites() -> tuple[Optional[str], Optional[str]]:
+    """Finds innermost and outermost project frames of current stack.
+
+    Returns:
+        tuple[Optional[str], Optional[str]]: Call site and entry point
+            ("path:line function").
+    """
+    base_dir = str(settings.BASE_DIR) + os.sep
+    manage_file = base_dir + "manage.py"
+    frames = []
+
+    frame = sys._getframe(1)  # pylint: disable=protected-access
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if (
+            filename.startswith(base_dir)
+            and "site-packages" not in filename
+            and filename not in (__file__, manage_file)
+        ):
+            frames.append(
+                f"{Path(filename).relative_to(base_dir)}:{frame.f_lineno} "
+                f"{frame.f_code.co_name}"
+            )
+        frame = frame.f_back
+
+    if not frames:
+        return None, None
+
+    return frames[0], frames[-1]
+
+
+class SlowQueryRecorder:
+    """Process-wide ring buffer of slow queries which is snapshotted to
+    cache periodically.
+    """
+
+    def __init__(self, size: int, snapshot_interval: float):
+        self.queries: deque[SlowQuery] = deque(maxlen=size)
+        self.snapshot_interval = snapshot_interval
+        self.snapshot_key = (
+            f"slow_queries:{socket.gethostname()}:{os.getpid()}"
+        )
+        self._last_snapshot = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, query: SlowQuery):
+        with self._lock:
+            self.queries.append(query)
+            should_snapshot = (
+                time.monotonic() - self._last_snapshot
+                >= self.snapshot_interval
+            )
+
+        if should_snapshot:
+            self.snapshot()
+
+    def snapshot(self):
+        """Writes buffer's queries to cache."""
+        with self._lock:
+            queries = [asdict(query) for query in self.queries]
+            self._last_snapshot = time.monotonic()
+
+        cache.set(self.snapshot_key, queries, SNAPSHOT_TIMEOUT)
+
+        # Note: Concurrent registrations may be lost, but every process
+        # registers its key again on its next snapshot.
+        snapshot_keys = cache.get(SNAPSHOTS_KEY) or []
+        if self.snapshot_key not in snapshot_keys:
+            cache.set(
+                SNAPSHOTS_KEY,
+                snapshot_keys + [self.snapshot_key],
+                SNAPSHOT_TIMEOUT,
+            )
+
+    def clear(self):
+        with self._lock:
+            self.queries.clear()
+
+
+_recorder: Optional[SlowQueryRecorder] = None
+_recorder_lock = threading.Lock()
+
+
+def get_recorder() -> SlowQueryRecorder:
+    """Returns process's slow query recorder."""
+    global _recorder  # pylint: disable=global-statement
+
+    if _recorder is None:
+        with _recorder_lock:
+            if _recorder is None:
+                _recorder = SlowQueryRecorder(
+                    getattr(settings, "SLOW_QUERY_BUFFER_SIZE", 1000),
+                    getattr(settings, "SLOW_QUERY_SNAPSHOT_INTERVAL", 10),
+                )
+
+    return _recorder
+
+
+def slow_query_wrapper(execute, sql, params, many, context):
+    """Database execute wrapper which records slow queries."""
+    threshold = getattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0)
+    # Queries of recording itself (e.g. database cache) are ignored
+    if not threshold or getattr(_local, "recording", False):
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        if duration_ms >= threshold:
+            _local.recording = True
+            try:
+                call_site, entry_point = get_call_sites()
+                get_recorder().record(
+                    SlowQuery(
+                        fingerprint=fingerprint_sql(sql),
+                        duration_ms=round(duration_ms, 3),
+                        alias=context["connection"].alias,
+                        call_site=call_site,
+                        entry_point=entry_point,
+                    )
+                )
+            finally:
+                _local.recording = False
+
+
+def install_slow_query_wrapper(sender, connection, **kwargs):
+    """connection_created signal receiver which installs
+    slow_query_wrapper on connection.
+    """
+    if slow_query_wrapper not in connection.execute_wrappers:
+        # Insert as the first (outermost) wrapper, so temporary wrappers
+        # (connection.execute_wrapper() pops the last one) aren't broken
+        connection.execute_wrappers.insert(0, slow_query_wrapper)
+
+
+def collect_slow_queries() -> list[dict]:
+    """Returns slow queries of all processes' snapshots in cache."""
+    snapshots = cache.get_many(cache.get(SNAPSHOTS_KEY) or [])
+    return [query for queries in snapshots.values() for query in queries]
+
+
+def clear_slow_queries():
+    """Removes all processes' snapshots (and current process's buffer)."""
+    cache.delete_many(cache.get(SNAPSHOTS_KEY) or [])
+    cache.delete(SNAPSHOTS_KEY)
+    get_recorder().clear()
+
+
+@dataclass
+class SlowQueryStatistics:
+    fingerprint: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    histogram: list[int] = field(
+        default_factory=lambda: [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+    )
+    call_sites: Counter = field(default_factory=Counter)
+    entry_points: Counter = field(default_factory=Counter)
+
+    @property
+    def id(self) -> str:
+        return get_fingerprint_id(self.fingerprint)
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def add(self, query: dict):
+        duration_ms = query["duration_ms"]
+
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.histogram[
+            sum(duration_ms > bound for bound in HISTOGRAM_BUCKETS_MS)
+        ] += 1
+
+        if query.get("call_site"):
+            self.call_sites[query["call_site"]] += 1
+        if query.get("entry_point"):
+            self.entry_points[query["entry_point"]] += 1
+
+
+def aggregate_slow_queries(queries: list[dict]) -> list[SlowQueryStatistics]:
+    """Aggregates slow queries by their fingerprints.
+
+    Returns:
+        list[SlowQueryStatistics]: Fingerprints' statistics sorted by
+            total time (descending).
+    """
+    statistics: dict[str, SlowQueryStatistics] = {}
+    for query in queries:
+        fingerprint = query["fingerprint"]
+        if fingerprint not in statistics:
+            statistics[fingerprint] = SlowQueryStatistics(fingerprint)
+
+        statistics[fingerprint].add(query)
+
+    return sorted(
+        statistics.values(), key=lambda item: item.total_ms, reverse=True
+    )
@@ -0,0 +1,87 @@
+import threading
+import time
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase
+from shared import cache as cache_utils
+
+
+class NamespaceTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_make_key_parts(self):
+        """make_key should include namespace, version and parts."""
+        self.assertEqual(cache_utils.make_key("ns", 5, "a"), "ns:v1:5:a")
+
+    def test_invalidate_namespace(self):
+        """invalidate_namespace should change namespace's keys."""
+        key = cache_utils.make_key("ns", 5)
+        cache_utils.invalidate_namespace("ns")
+
+        self.assertNotEqual(cache_utils.make_key("ns", 5), key)
+
+    def test_invalidate_evicted_version(self):
+        """invalidate_namespace should work if version key is evicted."""
+        key = cache_utils.make_key("ns")
+        cache.clear()
+        cache_utils.invalidate_namespace("ns")
+
+        self.assertNotEqual(cache_utils.make_key("ns"), key)
+
+
+class GetOrSetLockedTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_cache_value(self):
+        """get_or_set_locked should calculate value once and cache it."""
+        default = mock.Mock(return_value=10)
+
+        self.assertEqual(cache_utils.get_or_set_locked("key", default), 10)
+        self.assertEqual(cache_utils.get_or_set_locked("key", default), 10)
+        default.assert_called_once()
+
+    def test_stampede_protection(self):
+        """Concurrent calls on cold cache should calculate value once."""
+        calls = []
+
+        def slow_default():
+            calls.append(1)
+            time.sleep(0.2)
+            return "value"
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    cache_utils.get_or_set_locked(
+                        "key", slow_default, poll_interval=0.01
+                    )
+                )
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["value"] * 5)
+
+    def test_released_lock_without_value(self):
+        """Waiting callers should calculate value if lock gets released
+        without setting value.
+        """
+        cache.add("key:lock", True, 10)
+        default = mock.Mock(return_value=1)
+
+        with mock.patch.object(cache_utils.cache, "get") as get:
+            # Value and lock are missing on first check
+            get.side_effect = lambda key, default=None: default
+            value = cache_utils.get_or_set_locked(
+                "key", default, poll_interval=0
+            )
+
+        self.assertEqual(value, 1)
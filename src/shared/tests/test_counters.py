@@ -0,0 +1,104 @@
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from model_bakery import baker
+from shared.counters import (
+    LocalCounterBuffer,
+    RedisCounterBuffer,
+    apply_counter_deltas,
+    flush_counters,
+)
+
+User = get_user_model()
+
+
+class LocalCounterBufferTest(TestCase):
+    def test_add_and_pop(self):
+        """Buffer should sum added values and become empty on pop."""
+        buffer = LocalCounterBuffer()
+        buffer.add(User, 1, "scores", 2)
+        buffer.add(User, 1, "scores", 3)
+        buffer.add(User, 2, "coins", 1)
+        buffer.add(User, 2, "coins", -1)
+
+        self.assertEqual(
+            buffer.pop_all(), {(User._meta.label, 1, "scores"): 5}
+        )
+        self.assertEqual(buffer.pop_all(), {})
+
+
+class RedisCounterBufferTest(TestCase):
+    def test_serialize_key(self):
+        """Primary and natural keys should survive serialization."""
+        for key in (
+            ("authentication.User", 1, "scores"),
+            ("learning.TutorialDailyStatistics", "1/like/2021-06-01", "count"),
+        ):
+            self.assertEqual(
+                RedisCounterBuffer._deserialize_key(
+                    RedisCounterBuffer._serialize_key(key)
+                ),
+                key,
+            )
+
+
+class ApplyCounterDeltasTest(TestCase):
+    def test_single_query(self):
+        """Counters of a model should be updated by a single query."""
+        users = baker.make(User, scores=10, coins=10, _quantity=3)
+        label = User._meta.label
+
+        with self.assertNumQueries(1):
+            apply_counter_deltas(
+                {
+                    (label, users[0].pk, "scores"): 5,
+                    (label, users[1].pk, "scores"): -5,
+                    (label, users[1].pk, "coins"): 2,
+                }
+            )
+
+        self.assertEqual(
+            list(
+                User.objects.filter(pk__in=[user.pk for user in users])
+                .order_by("pk")
+                .values_list("scores", "coins")
+            ),
+            [(15, 10), (5, 12), (10, 10)],
+        )
+
+    def test_batches(self):
+        """Counters should be updated by a query per batch."""
+        users = baker.make(User, _quantity=3)
+        deltas = {(User._meta.label, user.pk, "scores"): 1 for user in users}
+
+        with self.assertNumQueries(2):
+            self.assertEqual(apply_counter_deltas(deltas, batch_size=2), 3)
+
+
+class FlushCountersTest(TestCase):
+    def test_flush(self):
+        """flush_counters should write buffered counters to database."""
+        user = baker.make(User, scores=0)
+        buffer = LocalCounterBuffer()
+        buffer.add(User, user.pk, "scores", 4)
+
+        flush_counters(buffer)
+        user.refresh_from_db()
+
+        self.assertEqual(user.scores, 4)
+        self.assertEqual(buffer.pop_all(), {})
+
+    def test_restore_on_failure(self):
+        """Counters should return to buffer if writing them fails."""
+        buffer = LocalCounterBuffer()
+        buffer.add(User, 1, "scores", 4)
+
+        with mock.patch(
+            "shared.counters.apply_counter_deltas",
+            side_effect=RuntimeError,
+        ), self.assertRaises(RuntimeError):
+            flush_counters(buffer)
+
+        self.assertEqual(
+            buffer.pop_all(), {(User._meta.label, 1, "scores"): 4}
+        )
@@ -1,4 +1,5 @@
 import datetime
+import jdatetime
 from django.test import TestCase
 from django.utils import timezone
 from shared import date_time
@@ -101,3 +102,49 @@ class LastMonthsTest(TestCase):
 
         for index, month in enumerate(months):
             self.assertEqual(month.label, expected_labels[index])
+
+
+class JalaliCalendarTest(TestCase):
+    def test_bucket_month_indexes(self):
+        """bucket_month_indexes should map days and datetimes to their
+        jalali months' indexes.
+        """
+        indexes = date_time.bucket_month_indexes(
+            [
+                # Last day of Khordad 1400
+                datetime.date(2021, 6, 21),
+                # First day of Tir 1400
+                datetime.datetime(2021, 6, 22, 12),
+                # Last day of Esfand 1399 (leap year)
+                datetime.date(2021, 3, 20),
+            ]
+        )
+        months = [date_time.calendar.get_month(index) for index in indexes]
+
+        self.assertEqual(
+            [month.label for month in months],
+            ["خرداد 1400", "تیر 1400", "اسفند 1399"],
+        )
+        self.assertEqual(indexes[1] - indexes[0], 1)
+
+    def test_out_of_range(self):
+        """Days out of precomputed calendar should raise ValueError."""
+        with self.assertRaises(ValueError):
+            date_time.calendar.get_month_index(datetime.date(1900, 1, 1))
+
+        with self.assertRaises(ValueError):
+            date_time.bucket_month_indexes([datetime.date(2200, 1, 1)])
+
+    def test_matches_jdatetime(self):
+        """Precomputed months should match jdatetime conversions."""
+        jdatetime.set_locale("fa_IR")
+
+        for month in date_time.get_last_months(
+            60, datetime.date(2021, 7, 14)
+        ):
+            jalali_start = jdatetime.date.fromgregorian(
+                date=month.gregorian_start.date()
+            )
+
+            self.assertEqual(jalali_start.day, 1)
+            self.assertEqual(month.label, jalali_start.strftime("%b %Y"))
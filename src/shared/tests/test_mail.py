@@ -0,0 +1,199 @@
+from datetime import timedelta
+from io import StringIO
+import socket
+from smtplib import SMTPException
+from unittest import mock
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from shared import mail as mail_utils
+from shared.models import QueuedEmail, QueuedEmailStatusChoices
+
+
+def _make_message(number: int = 0) -> EmailMultiAlternatives:
+    message = EmailMultiAlternatives(
+        f"subject {number}", "body", to=[f"user{number}@example.com"]
+    )
+    message.attach_alternative("<p>html</p>", "text/html")
+    return message
+
+
+class QueueEmailTest(TestCase):
+    def test_queue_email(self):
+        """Queued email should keep message's fields."""
+        mail_utils.queue_email(_make_message())
+        queued_email = QueuedEmail.objects.get()
+
+        self.assertEqual(queued_email.subject, "subject 0")
+        self.assertEqual(queued_email.to, ["user0@example.com"])
+        self.assertEqual(
+            queued_email.alternatives, [["<p>html</p>", "text/html"]]
+        )
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_bulk_queue(self):
+        """Emails queued inside bulk_queue() should be inserted together
+        when it exits.
+        """
+        with self.assertNumQueries(1), mail_utils.bulk_queue():
+            queued_emails = [
+                mail_utils.queue_email(_make_message(number))
+                for number in range(5)
+            ]
+            # Not saved yet
+            self.assertIsNone(queued_emails[0].pk)
+
+        self.assertEqual(QueuedEmail.objects.count(), 5)
+
+    def test_queue_emails_single_query(self):
+        """queue_emails should insert all messages by one query."""
+        with self.assertNumQueries(1):
+            count = mail_utils.queue_emails(
+                [_make_message(number) for number in range(5)]
+            )
+
+        self.assertEqual(count, 5)
+
+
+class SendQueuedEmailsTest(TestCase):
+    def test_send(self):
+        """Queued emails should be sent once and marked as sent."""
+        mail_utils.queue_emails([_make_message(number) for number in range(3)])
+
+        result = mail_utils.send_queued_emails()
+        mail_utils.send_queued_emails()
+
+        self.assertEqual(result.sent, 3)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(mail.outbox[0].alternatives[0][1], "text/html")
+        self.assertFalse(
+            QueuedEmail.objects.exclude(
+                status=QueuedEmailStatusChoices.SENT
+            ).exists()
+        )
+
+    def test_single_connection(self):
+        """All messages of a batch should be sent by one connection."""
+        mail_utils.queue_emails([_make_message(number) for number in range(3)])
+
+        with mock.patch.object(mail_utils, "get_connection") as get_conn:
+            mail_utils.send_queued_emails()
+
+        get_conn.assert_called_once()
+        self.assertEqual(get_conn.return_value.send_messages.call_count, 3)
+
+    def test_retry_with_backoff(self):
+        """Emails failed by SMTPException should be retried later."""
+        mail_utils.queue_email(_make_message())
+        connection = mock.MagicMock()
+        connection.send_messages.side_effect = SMTPException("error")
+
+        with mock.patch.object(mail_utils, "logger"):
+            result = mail_utils.send_queued_emails(
+                retry_delay=60, connection=connection
+            )
+        queued_email = QueuedEmail.objects.get()
+
+        self.assertEqual(result.retried, 1)
+        self.assertEqual(queued_email.attempts, 1)
+        self.assertEqual(queued_email.status, QueuedEmailStatusChoices.PENDING)
+        self.assertGreater(
+            queued_email.next_attempt_date,
+            timezone.now() + timedelta(seconds=50),
+        )
+        # Not sendable until next attempt date
+        self.assertEqual(mail_utils.send_queued_emails().sent, 0)
+
+    def test_fail_after_max_attempts(self):
+        """Emails should be marked as failed after max attempts."""
+        mail_utils.queue_email(_make_message())
+        QueuedEmail.objects.update(attempts=2)
+        connection = mock.MagicMock()
+        connection.send_messages.side_effect = SMTPException("error")
+
+        with mock.patch.object(mail_utils, "logger"):
+            result = mail_utils.send_queued_emails(
+                max_attempts=3, connection=connection
+            )
+
+        self.assertEqual(result.failed, 1)
+        self.assertEqual(
+            QueuedEmail.objects.get().status, QueuedEmailStatusChoices.FAILED
+        )
+
+    def test_retry_socket_errors(self):
+        """Emails failed by socket errors (e.g. timeout) should be
+        retried later.
+        """
+        mail_utils.queue_email(_make_message())
+        connection = mock.MagicMock()
+        connection.send_messages.side_effect = socket.timeout("timed out")
+
+        with mock.patch.object(mail_utils, "logger"):
+            result = mail_utils.send_queued_emails(connection=connection)
+
+        self.assertEqual(result.retried, 1)
+        self.assertEqual(QueuedEmail.objects.get().attempts, 1)
+
+    def test_connection_error_fails_batch(self):
+        """When connection can't be opened, all claimed emails should
+        count as failed attempts.
+        """
+        mail_utils.queue_emails([_make_message(), _make_message()])
+        connection = mock.MagicMock()
+        connection.open.side_effect = ConnectionRefusedError("refused")
+
+        with mock.patch.object(mail_utils, "logger"):
+            result = mail_utils.send_queued_emails(connection=connection)
+
+        connection.send_messages.assert_not_called()
+        self.assertEqual(result.retried, 2)
+        self.assertEqual(
+            list(QueuedEmail.objects.values_list("attempts", "last_error")),
+            [(1, "refused"), (1, "refused")],
+        )
+
+    def test_reconnect_error_fails_rest_of_batch(self):
+        """When reconnecting fails, rest of batch should count as failed
+        attempts.
+        """
+        mail_utils.queue_emails([_make_message() for _ in range(3)])
+        connection = mock.MagicMock()
+        connection.send_messages.side_effect = SMTPException("error")
+        # First open succeeds, reconnect fails
+        connection.open.side_effect = [None, OSError("network down")]
+
+        with mock.patch.object(mail_utils, "logger"):
+            result = mail_utils.send_queued_emails(connection=connection)
+
+        self.assertEqual(connection.send_messages.call_count, 1)
+        self.assertEqual(result.retried, 3)
+        self.assertFalse(QueuedEmail.objects.filter(attempts=0).exists())
+
+    def test_retry_delay_exponential(self):
+        """Retry delay should double after each attempt."""
+        self.assertEqual(
+            [mail_utils.get_retry_delay(n, 10).seconds for n in (1, 2, 3)],
+            [10, 20, 40],
+        )
+
+
+class EmailQueueCommandsTest(TestCase):
+    def test_send_queued_emails(self):
+        """send_queued_emails should drain queue in batches."""
+        mail_utils.queue_emails([_make_message(number) for number in range(5)])
+        call_command("send_queued_emails", "--batch-size=2", stdout=StringIO())
+
+        self.assertEqual(len(mail.outbox), 5)
+
+    def test_benchmark(self):
+        """benchmark_email_queue should report messages/second and
+        not keep its emails.
+        """
+        out = StringIO()
+        call_command("benchmark_email_queue", "--count=20", stdout=out)
+
+        self.assertIn("messages/s", out.getvalue())
+        self.assertFalse(QueuedEmail.objects.exists())
@@ -1,4 +1,5 @@
-from django.test import TestCase, override_settings
+from django.core.cache import cache, caches
+from django.test import TestCase, TransactionTestCase, override_settings
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -38,6 +39,33 @@ class LoginRequiredMiddlewareTest(TestCase):
         self.assertNotIn(response.status_code, [301, 302])
 
 
+@override_settings(
+    LOGIN_REQUIRED_URLS=[r"^/user/(.)*$"],
+    LOGIN_URL="/auth/login/",
+    DEFAULT_USER_TZ="Australia/Eucla",
+    MIDDLEWARE=[
+        "django.contrib.sessions.middleware.SessionMiddleware",
+        "django.contrib.auth.middleware.AuthenticationMiddleware",
+        "shared.middleware.LoginRequiredMiddleware",
+        "shared.middleware.TimezoneMiddleware",
+    ],
+)
+class AsyncMiddlewareTest(TransactionTestCase):
+    """Middleware should work without being adapted under ASGI (they
+    access database in worker threads, so TransactionTestCase is used).
+    """
+
+    async def test_redirect_anonymous_user(self):
+        response = await self.async_client.get("/user/")
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response["Location"], "/auth/login/?next=/user/")
+
+    async def test_use_default_user_tz(self):
+        response = await self.async_client.get("/")
+        self.assertEqual(response.headers.get("Time-Zone"), "Australia/Eucla")
+
+
 @override_settings(
     DEFAULT_USER_TZ="Australia/Eucla",
     MIDDLEWARE=[
@@ -70,3 +98,46 @@ class TimezoneMiddlewareTest(TestCase):
         self.assertEqual(
             response.headers.get("Time-Zone"), session["timezone"]
         )
+
+
+class ProfilingMiddlewareTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    @override_settings(PROFILING_SAMPLE_RATE=1)
+    def test_server_timing_header(self):
+        """Profiled requests should have Server-Timing header."""
+        response = self.client.get("/")
+        server_timing = response["Server-Timing"]
+
+        for metric in ["total;dur=", "db;dur=", "template;dur=", "cache;"]:
+            self.assertIn(metric, server_timing)
+
+    @override_settings(PROFILING_SAMPLE_RATE=1)
+    def test_log_record(self):
+        """Profiled requests should be logged by profiling logger."""
+        with self.assertLogs("profiling", "INFO") as logs:
+            self.client.get("/")
+            self.client.get("/")
+
+        first, second = logs.records
+        self.assertEqual(first.view, "learning:home")
+        self.assertEqual(first.status_code, 200)
+        self.assertGreater(first.db_queries, 0)
+        self.assertGreater(first.template_ms, 0)
+        # Home carousels are cached by the first request
+        self.assertGreater(first.cache_misses, 0)
+        self.assertGreater(second.cache_hits, 0)
+        self.assertLess(second.db_queries, first.db_queries)
+
+    @override_settings(PROFILING_SAMPLE_RATE=1)
+    def test_restore_cache_methods(self):
+        """Cache methods should be restored after profiled request."""
+        self.client.get("/")
+        self.assertNotIn("get", caches["default"].__dict__)
+
+    @override_settings(PROFILING_SAMPLE_RATE=0)
+    def test_not_sampled(self):
+        """Requests shouldn't be profiled when sample rate is zero."""
+        response = self.client.get("/")
+        self.assertFalse(response.has_header("Server-Timing"))
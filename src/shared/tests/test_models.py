@@ -1,6 +1,9 @@
 import random
 from unittest import mock
+from django.test import SimpleTestCase
+from django_lifecycle import AFTER_DELETE, BEFORE_CREATE
 from shared.models import AbstractScoreCoinModel
+from shared.models.abstract_models import run_lifecycle_hooks
 from .utils import ModelTestCase
 
 
@@ -46,3 +49,39 @@ class AbstractScoreCoinModelTest(ModelTestCase):
         obj = self.model.objects.create(coin=expected_coin + 1)
 
         self.assertEqual(obj.coin, expected_coin)
+
+
+class RunLifecycleHooksTest(SimpleTestCase):
+    model = AbstractScoreCoinModelTest.TestScoreCoinModel
+
+    @mock.patch.object(model, "get_create_score", return_value=3)
+    def test_run_hooks(self, get_create_score_mock: mock.MagicMock):
+        """Should run object's hooked methods of given hooks only. It
+        relies on django_lifecycle's private API, so it guards against
+        its changes.
+
+        Args:
+            get_create_score_mock (mock.MagicMock): Mocked
+                get_create_score method.
+        """
+        obj = self.model(score=10)
+
+        run_lifecycle_hooks(obj, AFTER_DELETE)
+        self.assertEqual(obj.score, 10)
+
+        run_lifecycle_hooks(obj, BEFORE_CREATE)
+        self.assertEqual(obj.score, 3)
+        get_create_score_mock.assert_called_once()
+
+    def test_snapshot_state(self):
+        """Should take object's current state as its initial state only
+        if snapshot_state is set.
+        """
+        obj = self.model(score=10)
+        obj.score = 20
+
+        run_lifecycle_hooks(obj, AFTER_DELETE)
+        self.assertTrue(obj.has_changed("score"))
+
+        run_lifecycle_hooks(obj, AFTER_DELETE, snapshot_state=True)
+        self.assertFalse(obj.has_changed("score"))
@@ -0,0 +1,114 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from model_bakery import baker
+from shared.pagination import (
+    CachedCountPaginator,
+    InvalidCursor,
+    encode_cursor,
+    get_keyset_ordering,
+    paginate_by_keyset,
+)
+
+User = get_user_model()
+
+
+class KeysetPaginationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Duplicate scores make pk tiebreaker necessary
+        for index in range(10):
+            baker.make(User, scores=index % 3)
+
+    def get_all_pages(self, ordering: list[str], per_page: int = 3):
+        pages = [paginate_by_keyset(User.objects.all(), ordering, per_page)]
+        while pages[-1].has_next:
+            pages.append(
+                paginate_by_keyset(
+                    User.objects.all(),
+                    ordering,
+                    per_page,
+                    pages[-1].next_cursor,
+                )
+            )
+
+        return pages
+
+    def test_get_keyset_ordering(self):
+        """Primary key should be added in direction of the first field."""
+        self.assertEqual(get_keyset_ordering(["-scores"]), ["-scores", "-pk"])
+        self.assertEqual(
+            get_keyset_ordering(["scores", "pk"]), ["scores", "pk"]
+        )
+
+    def test_pages_cover_queryset(self):
+        """Walking over pages should return all objects in order without
+        duplicates.
+        """
+        for ordering in [["scores"], ["-scores"]]:
+            pages = self.get_all_pages(ordering)
+            objects = [obj for page in pages for obj in page]
+
+            self.assertEqual(
+                objects,
+                list(
+                    User.objects.order_by(*get_keyset_ordering(ordering))
+                ),
+            )
+            self.assertFalse(pages[0].has_previous)
+            self.assertFalse(pages[-1].has_next)
+
+    def test_previous_cursor(self):
+        """Previous cursor should return the previous page."""
+        pages = self.get_all_pages(["-scores"])
+
+        for index in range(1, len(pages)):
+            previous_page = paginate_by_keyset(
+                User.objects.all(),
+                ["-scores"],
+                3,
+                pages[index].previous_cursor,
+            )
+
+            self.assertEqual(
+                previous_page.object_list, pages[index - 1].object_list
+            )
+            self.assertTrue(previous_page.has_next)
+
+    def test_constant_queries(self):
+        """Each page should be fetched by a single query."""
+        cursor = self.get_all_pages(["scores"])[-2].next_cursor
+
+        with self.assertNumQueries(1):
+            paginate_by_keyset(User.objects.all(), ["scores"], 3, cursor)
+
+    def test_invalid_cursor(self):
+        """Tampered or other ordering's cursors should be rejected."""
+        cursor = encode_cursor(User.objects.first(), ["scores", "pk"])
+
+        for invalid_cursor in [cursor + "x", "invalid"]:
+            with self.assertRaises(InvalidCursor):
+                paginate_by_keyset(
+                    User.objects.all(), ["scores"], 3, invalid_cursor
+                )
+
+        with self.assertRaises(InvalidCursor):
+            paginate_by_keyset(User.objects.all(), ["-scores"], 3, cursor)
+
+
+class CachedCountPaginatorTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_cached_count(self):
+        """Count should be cached per query."""
+        baker.make(User, _quantity=3)
+        queryset = User.objects.order_by("pk")
+
+        self.assertEqual(CachedCountPaginator(queryset, 2).count, 3)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(CachedCountPaginator(queryset, 2).count, 3)
+
+        with self.assertNumQueries(1):
+            CachedCountPaginator(queryset.filter(scores=1), 2).count
@@ -0,0 +1,115 @@
+import json
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from learning.models import Tutorial
+from shared.slow_queries import (
+    SlowQuery,
+    SlowQueryRecorder,
+    aggregate_slow_queries,
+    collect_slow_queries,
+    fingerprint_sql,
+    get_recorder,
+    slow_query_wrapper,
+)
+
+
+class FingerprintTest(TestCase):
+    def test_normalize_literals(self):
+        """Literals and parameters should be replaced by "?"."""
+        self.assertEqual(
+            fingerprint_sql(
+                "SELECT \"t1\".\"id\" FROM t1 WHERE a = 'x''y' AND b = 12"
+                "   AND c = %s LIMIT 21"
+            ),
+            'SELECT "t1"."id" FROM t1 WHERE a = ? AND b = ? AND c = ? '
+            "LIMIT ?",
+        )
+
+    def test_normalize_lists(self):
+        """IN and VALUES lists of any length should be the same."""
+        self.assertEqual(
+            fingerprint_sql("SELECT * FROM t WHERE id IN (%s, %s, %s)"),
+            fingerprint_sql("SELECT * FROM t WHERE id IN (%s)"),
+        )
+        self.assertEqual(
+            fingerprint_sql("INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s)"),
+            "INSERT INTO t (a, b) VALUES (...)",
+        )
+
+
+class SlowQueryRecorderTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        get_recorder().clear()
+
+    def test_wrapper_installed(self):
+        """Slow query wrapper should be installed on connections."""
+        self.assertIn(slow_query_wrapper, connection.execute_wrappers)
+
+    def test_ring_buffer(self):
+        """Recorder should only keep its last queries."""
+        recorder = SlowQueryRecorder(size=2, snapshot_interval=60)
+        for number in range(3):
+            recorder.record(SlowQuery(f"SELECT {number}", 1, "default"))
+
+        self.assertEqual(
+            [query.fingerprint for query in recorder.queries],
+            ["SELECT 1", "SELECT 2"],
+        )
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0.000001)
+    def test_capture_call_site(self):
+        """Slow queries should be recorded with their call site."""
+        Tutorial.objects.aggregate_statistics()
+
+        query = get_recorder().queries[-1]
+        self.assertIn("COUNT", query.fingerprint)
+        self.assertIn("tutorial_queryset.py", query.call_site)
+        self.assertIn("aggregate_statistics", query.call_site)
+        self.assertIn("test_slow_queries.py", query.entry_point)
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+    def test_disabled(self):
+        """No query should be recorded when threshold is zero."""
+        Tutorial.objects.count()
+        self.assertEqual(len(get_recorder().queries), 0)
+
+    def test_aggregate(self):
+        """Queries should be aggregated by fingerprint and sorted by
+        total time.
+        """
+        queries = [
+            {"fingerprint": "A", "duration_ms": 30},
+            {"fingerprint": "B", "duration_ms": 20},
+            {"fingerprint": "B", "duration_ms": 3000, "call_site": "x"},
+        ]
+
+        first, second = aggregate_slow_queries(queries)
+
+        self.assertEqual(first.fingerprint, "B")
+        self.assertEqual(first.count, 2)
+        self.assertEqual(first.total_ms, 3020)
+        self.assertEqual(first.max_ms, 3000)
+        self.assertEqual(first.histogram[1], 1)
+        self.assertEqual(first.histogram[-2], 1)
+        self.assertEqual(first.call_sites["x"], 1)
+        self.assertEqual(second.fingerprint, "A")
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0.000001)
+    def test_command(self):
+        """Command should print snapshotted slow queries."""
+        Tutorial.objects.aggregate_statistics()
+        get_recorder().snapshot()
+        self.assertTrue(collect_slow_queries())
+
+        stdout = StringIO()
+        call_command("slow_queries", "--json", "--clear", stdout=stdout)
+        statistics = json.loads(stdout.getvalue())
+
+        self.assertTrue(
+            any("COUNT" in item["fingerprint"] for item in statistics)
+        )
+        self.assertEqual(collect_slow_queries(), [])
@@ -0,0 +1,35 @@
+from django.test import TestCase
+from shared.text_normalization import normalize_text, tokenize
+
+
+class NormalizeTextTest(TestCase):
+    def test_arabic_characters(self):
+        """normalize_text should convert Arabic yeh and kaf to Persian."""
+        self.assertEqual(normalize_text("كيك"), "کیک")
+
+    def test_remove_zwnj(self):
+        """normalize_text should remove zero width non-joiners."""
+        self.assertEqual(normalize_text("می‌روم"), "میروم")
+
+    def test_remove_diacritics(self):
+        """normalize_text should remove Arabic diacritics and tatweel."""
+        self.assertEqual(normalize_text("مُعَلِّـم"), "معلم")
+
+    def test_digits(self):
+        """normalize_text should convert Persian and Arabic digits
+        to ASCII digits.
+        """
+        self.assertEqual(normalize_text("۱۴۰۰ ٢٠٢١"), "1400 2021")
+
+    def test_lowercase(self):
+        """normalize_text should lowercase text."""
+        self.assertEqual(normalize_text("Django"), "django")
+
+
+class TokenizeTest(TestCase):
+    def test_tokenize(self):
+        """tokenize should return normalized words without punctuation."""
+        self.assertEqual(
+            tokenize("كتاب‌هاي جنگو، Django!"),
+            ["کتابهای", "جنگو", "django"],
+        )
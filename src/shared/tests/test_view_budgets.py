@@ -0,0 +1,169 @@
+import os
+import random
+import tempfile
+from pathlib import Path
+from unittest import skipUnless
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, tag
+from model_bakery import baker
+from learning.models import Tutorial, TutorialComment, TutorialLike
+from shared.tests.view_budgets import (
+    USER_TYPES,
+    iter_url_keys,
+    load_budgets,
+    measure_view,
+    percentile,
+    write_report,
+)
+
+User = get_user_model()
+
+BUDGETS = load_budgets()
+
+# Latencies depend on the machine, so latency budgets are only checked
+# (and reported) when VIEW_BUDGETS_BENCHMARK environment variable is set
+BENCHMARK = bool(os.environ.get("VIEW_BUDGETS_BENCHMARK"))
+
+# Report's path can be set by VIEW_BUDGETS_REPORT environment variable
+REPORT_FILE = Path(
+    os.environ.get("VIEW_BUDGETS_REPORT")
+    or Path(tempfile.gettempdir()) / "view_budgets_report.json"
+)
+
+
+class ViewBudgetsTest(TestCase):
+    """Every view should stay within its query count and p95 latency
+    budgets (view_budgets.json) on a seeded dataset.
+
+    Latency budgets are checked by benchmark-tagged test_latency_budgets
+    only when VIEW_BUDGETS_BENCHMARK environment variable is set:
+
+        VIEW_BUDGETS_BENCHMARK=1 python manage.py test --tag=benchmark
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        seed = BUDGETS["seed"]
+        rand = random.Random(0)
+
+        users = baker.make(User, _quantity=seed["users"])
+        categories = baker.make_recipe(
+            "learning.active_category", _quantity=seed["categories"]
+        )
+
+        tutorials: list[Tutorial] = [
+            baker.make_recipe(
+                "learning.confirmed_tutorial",
+                author=rand.choice(users),
+                categories=rand.sample(categories, 2),
+            )
+            for _ in range(seed["tutorials"])
+        ]
+
+        comments: list[TutorialComment] = [
+            baker.make_recipe(
+                "learning.confirmed_tutorial_comment",
+                tutorial=rand.choice(tutorials),
+                user=rand.choice(users),
+            )
+            for _ in range(seed["comments"])
+        ]
+
+        for user, tutorial in rand.sample(
+            [(user, tutorial) for user in users for tutorial in tutorials],
+            seed["likes"],
+        ):
+            TutorialLike.objects.create(user=user, tutorial=tutorial)
+
+        cls.user = users[0]
+        user_tutorial = baker.make_recipe(
+            "learning.confirmed_tutorial",
+            author=cls.user,
+            categories=categories[:2],
+        )
+        cls.fixtures = {
+            "tutorial": user_tutorial,
+            "comment": comments[0],
+            "user_tutorial": user_tutorial,
+            "user_comment": baker.make_recipe(
+                "learning.confirmed_tutorial_comment",
+                tutorial=user_tutorial,
+                user=cls.user,
+                parent_comment=comments[0],
+            ),
+        }
+
+    def get_client(self, user_type: str) -> Client:
+        client = Client()
+        if user_type == "authenticated":
+            client.force_login(self.user)
+
+        return client
+
+    def test_percentile(self):
+        """percentile should return nearest-rank percentile."""
+        self.assertEqual(percentile([3, 1, 2, 4], 50), 2)
+        self.assertEqual(percentile(list(range(1, 101)), 95), 95)
+        self.assertEqual(percentile([7], 95), 7)
+
+    def test_all_urls_have_budget(self):
+        """Every url of budgeted namespaces should have a budget or be
+        ignored explicitly.
+        """
+        for key in iter_url_keys(BUDGETS["namespaces"]):
+            with self.subTest(view=key):
+                self.assertTrue(
+                    key in BUDGETS["views"] or key in BUDGETS["ignored"],
+                    f"{key} has no budget in view_budgets.json.",
+                )
+
+    def measure_views(self, repeat: int) -> list:
+        cache.clear()
+
+        measurements = []
+        for key, config in BUDGETS["views"].items():
+            for user_type in USER_TYPES:
+                if user_type in config:
+                    measurements.append(
+                        measure_view(
+                            self.get_client(user_type),
+                            key,
+                            config,
+                            user_type,
+                            self.fixtures,
+                            repeat,
+                        )
+                    )
+
+        return measurements
+
+    def test_query_budgets(self):
+        """Views shouldn't exceed their query count budgets."""
+        for measurement in self.measure_views(repeat=1):
+            with self.subTest(
+                view=measurement.view, user_type=measurement.user_type
+            ):
+                self.assertLess(measurement.status_code, 500)
+                self.assertLessEqual(
+                    measurement.queries,
+                    measurement.max_queries,
+                    "Query count budget exceeded.",
+                )
+
+    @tag("benchmark")
+    @skipUnless(BENCHMARK, "VIEW_BUDGETS_BENCHMARK is not set.")
+    def test_latency_budgets(self):
+        """Views shouldn't exceed their p95 latency budgets."""
+        measurements = self.measure_views(BUDGETS["repeat"])
+        write_report(REPORT_FILE, measurements)
+
+        for measurement in measurements:
+            with self.subTest(
+                view=measurement.view, user_type=measurement.user_type
+            ):
+                self.assertLessEqual(
+                    measurement.p95_ms,
+                    measurement.budget_p95_ms,
+                    "p95 latency budget exceeded.",
+                )
@@ -0,0 +1,178 @@
+""" View budgets
+
+Helpers of view budgets test suite (test_view_budgets). Budgets of each
+view (max query count and p95 latency per anonymous/authenticated user)
+live in view_budgets.json:
+
+    {
+        "repeat": 5,
+        "seed": {"users": 20, "tutorials": 100, ...},
+        "namespaces": ["learning", ...],
+        "ignored": {"authentication:logout": "Logs the client out"},
+        "views": {
+            "learning:tutorial": {
+                "kwargs": {"slug": "{tutorial.slug}"},
+                "anonymous": {"max_queries": 12, "p95_ms": 500},
+                "authenticated": {"max_queries": 16, "p95_ms": 500}
+            },
+            "/ajax/tutorial/like": {
+                "method": "post",
+                "ajax": true,
+                "data": {"tutorial_id": "{tutorial.pk}"},
+                "authenticated": {"max_queries": 10, "p95_ms": 500}
+            }
+        }
+    }
+
+Views are keyed by "namespace:name" or by path for unnamed urls. String
+kwargs and data are formatted by fixtures (e.g. "{tutorial.slug}").
+"""
+import json
+import math
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Optional
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver, reverse
+
+BUDGETS_FILE = Path(__file__).with_name("view_budgets.json")
+
+USER_TYPES = ("anonymous", "authenticated")
+
+
+@dataclass
+class ViewMeasurement:
+    view: str
+    user_type: str
+    status_code: int
+    queries: int
+    p95_ms: float
+    max_queries: int
+    budget_p95_ms: float
+    latencies_ms: list[float] = field(default_factory=list)
+
+    @property
+    def queries_passed(self) -> bool:
+        return self.queries <= self.max_queries
+
+    @property
+    def latency_passed(self) -> bool:
+        return self.p95_ms <= self.budget_p95_ms
+
+    def to_dict(self) -> dict:
+        return {
+            **asdict(self),
+            "queries_passed": self.queries_passed,
+            "latency_passed": self.latency_passed,
+        }
+
+
+def load_budgets(path: Path = BUDGETS_FILE) -> dict:
+    with open(path, encoding="utf-8") as budgets_file:
+        return json.load(budgets_file)
+
+
+def iter_url_keys(namespaces: list[str]) -> Iterator[str]:
+    """Yields keys ("namespace:name" or path of unnamed ones) of all
+    urls in given namespaces.
+    """
+
+    def walk(patterns, namespace: Optional[str], prefix: str):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                yield from walk(
+                    pattern.url_patterns,
+                    pattern.namespace or namespace,
+                    prefix + str(pattern.pattern),
+                )
+            elif namespace in namespaces:
+                yield (
+                    f"{namespace}:{pattern.name}"
+                    if pattern.name
+                    else "/" + prefix + str(pattern.pattern)
+                )
+
+    yield from walk(get_resolver().url_patterns, None, "")
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Returns nearest-rank percentile of values."""
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def _format(value: Any, fixtures: dict) -> Any:
+    if isinstance(value, str):
+        return value.format(**fixtures)
+    if isinstance(value, dict):
+        return {key: _format(item, fixtures) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_format(item, fixtures) for item in value]
+
+    return value
+
+
+def measure_view(
+    client: Client,
+    key: str,
+    config: dict,
+    user_type: str,
+    fixtures: dict,
+    repeat: int,
+) -> ViewMeasurement:
+    """Requests view once to warm up then repeat times and measures
+    its max query count and p95 latency.
+    """
+    kwargs = _format(config.get("kwargs", {}), fixtures)
+    url = key if key.startswith("/") else reverse(key, kwargs=kwargs)
+
+    method = getattr(client, config.get("method", "get"))
+    request_kwargs = {}
+    if "data" in config:
+        request_kwargs["data"] = _format(config["data"], fixtures)
+        if config.get("method") == "post":
+            request_kwargs["content_type"] = "application/json"
+    if config.get("ajax"):
+        request_kwargs["HTTP_X_REQUESTED_WITH"] = "XMLHttpRequest"
+
+    method(url, **request_kwargs)
+
+    queries = 0
+    latencies = []
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = method(url, **request_kwargs)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        queries = max(queries, len(captured))
+
+    budget = config[user_type]
+    return ViewMeasurement(
+        view=key,
+        user_type=user_type,
+        status_code=response.status_code,
+        queries=queries,
+        p95_ms=round(percentile(latencies, 95), 2),
+        max_queries=budget["max_queries"],
+        budget_p95_ms=budget["p95_ms"],
+        latencies_ms=[round(latency, 2) for latency in latencies],
+    )
+
+
+def write_report(path: Path, measurements: list[ViewMeasurement]):
+    """Writes measurements as a JSON report."""
+    report = {
+        "passed": all(
+            measurement.queries_passed and measurement.latency_passed
+            for measurement in measurements
+        ),
+        "views": [measurement.to_dict() for measurement in measurements],
+    }
+
+    with open(path, "w", encoding="utf-8") as report_file:
+        json.dump(report, report_file, ensure_ascii=False, indent=4)
@@ -0,0 +1,71 @@
+""" Persian-aware text normalization and tokenization """
+import re
+
+# Arabic characters which are commonly typed instead of Persian ones
+_CHARACTER_MAP = {
+    "ي": "ی",  # Arabic yeh -> Persian yeh
+    "ى": "ی",  # Alef maksura -> Persian yeh
+    "ك": "ک",  # Arabic kaf -> Persian kaf
+    "ة": "ه",  # Teh marbuta -> heh
+    "ۀ": "ه",  # Heh with yeh above -> heh
+    "أ": "ا",  # Alef with hamza above -> alef
+    "إ": "ا",  # Alef with hamza below -> alef
+    "ٱ": "ا",  # Alef wasla -> alef
+}
+
+# Characters which are removed from text
+_REMOVED_CHARACTERS = [
+    "\u200c",  # Zero width non-joiner (ZWNJ)
+    "\u200d",  # Zero width joiner
+    "\u200e",  # Left-to-right mark
+    "\u200f",  # Right-to-left mark
+    "\ufeff",  # Zero width no-break space (BOM)
+    "\u0640",  # Tatweel
+    "\u0670",  # Superscript alef
+    # Arabic diacritics (fathatan ... hamza below)
+    *(chr(code) for code in range(0x064B, 0x0660)),
+]
+
+# Persian and Arabic-Indic digits -> ASCII digits
+_DIGITS_MAP = {
+    **{chr(0x06F0 + digit): str(digit) for digit in range(10)},
+    **{chr(0x0660 + digit): str(digit) for digit in range(10)},
+}
+
+_TRANSLATION_TABLE = str.maketrans(
+    {
+        **_CHARACTER_MAP,
+        **_DIGITS_MAP,
+        **{char: None for char in _REMOVED_CHARACTERS},
+    }
+)
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize_text(text: str) -> str:
+    """Normalizes Persian/Arabic text for searching and comparing.
+
+    Unifies Arabic/Persian yeh and kaf variants, removes ZWNJ,
+    diacritics and tatweel, converts Persian/Arabic digits to ASCII
+    and lowercases text. All conversions are done in a single pass.
+
+    Args:
+        text (str): Text to normalize.
+
+    Returns:
+        str: Normalized text.
+    """
+    return text.translate(_TRANSLATION_TABLE).lower()
+
+
+def tokenize(text: str) -> list[str]:
+    """Normalizes text and splits it to words.
+
+    Args:
+        text (str): Text to tokenize.
+
+    Returns:
+        list[str]: Normalized words of text.
+    """
+    return _TOKEN_RE.findall(normalize_text(text))
@@ -90,6 +90,10 @@ class TutorialForm(forms.ModelForm, CrispySubmitButtonMixin):
             tutorial.tags.all().delete()
             # Create new tags
             TutorialTag.objects.bulk_create(self.cleaned_data["tags"])
+            # bulk_create doesn't trigger tags' hooks
+            Tutorial.objects.filter(
+                pk=tutorial.pk
+            ).update_search_documents()
 
             # Do BEFORE_UPDATE actions for tutorial and save them
             # when tags edited
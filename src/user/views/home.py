@@ -5,7 +5,11 @@ from constance import config
 from authentication.models import User
 from shared.models import ConfirmStatusChoices
 from shared.statistics import UserPanelStatistics
-from learning.models import Tutorial, TutorialView
+from learning.models import (
+    Tutorial,
+    TutorialDailyStatistics,
+    TutorialStatisticsRelationChoices,
+)
 
 
 class HomeView(View):
@@ -30,11 +34,13 @@ class HomeView(View):
         user: User = self.request.user
         last_months_count = config.USER_PANEL_STATISTICS_LAST_MONTH_COUNT
 
-        view_statistics = list(
-            TutorialView.objects.filter(
-                tutorial__author=user
-            ).active_confirmed_tutorials()
-            # get_last_months_count_statistics yields result
+        # Read from daily rollup rows instead of scanning all views
+        view_statistics = (
+            TutorialDailyStatistics.objects.filter(
+                tutorial__author=user,
+                relation=TutorialStatisticsRelationChoices.VIEW,
+            )
+            .active_confirmed_tutorials()
             .get_last_months_count_statistics(last_months_count)
         )
 